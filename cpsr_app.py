@@ -1,456 +1,45 @@
 import tkinter as tk
 from tkinter import filedialog, scrolledtext, messagebox
 import os
-import re
-import time
-from google.cloud import vision
-from google.cloud import storage
-from typing import Dict, Any
-import json
-from PIL import Image, ImageDraw, ImageFont, ImageTk
+import queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from PIL import Image, ImageTk
+
+from cpsr_core import (
+    DEFAULT_DISTRIBUTOR,
+    DEFAULT_EU_RP,
+    OCR_CANCELLED,
+    OCR_STAGES,
+    SUPPORTED_EXTENSIONS,
+    call_ocr_api,
+    compose_eu_label_text,
+    generate_auto_warnings_from_inci,
+    generate_label_image_from_form,
+    parse_ocr_text_to_data,
+)
 
 # ======================================================================
-# 폰트 로딩
+# 로고 리사이즈
 # ======================================================================
-try:
-    font_title = ImageFont.truetype("malgunbd.ttf", 36)
-    font_bold = ImageFont.truetype("malgunbd.ttf", 24)
-    font_reg = ImageFont.truetype("malgun.ttf", 22)
-except:
-    font_title = ImageFont.load_default()
-    font_bold = ImageFont.load_default()
-    font_reg = ImageFont.load_default()
+# 상단 로고 리사이즈: 미리 만들어 둘 폭, 캐시 크기, 디바운스 간격
+LOGO_PRESCALE_WIDTHS = (640, 960, 1280, 1920, 2560)
+LOGO_CACHE_SIZE = 8
+LOGO_RESIZE_DEBOUNCE_MS = 150
 
-print(ImageFont.truetype("malgun.ttf", 22))  # 폰트 정상 로딩 출력
 
-# ======================================================================
-# 설정
-# ======================================================================
-try:
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-except NameError:
-    BASE_DIR = os.getcwd()
-
-SERVICE_ACCOUNT_FILE = 'service-account-key.json'
-GCS_BUCKET_NAME = 'yjnpartnerscpsr'
-DEFAULT_EU_RP = "YJN Europe s.r.o.\n6F, M.R. Stefanika, 010 01, Zilina, Slovak Republic"
-
-# ======================================================================
-# 텍스트 줄바꿈 유틸
-# ======================================================================
-def wrap_text(text, max_width_px, font):
-    if not text:
-        return []
-    words = text.split()
-    lines = []
-    current = ""
-    for w in words:
-        test = current + (" " if current else "") + w
-        try:
-            w_px = font.getbbox(test)[2]
-        except Exception:
-            w_px = len(test) * 7
-        if w_px <= max_width_px:
-            current = test
-        else:
-            if current:
-                lines.append(current)
-            current = w
-    if current:
-        lines.append(current)
-    return lines
-# ======================================================================
-# 1) Google Vision OCR 호출
-# ======================================================================
-
-def upload_to_gcs(storage_client, file_path, bucket_name):
-    bucket = storage_client.bucket(bucket_name)
-    blob = bucket.blob(os.path.basename(file_path))
-    blob.upload_from_filename(file_path)
-    return f'gs://{bucket_name}/{os.path.basename(file_path)}'
-
-
-def call_ocr_api(file_path: str) -> str:
-    key_file_path = os.path.join(BASE_DIR, SERVICE_ACCOUNT_FILE)
-
-    try:
-        vision_client = vision.ImageAnnotatorClient.from_service_account_json(key_file_path)
-        storage_client = storage.Client.from_service_account_json(key_file_path)
-    except Exception as e:
-        return f"[오류] Google API 초기화 실패: {e}"
-
-    _, ext = os.path.splitext(file_path)
-    ext = ext.lower()
-
-    # -----------------------------
-    # 이미지 파일 즉시 OCR
-    # -----------------------------
-    if ext in [".jpg", ".jpeg", ".png", ".bmp", ".gif", ".webp", ".tif", ".tiff"]:
-        try:
-            with open(file_path, "rb") as f:
-                content = f.read()
-
-            image = vision.Image(content=content)
-            response = vision_client.document_text_detection(image=image)
-
-            if response.error.message:
-                return f"[오류] Vision API 오류: {response.error.message}"
-
-            if response.full_text_annotation.text:
-                return response.full_text_annotation.text
-
-            if response.text_annotations:
-                return response.text_annotations[0].description
-
-            return "[결과 없음]"
-        except Exception as e:
-            return f"[오류] 이미지 OCR 실패: {e}"
-
-    # -----------------------------
-    # PDF / TIFF → 비동기 OCR
-    # -----------------------------
-    try:
-        gcs_uri = upload_to_gcs(storage_client, file_path, GCS_BUCKET_NAME)
-    except Exception as e:
-        return f"[오류] GCS 업로드 실패: {e}"
-
-    prefix = f"{os.path.basename(file_path)}_output_{int(time.time())}/"
-    destination_uri = f"gs://{GCS_BUCKET_NAME}/{prefix}"
-
-    mime_type = "application/pdf"
-    if ext in [".tif", ".tiff"]:
-        mime_type = "image/tiff"
-
-    input_config = vision.InputConfig(
-        gcs_source=vision.GcsSource(uri=gcs_uri),
-        mime_type=mime_type
-    )
-    output_config = vision.OutputConfig(
-        gcs_destination=vision.GcsDestination(uri=destination_uri),
-        batch_size=1
-    )
-
-    request = vision.AsyncAnnotateFileRequest(
-        input_config=input_config,
-        features=[vision.Feature(type=vision.Feature.Type.DOCUMENT_TEXT_DETECTION)],
-        output_config=output_config
-    )
-
-    try:
-        operation = vision_client.async_batch_annotate_files(requests=[request])
-        operation.result(timeout=600)
-    except Exception as e:
-        return f"[오류] 비동기 OCR 실패: {e}"
+def resize_logo(image, target_width, resample=Image.LANCZOS):
+    ratio = target_width / image.width
+    return image.resize((target_width, max(1, int(image.height * ratio))), resample)
 
-    bucket = storage_client.bucket(GCS_BUCKET_NAME)
 
-    # JSON 결과 합치기
-    json_blobs = list(bucket.list_blobs(prefix=prefix))
-    json_blobs = [b for b in json_blobs if b.name.endswith(".json")]
+def prescale_logo(image, widths):
+    return {width: resize_logo(image, width) for width in widths}
 
-    if not json_blobs:
-        return "[결과 없음] JSON 결과 없음"
 
-    json_blobs.sort(key=lambda b: b.name)
-    full_text = ""
-
-    try:
-        for blob in json_blobs:
-            text = blob.download_as_bytes().decode("utf-8")
-            parsed = json.loads(text)
-
-            for resp in parsed.get("responses", []):
-                if "fullTextAnnotation" in resp:
-                    full_text += resp["fullTextAnnotation"].get("text", "") + "\n"
-
-    except Exception as e:
-        return f"[오류] JSON 파싱 오류: {e}"
-    finally:
-        # 결과 파일 정리
-        try:
-            for blob in json_blobs:
-                blob.delete()
-            bucket.blob(os.path.basename(file_path)).delete()
-        except Exception:
-            pass
-
-    return full_text.strip() if full_text.strip() else "[결과 없음]"
-
-
-# ======================================================================
-# 2) OCR Parsing
-# ======================================================================
-
-def _clean_field_text(text):
-    if not text:
-        return ""
-    t = re.sub(r"\s+", " ", text).strip()
-    t = re.sub(
-        r'^(Product\s*Name|판매명|제품명|Description|Claim/Function|Function|Marketing\s*Claim/Function|Marketing\s*Claim|How\s*to\s*use|Warning|Responsible\s*Person|Ingredients|Net\s*Content)[:\-\s]+\s*',
-        "",
-        t,
-        flags=re.IGNORECASE
-    )
-    return t.strip()
-
-
-def _extract_field(start_pattern, end_pattern, text):
-    regex = r"(" + start_pattern + r")\s*[:=\-\s]*(.*?)(?=\s*" + end_pattern + r"|\Z)"
-    m = re.search(regex, text, re.IGNORECASE | re.DOTALL)
-    return _clean_field_text(m.group(2)) if m else None
-
-
-def parse_ocr_text_to_data(ocr_text: str) -> Dict[str, Any]:
-
-    if ocr_text.startswith(("[오류]", "[결과 없음]")):
-        return {"Error": ocr_text}
-
-    cleaned = re.sub(r"[\r\n]+", " ", ocr_text)
-
-    # CPSR Section 분리
-    m_section = re.search(
-        r"Labelled warnings and instructions of use(.*?)(Reasoning|Assessor|Annex|\Z)",
-        cleaned,
-        flags=re.IGNORECASE | re.DOTALL
-    )
-    section = m_section.group(1).strip() if m_section else cleaned
-
-    data = {
-        "Product Name": _extract_field(r"Label\w* Information", r"Description", section),
-        "Description": _extract_field(r"Description", r"Marketing", section),
-        "Function/Claim": _extract_field(r"Marketing", r"How to use", section),
-        "Usage / Instructions": _extract_field(r"How to use", r"Warning", section),
-        "Warnings / Precautions": _extract_field(r"Warning", r"Responsible|Ingredients", section),
-        "Responsible Person": _extract_field(r"Responsible", r"Ingredients", section),
-        "INCI / Ingredients": _extract_field(r"Ingredients", r"Net Content", section),
-        "Net Content": None,
-        "Batch / Lot": None,
-        "Expiry Date": None,
-        "Country of Origin": None,
-    }
-
-    # Net Content 세부 필드
-    net = _extract_field(r"Net Content", r"Warning|$", section)
-    if net:
-        # Net Content
-        m_nc = re.search(r"(\d+\s*(ml|mL|g|G))", net)
-        if m_nc:
-            data["Net Content"] = m_nc.group(1)
-
-        # Expiry
-        m_exp = re.search(r"Best Before.*?:\s*(.*?)(,|$)", net)
-        if m_exp:
-            data["Expiry Date"] = m_exp.group(1).strip()
-
-        # LOT
-        m_lot = re.search(r"LOT\s*:\s*(.*?)(,|$)", net)
-        if m_lot:
-            data["Batch / Lot"] = m_lot.group(1).strip()
-
-        # Origin
-        m_origin = re.search(r"Origin\s*:\s*(.*?)(,|$)", net)
-        if m_origin:
-            val = m_origin.group(1).strip()
-            val = re.sub(r"\s+\d{1,3}$", "", val)
-            data["Country of Origin"] = val
-
-    # fallback product name
-    if not data["Product Name"]:
-        if "UNICONIC SHIELD FIXER" in cleaned:
-            data["Product Name"] = "SELF BEAUTY UNICONIC SHIELD FIXER"
-
-    return data
 # ======================================================================
-# 3) INCI 기반 자동 경고 생성
-# ======================================================================
-def generate_auto_warnings_from_inci(inci_text: str) -> str:
-    if not inci_text:
-        return ""
-    s = inci_text.lower()
-    warnings = []
-
-    # 대표 알레르겐 예시
-    allergens = [
-        "limonene", "linalool", "citral", "geraniol", "coumarin",
-        "eugenol", "farnesol", "benzyl alcohol", "benzyl salicylate",
-        "citronellol", "hexyl cinnamal", "parfum"
-    ]
-    found = []
-    for a in allergens:
-        if a in s and a not in found:
-            found.append(a)
-            warnings.append(f"Contains allergen: {a.capitalize()}.")
-
-    if "alcohol denat" in s:
-        warnings.append("Caution: Contains denatured alcohol; may be drying for sensitive skin.")
-    if "althaea rosea flower extract" in s:
-        warnings.append("Check for floral extract sensitivities.")
-
-    # 기본 어린이 주의 문구
-    if "Not to be used for children under three years of age." not in warnings:
-        warnings.append("Not to be used for children under three years of age.")
-
-    return "\n".join(warnings) if warnings else "No specific INCI warnings detected."
-
-
-# ======================================================================
-# 4) EU 라벨 텍스트 구성 (1~11번 포맷)
-# ======================================================================
-def compose_eu_label_text(form_data: Dict[str, str]) -> str:
-    lines = []
-    lines.append("────────────────────────────────────────────")
-    lines.append("              YJN 파트너스 라벨 예시안")
-    lines.append("────────────────────────────────────────────\n")
-
-    lines.append("1. Product Name:")
-    lines.append(form_data.get("Product Name", "N/A") + "\n")
-
-    lines.append("2. Product Function:")
-    lines.append(form_data.get("Function/Claim", "N/A") + "\n")
-
-    lines.append("3. How to Use:")
-    lines.append(form_data.get("Usage / Instructions", "N/A") + "\n")
-
-    lines.append("4. Warning / Precautions:")
-    lines.append(form_data.get("Warnings / Precautions", "N/A") + "\n")
-
-    lines.append("5. Ingredients (INCI):")
-    lines.append(form_data.get("INCI / Ingredients", "N/A") + "\n")
-
-    lines.append("6. Expiry Date:")
-    lines.append(form_data.get("Expiry Date", "Shown on the package") + "\n")
-
-    lines.append("7. EU Responsible Person:")
-    lines.append(form_data.get("EU Responsible Person", DEFAULT_EU_RP) + "\n")
-
-    lines.append("8. Distributor Name and Address:")
-    distributor_val = form_data.get(
-        "Distributor",
-        "해당국 수입 판매자(DISTRIBUTOR)의 정보 기입은 필수사항입니다."
-    )
-    lines.append(distributor_val)
-    lines.append("※ DT는 필수 기재사항 / Manufacturer 문구는 선택 사항\n")
-
-    lines.append("9. Country of Origin:")
-    lines.append(form_data.get("Country of Origin", "Made in Korea") + "\n")
-
-    lines.append("10. Batch Number:")
-    lines.append(form_data.get("Batch / Lot", "Shown on the package (LOT 번호 사용가능)") + "\n")
-
-    lines.append("11. Nominal Quantities:")
-    lines.append(form_data.get("Net Content", "N/A") + "\n")
-
-    lines.append("────────────────────────────────────────────")
-    lines.append("※ 이 라벨 예시는 CPSR Part B를 기반으로 자동 생성된 초안입니다.")
-    lines.append("※ 실제 사용 전, EU 규정(EC) 1223/2009 및 각국 라벨링 요건을 다시 검토해야 합니다.")
-    lines.append("────────────────────────────────────────────")
-
-    return "\n".join(lines)
-
-
-# ======================================================================
-# 5) 이미지 라벨 생성 (로고 + 1~11번 포맷)
-# ======================================================================
-def generate_label_image_from_form(form_data: Dict[str, str], save_path: str) -> str:
-    W, H = 1000, 1800
-    margin = 40
-    bg = "white"
-
-    img = Image.new("RGB", (W, H), color=bg)
-    draw = ImageDraw.Draw(img)
-
-    try:
-        font_title = ImageFont.truetype("malgunbd.ttf", 36)
-        font_bold = ImageFont.truetype("malgunbd.ttf", 24)
-        font_reg = ImageFont.truetype("malgun.ttf", 22)
-    except Exception:
-        font_title = ImageFont.load_default()
-        font_bold = ImageFont.load_default()
-        font_reg = ImageFont.load_default()
-
-    x = margin
-    y = margin
-
-    # -------------------------
-    # 상단 로고 (yjn로고.png)
-    # -------------------------
-    try:
-        logo = Image.open("yjn로고.png")
-        logo_ratio = W / logo.width
-        logo_h = int(logo.height * logo_ratio)
-        logo = logo.resize((W, logo_h), Image.LANCZOS)
-        img.paste(logo, (0, y))
-        y += logo_h + 30
-    except Exception as e:
-        print("라벨 로고 로딩 실패:", e)
-        title = form_data.get("Product Name", "Product Name")
-        draw.text((x, y), title, font=font_title, fill="black")
-        y += 70
-
-    # 블록 출력 함수
-    def write_block(number, label, content, extra_comment=None, gap=28):
-        nonlocal y
-        draw.text((x, y), f"{number}. {label}", font=font_bold, fill="black")
-        y += gap
-        for line in wrap_text(content, W - 2 * margin, font_reg):
-            draw.text((x, y), line, font=font_reg, fill="black")
-            y += gap
-        if extra_comment:
-            draw.text((x + 20, y), extra_comment, font=font_reg, fill="black")
-            y += gap
-        y += 12
-
-    # 1~11 항목
-    write_block(1, "Product Name:", form_data.get("Product Name", "N/A"))
-    write_block(2, "Product Function:", form_data.get("Function/Claim", "N/A"))
-    write_block(3, "How to Use:", form_data.get("Usage / Instructions", "N/A"))
-    write_block(4, "Warning / Precautions:", form_data.get("Warnings / Precautions", "N/A"))
-    write_block(5, "Ingredients (INCI):", form_data.get("INCI / Ingredients", "N/A"))
-    write_block(6, "Expiry Date:", form_data.get("Expiry Date", "Shown on the package"))
-
-    write_block(7, "EU Responsible Person:",
-                form_data.get("EU Responsible Person", DEFAULT_EU_RP))
-
-    write_block(
-        8,
-        "Distributor Name and Address:",
-        form_data.get("Distributor", "해당국 수입 판매자(DISTRIBUTOR)의 정보 기입은 필수사항입니다."),
-        extra_comment="※ DT는 필수 기재사항 / Manufacturer 문구는 선택 사항"
-    )
-
-    write_block(9, "Country of Origin:", form_data.get("Country of Origin", "Made in Korea"))
-
-    write_block(
-        10,
-        "Batch Number:",
-        form_data.get("Batch / Lot", "Shown on the package (LOT 번호 사용가능)"),
-        extra_comment="(LOT 번호 사용 가능)"
-    )
-
-    write_block(11, "Nominal Quantities:", form_data.get("Net Content", "N/A"))
-
-    # 하단 고정 문구
-    y = H - 120
-    draw.line((margin, y, W - margin, y), fill="black", width=1)
-    y += 10
-
-    rp = form_data.get("EU Responsible Person", DEFAULT_EU_RP)
-    for line in rp.split("\n"):
-        draw.text((x, y), line, font=font_reg, fill="black")
-        y += 28
-
-    y += 6
-    draw.text(
-        (x, y),
-        "※ 이 라벨 이미지는 CPSR Part B를 기반으로 자동 생성된 예시안입니다.",
-        font=font_reg,
-        fill="black",
-    )
-
-    img.save(save_path)
-    return save_path
-# ======================================================================
-# 6) GUI (ttkbootstrap + 전체 스크롤 구조)
+# GUI (ttkbootstrap + 전체 스크롤 구조)
 # ======================================================================
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
@@ -467,12 +56,54 @@ class CPSRApp:
         self.file_path = tk.StringVar()
         self.last_parsed_data = None
 
+        # 백그라운드 OCR 상태 (작업 스레드 → UI 는 ocr_queue 로만 전달)
+        self.ocr_queue = queue.Queue()
+        self.ocr_thread = None
+        self.ocr_cancel = None
+        self.ocr_status = tk.StringVar(value="")
+
+        # 로고 리사이즈 상태 (고품질 LANCZOS 는 logo_executor 에서만 수행)
+        self.logo_cache = OrderedDict()  # 최근 표시한 최종 폭 (LRU, LOGO_CACHE_SIZE 개)
+        self.logo_prescaled = {}  # LOGO_PRESCALE_WIDTHS 미리 축소본 (LRU 와 별도로 항상 유지)
+        self.logo_executor = ThreadPoolExecutor(max_workers=1)
+        self.logo_width = None
+        self.logo_resize_job = None
+        self.logo_request = None
+
         self.create_widgets()
 
     # -------------------------
     # 로고 리사이즈용 함수
     # -------------------------
+    def on_window_configure(self, event=None):
+        if not hasattr(self, "original_logo"):
+            return
+        target_width = self.canvas.winfo_width()
+        if target_width < 50 or target_width == self.logo_width:
+            return
+
+        # 리사이즈 중에는 캐시된 크기에서 싸게 맞추고, 멈춘 뒤에만 고품질로 다시 그린다.
+        self.show_interim_logo(target_width)
+        if self.logo_resize_job is not None:
+            self.master.after_cancel(self.logo_resize_job)
+        self.logo_resize_job = self.master.after(LOGO_RESIZE_DEBOUNCE_MS, self.update_logo)
+
+    def show_interim_logo(self, target_width):
+        # 진행 중인 고품질 작업의 결과가 이 임시 로고를 덮어쓰지 않도록 요청 폭을 먼저 바꾼다.
+        self.logo_request = target_width
+        # 목표 폭 이상인 캐시 중 가장 작은 것 (없으면 가장 큰 것 / 원본)
+        sources = sorted({**self.logo_prescaled, **self.logo_cache}.items())
+        larger = [image for width, image in sources if width >= target_width]
+        if larger:
+            source = larger[0]
+        elif sources:
+            source = sources[-1][1]
+        else:
+            source = self.original_logo
+        self.set_logo_image(resize_logo(source, target_width, Image.NEAREST), target_width)
+
     def update_logo(self):
+        self.logo_resize_job = None
         if not hasattr(self, "original_logo"):
             return
 
@@ -483,24 +114,51 @@ class CPSRApp:
             self.master.after(100, self.update_logo)
             return
 
-        ratio = target_width / self.original_logo.width
-        new_height = int(self.original_logo.height * ratio)
+        # 캐시 적중으로 바로 그리는 경우에도 먼저 기록해, 이전 폭의 작업 결과가 덮어쓰지 못하게 한다.
+        self.logo_request = target_width
+        cached = self.logo_cache.get(target_width)
+        if cached is not None:
+            self.logo_cache.move_to_end(target_width)
+            self.set_logo_image(cached, target_width)
+            return
+        if target_width in self.logo_prescaled:
+            self.set_logo_image(self.logo_prescaled[target_width], target_width)
+            return
 
-        # 최대 높이 제한
-        #max_h = 150
-        #if new_height > max_h:
-            #new_height = max_h
-            #target_width = int(self.original_logo.width * (max_h / self.original_logo.height))
+        future = self.logo_executor.submit(resize_logo, self.original_logo, target_width)
+        self.poll_logo_future(future, lambda resized: self.on_logo_resized(target_width, resized))
 
-        resized = self.original_logo.resize((target_width, new_height), Image.LANCZOS)
-        self.logo_photo = ImageTk.PhotoImage(resized)
+    def poll_logo_future(self, future, callback):
+        # 작업 스레드에서 Tk 를 건드리지 않도록 메인 스레드에서 완료 여부만 확인
+        if not future.done():
+            self.master.after(30, self.poll_logo_future, future, callback)
+            return
+        try:
+            callback(future.result())
+        except Exception as e:
+            print("로고 리사이즈 실패:", e)
 
-        self.logo_label.configure(image=self.logo_photo)
-        self.logo_label.image = self.logo_photo
+    def on_logo_resized(self, target_width, resized):
+        self.remember_logo(target_width, resized)
+        # 그 사이 창 크기가 또 바뀌었다면 오래된 결과는 표시하지 않는다.
+        if target_width == self.logo_request:
+            self.set_logo_image(resized, target_width)
 
+    def on_logo_prescaled(self, images):
+        self.logo_prescaled = images
 
+    def remember_logo(self, width, image):
+        self.logo_cache[width] = image
+        self.logo_cache.move_to_end(width)
+        while len(self.logo_cache) > LOGO_CACHE_SIZE:
+            self.logo_cache.popitem(last=False)
 
+    def set_logo_image(self, image, width):
+        self.logo_width = width
+        self.logo_photo = ImageTk.PhotoImage(image)
 
+        self.logo_label.configure(image=self.logo_photo)
+        self.logo_label.image = self.logo_photo
 
     # -------------------------
     # 위젯 구성
@@ -542,6 +200,10 @@ class CPSRApp:
         try:
             logo_path = "yjn로고.png"
             self.original_logo = Image.open(logo_path)
+            # 작업 스레드와 함께 읽으므로 지연 로딩을 미리 끝내 둔다.
+            self.original_logo.load()
+            future = self.logo_executor.submit(prescale_logo, self.original_logo, LOGO_PRESCALE_WIDTHS)
+            self.poll_logo_future(future, self.on_logo_prescaled)
 
             # 로고는 scrollable_frame 안에 있어야 자동 리사이즈됨
             self.logo_frame = ttk.Frame(self.scrollable_frame)
@@ -554,7 +216,7 @@ class CPSRApp:
             self.master.after(200, self.update_logo)
 
             # 창 변화 감지
-            self.master.bind("<Configure>", lambda e: self.master.after(50, self.update_logo))
+            self.master.bind("<Configure>", self.on_window_configure)
 
         except Exception as e:
             print("로고 로딩 실패:", e)
@@ -571,12 +233,22 @@ class CPSRApp:
         select_button = ttk.Button(top_frame, text="파일 선택", command=self.select_file)
         select_button.pack(side='left')
 
-        process_button = ttk.Button(top_frame, text="OCR 분석 시작", command=self.process_file)
-        process_button.pack(side='left', padx=8)
+        self.process_button = ttk.Button(top_frame, text="OCR 분석 시작", command=self.process_file)
+        self.process_button.pack(side='left', padx=8)
+
+        self.cancel_button = ttk.Button(top_frame, text="취소", command=self.cancel_ocr, state='disabled')
+        self.cancel_button.pack(side='left')
 
         gen_button = ttk.Button(top_frame, text="이미지 라벨 저장하기", command=self.on_generate_label)
         gen_button.pack(side='right')
 
+        # OCR 진행 상태
+        progress_frame = ttk.Frame(self.scrollable_frame, padding=(10, 0))
+        progress_frame.pack(fill='x')
+        self.ocr_progress = ttk.Progressbar(progress_frame, maximum=len(OCR_STAGES), mode='determinate')
+        self.ocr_progress.pack(side='left', fill='x', expand=True, padx=(0, 10))
+        ttk.Label(progress_frame, textvariable=self.ocr_status, width=40).pack(side='left')
+
         # 3) 입력 폼 영역
         form_frame = ttk.Labelframe(self.scrollable_frame, text="(수정 가능)", padding=10)
         form_frame.pack(fill='x', padx=10, pady=8, expand=False)
@@ -607,7 +279,7 @@ class CPSRApp:
         ttk.Label(form_frame, text="Distributor (DT):", width=lbl_w).grid(row=5, column=0, sticky='nw', pady=4)
         self.entry_distributor = ttk.Entry(form_frame, width=80)
         self.entry_distributor.grid(row=5, column=1, sticky='we', pady=4)
-        self.entry_distributor.insert(0, "해당국 수입 판매자(DISTRIBUTOR)의 정보 기입은 필수사항입니다.")
+        self.entry_distributor.insert(0, DEFAULT_DISTRIBUTOR)
 
         ttk.Label(form_frame, text="Manufacturer:", width=lbl_w).grid(row=6, column=0, sticky='nw', pady=4)
         self.entry_manufacturer = ttk.Entry(form_frame, width=80)
@@ -664,7 +336,7 @@ class CPSRApp:
     # 파일 선택
     # -------------------------
     def select_file(self):
-        filetypes = [("이미지/PDF 파일", "*.pdf *.jpg *.jpeg *.png *.tif *.tiff"), ("모든 파일", "*.*")]
+        filetypes = [("이미지/PDF 파일", " ".join("*" + ext for ext in SUPPORTED_EXTENSIONS)), ("모든 파일", "*.*")]
         path = filedialog.asksaveasfilename if False else filedialog.askopenfilename(filetypes=filetypes)
         if path:
             self.file_path.set(path)
@@ -676,6 +348,10 @@ class CPSRApp:
     # OCR → 파싱 → 폼 채우기
     # -------------------------
     def process_file(self):
+        if self.ocr_thread is not None and self.ocr_thread.is_alive():
+            messagebox.showwarning("진행 중", "이미 OCR 분석이 진행 중입니다. 완료되거나 취소된 후 다시 시도해주세요.")
+            return
+
         file_path = self.file_path.get()
         if not file_path or not os.path.exists(file_path):
             messagebox.showerror("오류", "CPSR 파일을 먼저 선택해주세요.")
@@ -686,16 +362,82 @@ class CPSRApp:
         self.raw_text.delete('1.0', tk.END)
         self.raw_text.insert('1.0', "API 호출 중...")
 
-        ocr_text = call_ocr_api(file_path)
-        if ocr_text.startswith(("[오류]", "[결과 없음]")):
-            messagebox.showerror("OCR/인증 오류", ocr_text)
-            self.summary_text.delete('1.0', tk.END)
-            self.summary_text.insert('1.0', ocr_text)
-            self.raw_text.delete('1.0', tk.END)
-            self.raw_text.insert('1.0', ocr_text)
+        self.ocr_cancel = threading.Event()
+        self.process_button.configure(state='disabled')
+        self.cancel_button.configure(state='normal')
+        self.ocr_progress.configure(value=0)
+        self.ocr_status.set("OCR 시작...")
+
+        self.ocr_thread = threading.Thread(
+            target=self._ocr_worker,
+            args=(file_path, self.ocr_queue, self.ocr_cancel),
+            daemon=True,
+        )
+        self.ocr_thread.start()
+        self.master.after(100, self._poll_ocr_queue)
+
+    def cancel_ocr(self):
+        if self.ocr_cancel is not None and not self.ocr_cancel.is_set():
+            self.ocr_cancel.set()
+            self.cancel_button.configure(state='disabled')
+            self.ocr_status.set("취소 중...")
+
+    @staticmethod
+    def _ocr_worker(file_path, results, cancel_event):
+        # Tk 위젯은 메인 스레드에서만 다룰 수 있으므로 여기서는 큐에만 넣는다.
+        try:
+            ocr_text = call_ocr_api(
+                file_path,
+                progress=lambda stage: results.put(("progress", stage)),
+                cancel_event=cancel_event,
+            )
+            if cancel_event.is_set() or ocr_text == OCR_CANCELLED:
+                results.put(("cancelled", OCR_CANCELLED))
+                return
+            if ocr_text.startswith(("[오류]", "[결과 없음]")):
+                results.put(("error", ocr_text))
+                return
+            results.put(("progress", "파싱"))
+            results.put(("done", (ocr_text, parse_ocr_text_to_data(ocr_text))))
+        except Exception as e:
+            results.put(("error", f"[오류] OCR 처리 실패: {e}"))
+
+    def _poll_ocr_queue(self):
+        try:
+            while True:
+                kind, payload = self.ocr_queue.get_nowait()
+                if kind == "progress":
+                    self.ocr_progress.configure(value=OCR_STAGES.index(payload) + 1)
+                    self.ocr_status.set(f"{payload} 중...")
+                    continue
+                self._finish_ocr(kind, payload)
+                return
+        except queue.Empty:
+            pass
+        self.master.after(100, self._poll_ocr_queue)
+
+    def _finish_ocr(self, kind, payload):
+        self.ocr_thread = None
+        self.ocr_cancel = None
+        self.process_button.configure(state='normal')
+        self.cancel_button.configure(state='disabled')
+
+        if kind == "done":
+            self.ocr_progress.configure(value=len(OCR_STAGES))
+            self.ocr_status.set("완료")
+            self._apply_ocr_result(*payload)
             return
 
-        parsed = parse_ocr_text_to_data(ocr_text)
+        self.ocr_progress.configure(value=0)
+        self.ocr_status.set("취소됨" if kind == "cancelled" else "오류")
+        if kind == "error":
+            messagebox.showerror("OCR/인증 오류", payload)
+        self.summary_text.delete('1.0', tk.END)
+        self.summary_text.insert('1.0', payload)
+        self.raw_text.delete('1.0', tk.END)
+        self.raw_text.insert('1.0', payload)
+
+    def _apply_ocr_result(self, ocr_text, parsed):
         self.last_parsed_data = parsed
 
         widgets_to_fill = {
@@ -844,6 +586,9 @@ if __name__ == "__main__":
 
     def on_closing():
         save_window_geometry(root)
+        if app.ocr_cancel is not None:
+            app.ocr_cancel.set()
+        app.logo_executor.shutdown(wait=False)
         root.destroy()
 
     root.protocol("WM_DELETE_WINDOW", on_closing)
@@ -0,0 +1,168 @@
+"""CPSR Part B 폴더 일괄 처리 (GUI 없이 실행).
+
+    python cpsr_batch.py CPSR_폴더 -o 결과_폴더 [--ocr-workers 4] [--render-workers 4] [--force]
+
+폴더 안의 PDF/이미지마다 OCR → 파싱 → EU 라벨 텍스트 → PNG 라벨을 만들고
+결과 폴더에 `<파일명>.png`, `<파일명>.json` 으로 저장한다. 진행 상황은
+결과 폴더의 manifest.json 에 파일마다 기록되므로, 다시 실행하면 이미 완료된
+(그리고 그 뒤로 바뀌지 않은) 파일은 건너뛴다.
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+
+from cpsr_core import BASE_DIR, SUPPORTED_EXTENSIONS, generate_label_image_from_form, ocr_and_parse
+
+MANIFEST_NAME = "manifest.json"
+
+
+# ======================================================================
+# 결과 파일
+# ======================================================================
+def _fingerprint(path: str) -> List[int]:
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _write_json(path: str, data: Any) -> None:
+    # 중간에 중단되어도 깨진 파일이 남지 않도록 임시 파일에 쓴 뒤 교체
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_manifest(output_dir: str) -> Dict[str, Dict[str, Any]]:
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def is_done(entry: Optional[Dict[str, Any]], source_path: str, output_dir: str) -> bool:
+    if not entry or entry.get("status") != "done":
+        return False
+    if entry.get("fingerprint") != _fingerprint(source_path):
+        return False
+    return all(os.path.exists(os.path.join(output_dir, entry[key])) for key in ("png", "json"))
+
+
+# ======================================================================
+# 작업 단위 (OCR 은 스레드, 렌더링은 프로세스)
+# ======================================================================
+def _init_render_worker() -> None:
+    # generate_label_image_from_form 은 로고를 현재 폴더 기준으로 찾는다.
+    os.chdir(BASE_DIR)
+
+
+def render_label(form: Dict[str, str], png_path: str) -> str:
+    return generate_label_image_from_form(form, png_path)
+
+
+# ======================================================================
+# 일괄 처리
+# ======================================================================
+def find_sources(input_dir: str) -> List[str]:
+    names = sorted(os.listdir(input_dir))
+    return [
+        name for name in names
+        if os.path.isfile(os.path.join(input_dir, name))
+        and os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS
+    ]
+
+
+def run_batch(input_dir: str, output_dir: str, ocr_workers: int, render_workers: int, force: bool = False) -> int:
+    input_dir = os.path.abspath(input_dir)
+    output_dir = os.path.abspath(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+
+    manifest = {} if force else load_manifest(output_dir)
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    sources = find_sources(input_dir)
+    todo = [name for name in sources if not is_done(manifest.get(name), os.path.join(input_dir, name), output_dir)]
+    total = len(todo)
+    print(f"{len(sources)}개 파일 중 {len(sources) - total}개 완료됨, {total}개 처리 시작")
+
+    finished = 0
+    failed = 0
+
+    def record(name: str, entry: Dict[str, Any]) -> None:
+        nonlocal finished, failed
+        finished += 1
+        manifest[name] = entry
+        _write_json(manifest_path, manifest)
+        if entry["status"] == "done":
+            print(f"[{finished}/{total}] {name}: 완료")
+        else:
+            failed += 1
+            print(f"[{finished}/{total}] {name}: 실패 - {entry['error']}")
+
+    with ThreadPoolExecutor(max_workers=ocr_workers) as ocr_pool, ProcessPoolExecutor(
+        max_workers=render_workers, initializer=_init_render_worker
+    ) as render_pool:
+        pending = {}
+        for name in todo:
+            source_path = os.path.join(input_dir, name)
+            pending[ocr_pool.submit(ocr_and_parse, source_path)] = ("ocr", name, _fingerprint(source_path))
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, name, fingerprint = pending.pop(future)
+                entry = {"status": "error", "fingerprint": fingerprint, "png": f"{name}.png", "json": f"{name}.json"}
+                try:
+                    result = future.result()
+                except Exception as e:
+                    entry["error"] = f"[오류] {stage} 실패: {e}"
+                    record(name, entry)
+                    continue
+
+                if stage == "render":
+                    entry["status"] = "done"
+                    record(name, entry)
+                    continue
+
+                if "error" in result:
+                    entry["error"] = result["error"]
+                    record(name, entry)
+                    continue
+
+                _write_json(os.path.join(output_dir, entry["json"]), dict(result, source=name))
+                png_path = os.path.join(output_dir, entry["png"])
+                pending[render_pool.submit(render_label, result["form"], png_path)] = ("render", name, fingerprint)
+
+    print(f"완료 {finished - failed}개, 실패 {failed}개")
+    return 1 if failed else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="CPSR Part B 폴더를 일괄 OCR 하고 EU 라벨 PNG/JSON 을 만든다.")
+    parser.add_argument("input_dir", help="CPSR PDF/이미지 파일이 있는 폴더")
+    parser.add_argument("-o", "--output-dir", default="labels_output", help="결과 폴더 (기본: labels_output)")
+    parser.add_argument("--ocr-workers", type=int, default=4, help="동시에 진행할 OCR 요청 수 (기본: 4)")
+    parser.add_argument(
+        "--render-workers", type=int, default=os.cpu_count() or 1, help="라벨 이미지 렌더링 프로세스 수 (기본: CPU 수)"
+    )
+    parser.add_argument("--force", action="store_true", help="manifest 를 무시하고 모든 파일을 다시 처리")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.input_dir):
+        parser.error(f"폴더를 찾을 수 없습니다: {args.input_dir}")
+    return run_batch(
+        args.input_dir,
+        args.output_dir,
+        max(1, args.ocr_workers),
+        max(1, args.render_workers),
+        force=args.force,
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,601 @@
+"""CPSR OCR / 파싱 / EU 라벨 생성 (GUI 없음).
+
+데스크톱 앱(cpsr_app.py)과 일괄 처리(cpsr_batch.py)가 함께 쓰며, tkinter 나
+ttkbootstrap 을 import 하지 않으므로 GUI 없는 환경과 작업 프로세스에서도 불러올 수 있다.
+"""
+import os
+import re
+import threading
+import time
+import uuid
+from google.cloud import vision
+from google.cloud import storage
+from typing import Dict, Any, Callable, Optional
+import json
+from PIL import Image, ImageDraw, ImageFont
+
+try:
+    from PyPDF2 import PdfReader
+except ImportError:  # 텍스트 레이어 추출은 선택 기능
+    PdfReader = None
+
+# ======================================================================
+# 폰트 로딩
+# ======================================================================
+try:
+    font_title = ImageFont.truetype("malgunbd.ttf", 36)
+    font_bold = ImageFont.truetype("malgunbd.ttf", 24)
+    font_reg = ImageFont.truetype("malgun.ttf", 22)
+except:
+    font_title = ImageFont.load_default()
+    font_bold = ImageFont.load_default()
+    font_reg = ImageFont.load_default()
+
+# ======================================================================
+# 설정
+# ======================================================================
+try:
+    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+except NameError:
+    BASE_DIR = os.getcwd()
+
+SERVICE_ACCOUNT_FILE = 'service-account-key.json'
+GCS_BUCKET_NAME = 'yjnpartnerscpsr'
+DEFAULT_EU_RP = "YJN Europe s.r.o.\n6F, M.R. Stefanika, 010 01, Zilina, Slovak Republic"
+DEFAULT_DISTRIBUTOR = "해당국 수입 판매자(DISTRIBUTOR)의 정보 기입은 필수사항입니다."
+OCR_TIMEOUT_SECONDS = 600
+PDF_TEXT_MIN_CHARS = 500  # 이보다 긴 텍스트 레이어가 있으면 Vision 을 건너뜀 (웹 백엔드와 동일)
+OCR_POLL_SECONDS = 2
+OCR_CANCELLED = "[취소됨] 사용자가 OCR을 취소했습니다."
+
+# Vision 이 바로 읽는 이미지 형식, 그리고 데스크톱 앱/일괄 처리에서 받는 전체 형식
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".gif", ".webp", ".tif", ".tiff")
+SUPPORTED_EXTENSIONS = (".pdf",) + IMAGE_EXTENSIONS
+
+# OCR 진행 단계 (진행률 표시용)
+OCR_STAGES = ["준비", "텍스트 레이어", "업로드", "OCR 분석", "결과 수집", "파싱"]
+
+# ======================================================================
+# 텍스트 줄바꿈 유틸
+# ======================================================================
+def wrap_text(text, max_width_px, font):
+    if not text:
+        return []
+    words = text.split()
+    lines = []
+    current = ""
+    for w in words:
+        test = current + (" " if current else "") + w
+        try:
+            w_px = font.getbbox(test)[2]
+        except Exception:
+            w_px = len(test) * 7
+        if w_px <= max_width_px:
+            current = test
+        else:
+            if current:
+                lines.append(current)
+            current = w
+    if current:
+        lines.append(current)
+    return lines
+# ======================================================================
+# 1) Google Vision OCR 호출
+# ======================================================================
+
+_google_clients = None
+_google_clients_lock = threading.Lock()
+
+
+def get_google_clients():
+    """(vision, storage) 클라이언트를 프로세스 전체에서 한 번만 만들어 재사용."""
+    global _google_clients
+    with _google_clients_lock:
+        if _google_clients is None:
+            key_file_path = os.path.join(BASE_DIR, SERVICE_ACCOUNT_FILE)
+            _google_clients = (
+                vision.ImageAnnotatorClient.from_service_account_json(key_file_path),
+                storage.Client.from_service_account_json(key_file_path),
+            )
+        return _google_clients
+
+
+def extract_pdf_text_layer(file_path: str) -> str:
+    if PdfReader is None:
+        return ""
+    try:
+        reader = PdfReader(file_path)
+        return "\n".join(page.extract_text() or "" for page in reader.pages).strip()
+    except Exception:
+        return ""
+
+
+def upload_to_gcs(storage_client, file_path, bucket_name, blob_name=None):
+    # 공유 버킷에서 같은 파일명끼리 덮어쓰지 않도록 호출마다 고유한 이름을 사용
+    blob_name = blob_name or f"{uuid.uuid4().hex}_{os.path.basename(file_path)}"
+    bucket = storage_client.bucket(bucket_name)
+    blob = bucket.blob(blob_name)
+    blob.upload_from_filename(file_path)
+    return f'gs://{bucket_name}/{blob_name}'
+
+
+def call_ocr_api(
+    file_path: str,
+    progress: Optional[Callable[[str], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> str:
+    """OCR 텍스트 또는 "[오류]"/"[결과 없음]"/"[취소됨]" 메시지를 반환.
+
+    progress 는 OCR_STAGES 의 단계 이름으로 호출되고, cancel_event 가 설정되면
+    비동기 작업을 취소하고 업로드한 파일을 정리한 뒤 OCR_CANCELLED 를 반환한다.
+    """
+    def report(stage):
+        if progress:
+            progress(stage)
+
+    def cancelled():
+        return cancel_event is not None and cancel_event.is_set()
+
+    report("준비")
+    _, ext = os.path.splitext(file_path)
+    ext = ext.lower()
+
+    # -----------------------------
+    # 텍스트 레이어가 있는 PDF 는 Vision 없이 바로 사용
+    # -----------------------------
+    if ext == ".pdf":
+        report("텍스트 레이어")
+        extracted = extract_pdf_text_layer(file_path)
+        if len(extracted) >= PDF_TEXT_MIN_CHARS:
+            return extracted
+
+    try:
+        vision_client, storage_client = get_google_clients()
+    except Exception as e:
+        return f"[오류] Google API 초기화 실패: {e}"
+
+    # -----------------------------
+    # 이미지 파일 즉시 OCR
+    # -----------------------------
+    if ext in IMAGE_EXTENSIONS:
+        report("OCR 분석")
+        try:
+            with open(file_path, "rb") as f:
+                content = f.read()
+
+            image = vision.Image(content=content)
+            response = vision_client.document_text_detection(image=image)
+
+            if response.error.message:
+                return f"[오류] Vision API 오류: {response.error.message}"
+
+            if response.full_text_annotation.text:
+                return response.full_text_annotation.text
+
+            if response.text_annotations:
+                return response.text_annotations[0].description
+
+            return "[결과 없음]"
+        except Exception as e:
+            return f"[오류] 이미지 OCR 실패: {e}"
+
+    # -----------------------------
+    # PDF / TIFF → 비동기 OCR
+    # -----------------------------
+    if cancelled():
+        return OCR_CANCELLED
+
+    report("업로드")
+    upload_name = f"{uuid.uuid4().hex}_{os.path.basename(file_path)}"
+    try:
+        gcs_uri = upload_to_gcs(storage_client, file_path, GCS_BUCKET_NAME, upload_name)
+    except Exception as e:
+        return f"[오류] GCS 업로드 실패: {e}"
+
+    prefix = f"{upload_name}_output/"
+    bucket = storage_client.bucket(GCS_BUCKET_NAME)
+
+    def cleanup_uploads():
+        try:
+            for blob in bucket.list_blobs(prefix=prefix):
+                blob.delete()
+            bucket.blob(upload_name).delete()
+        except Exception:
+            pass
+
+    # 업로드 도중 취소했다면 OCR 요청 없이 정리하고 끝낸다.
+    if cancelled():
+        cleanup_uploads()
+        return OCR_CANCELLED
+
+    destination_uri = f"gs://{GCS_BUCKET_NAME}/{prefix}"
+
+    mime_type = "application/pdf"
+    if ext in [".tif", ".tiff"]:
+        mime_type = "image/tiff"
+
+    input_config = vision.InputConfig(
+        gcs_source=vision.GcsSource(uri=gcs_uri),
+        mime_type=mime_type
+    )
+    output_config = vision.OutputConfig(
+        gcs_destination=vision.GcsDestination(uri=destination_uri),
+        batch_size=1
+    )
+
+    request = vision.AsyncAnnotateFileRequest(
+        input_config=input_config,
+        features=[vision.Feature(type=vision.Feature.Type.DOCUMENT_TEXT_DETECTION)],
+        output_config=output_config
+    )
+
+    report("OCR 분석")
+    try:
+        operation = vision_client.async_batch_annotate_files(requests=[request])
+        # result(timeout=...) 는 취소할 수 없으므로 done() 을 짧게 폴링한다.
+        deadline = time.monotonic() + OCR_TIMEOUT_SECONDS
+        while not operation.done():
+            if cancelled():
+                try:
+                    operation.cancel()
+                except Exception:
+                    pass
+                cleanup_uploads()
+                return OCR_CANCELLED
+            if time.monotonic() > deadline:
+                cleanup_uploads()
+                return f"[오류] 비동기 OCR 실패: {OCR_TIMEOUT_SECONDS}초 안에 완료되지 않았습니다."
+            if cancel_event is not None:
+                cancel_event.wait(OCR_POLL_SECONDS)
+            else:
+                time.sleep(OCR_POLL_SECONDS)
+        operation.result()
+    except Exception as e:
+        cleanup_uploads()
+        return f"[오류] 비동기 OCR 실패: {e}"
+
+    report("결과 수집")
+
+    # JSON 결과 합치기
+    json_blobs = list(bucket.list_blobs(prefix=prefix))
+    json_blobs = [b for b in json_blobs if b.name.endswith(".json")]
+
+    if not json_blobs:
+        return "[결과 없음] JSON 결과 없음"
+
+    json_blobs.sort(key=lambda b: b.name)
+    full_text = ""
+
+    try:
+        for blob in json_blobs:
+            # 페이지가 많으면 다운로드가 길어지므로 파일마다 취소 여부 확인 (정리는 finally 에서)
+            if cancelled():
+                return OCR_CANCELLED
+            text = blob.download_as_bytes().decode("utf-8")
+            parsed = json.loads(text)
+
+            for resp in parsed.get("responses", []):
+                if "fullTextAnnotation" in resp:
+                    full_text += resp["fullTextAnnotation"].get("text", "") + "\n"
+
+    except Exception as e:
+        return f"[오류] JSON 파싱 오류: {e}"
+    finally:
+        # 결과 파일 정리
+        try:
+            for blob in json_blobs:
+                blob.delete()
+            bucket.blob(upload_name).delete()
+        except Exception:
+            pass
+
+    return full_text.strip() if full_text.strip() else "[결과 없음]"
+
+
+# ======================================================================
+# 2) OCR Parsing
+# ======================================================================
+
+def _clean_field_text(text):
+    if not text:
+        return ""
+    t = re.sub(r"\s+", " ", text).strip()
+    t = re.sub(
+        r'^(Product\s*Name|판매명|제품명|Description|Claim/Function|Function|Marketing\s*Claim/Function|Marketing\s*Claim|How\s*to\s*use|Warning|Responsible\s*Person|Ingredients|Net\s*Content)[:\-\s]+\s*',
+        "",
+        t,
+        flags=re.IGNORECASE
+    )
+    return t.strip()
+
+
+def _extract_field(start_pattern, end_pattern, text):
+    regex = r"(" + start_pattern + r")\s*[:=\-\s]*(.*?)(?=\s*" + end_pattern + r"|\Z)"
+    m = re.search(regex, text, re.IGNORECASE | re.DOTALL)
+    return _clean_field_text(m.group(2)) if m else None
+
+
+def parse_ocr_text_to_data(ocr_text: str) -> Dict[str, Any]:
+
+    if ocr_text.startswith(("[오류]", "[결과 없음]")):
+        return {"Error": ocr_text}
+
+    cleaned = re.sub(r"[\r\n]+", " ", ocr_text)
+
+    # CPSR Section 분리
+    m_section = re.search(
+        r"Labelled warnings and instructions of use(.*?)(Reasoning|Assessor|Annex|\Z)",
+        cleaned,
+        flags=re.IGNORECASE | re.DOTALL
+    )
+    section = m_section.group(1).strip() if m_section else cleaned
+
+    data = {
+        "Product Name": _extract_field(r"Label\w* Information", r"Description", section),
+        "Description": _extract_field(r"Description", r"Marketing", section),
+        "Function/Claim": _extract_field(r"Marketing", r"How to use", section),
+        "Usage / Instructions": _extract_field(r"How to use", r"Warning", section),
+        "Warnings / Precautions": _extract_field(r"Warning", r"Responsible|Ingredients", section),
+        "Responsible Person": _extract_field(r"Responsible", r"Ingredients", section),
+        "INCI / Ingredients": _extract_field(r"Ingredients", r"Net Content", section),
+        "Net Content": None,
+        "Batch / Lot": None,
+        "Expiry Date": None,
+        "Country of Origin": None,
+    }
+
+    # Net Content 세부 필드
+    net = _extract_field(r"Net Content", r"Warning|$", section)
+    if net:
+        # Net Content
+        m_nc = re.search(r"(\d+\s*(ml|mL|g|G))", net)
+        if m_nc:
+            data["Net Content"] = m_nc.group(1)
+
+        # Expiry
+        m_exp = re.search(r"Best Before.*?:\s*(.*?)(,|$)", net)
+        if m_exp:
+            data["Expiry Date"] = m_exp.group(1).strip()
+
+        # LOT
+        m_lot = re.search(r"LOT\s*:\s*(.*?)(,|$)", net)
+        if m_lot:
+            data["Batch / Lot"] = m_lot.group(1).strip()
+
+        # Origin
+        m_origin = re.search(r"Origin\s*:\s*(.*?)(,|$)", net)
+        if m_origin:
+            val = m_origin.group(1).strip()
+            val = re.sub(r"\s+\d{1,3}$", "", val)
+            data["Country of Origin"] = val
+
+    # fallback product name
+    if not data["Product Name"]:
+        if "UNICONIC SHIELD FIXER" in cleaned:
+            data["Product Name"] = "SELF BEAUTY UNICONIC SHIELD FIXER"
+
+    return data
+# ======================================================================
+# 3) INCI 기반 자동 경고 생성
+# ======================================================================
+def generate_auto_warnings_from_inci(inci_text: str) -> str:
+    if not inci_text:
+        return ""
+    s = inci_text.lower()
+    warnings = []
+
+    # 대표 알레르겐 예시
+    allergens = [
+        "limonene", "linalool", "citral", "geraniol", "coumarin",
+        "eugenol", "farnesol", "benzyl alcohol", "benzyl salicylate",
+        "citronellol", "hexyl cinnamal", "parfum"
+    ]
+    found = []
+    for a in allergens:
+        if a in s and a not in found:
+            found.append(a)
+            warnings.append(f"Contains allergen: {a.capitalize()}.")
+
+    if "alcohol denat" in s:
+        warnings.append("Caution: Contains denatured alcohol; may be drying for sensitive skin.")
+    if "althaea rosea flower extract" in s:
+        warnings.append("Check for floral extract sensitivities.")
+
+    # 기본 어린이 주의 문구
+    if "Not to be used for children under three years of age." not in warnings:
+        warnings.append("Not to be used for children under three years of age.")
+
+    return "\n".join(warnings) if warnings else "No specific INCI warnings detected."
+
+
+# ======================================================================
+# 4) EU 라벨 텍스트 구성 (1~11번 포맷)
+# ======================================================================
+def compose_eu_label_text(form_data: Dict[str, str]) -> str:
+    lines = []
+    lines.append("────────────────────────────────────────────")
+    lines.append("              YJN 파트너스 라벨 예시안")
+    lines.append("────────────────────────────────────────────\n")
+
+    lines.append("1. Product Name:")
+    lines.append(form_data.get("Product Name", "N/A") + "\n")
+
+    lines.append("2. Product Function:")
+    lines.append(form_data.get("Function/Claim", "N/A") + "\n")
+
+    lines.append("3. How to Use:")
+    lines.append(form_data.get("Usage / Instructions", "N/A") + "\n")
+
+    lines.append("4. Warning / Precautions:")
+    lines.append(form_data.get("Warnings / Precautions", "N/A") + "\n")
+
+    lines.append("5. Ingredients (INCI):")
+    lines.append(form_data.get("INCI / Ingredients", "N/A") + "\n")
+
+    lines.append("6. Expiry Date:")
+    lines.append(form_data.get("Expiry Date", "Shown on the package") + "\n")
+
+    lines.append("7. EU Responsible Person:")
+    lines.append(form_data.get("EU Responsible Person", DEFAULT_EU_RP) + "\n")
+
+    lines.append("8. Distributor Name and Address:")
+    distributor_val = form_data.get(
+        "Distributor",
+        "해당국 수입 판매자(DISTRIBUTOR)의 정보 기입은 필수사항입니다."
+    )
+    lines.append(distributor_val)
+    lines.append("※ DT는 필수 기재사항 / Manufacturer 문구는 선택 사항\n")
+
+    lines.append("9. Country of Origin:")
+    lines.append(form_data.get("Country of Origin", "Made in Korea") + "\n")
+
+    lines.append("10. Batch Number:")
+    lines.append(form_data.get("Batch / Lot", "Shown on the package (LOT 번호 사용가능)") + "\n")
+
+    lines.append("11. Nominal Quantities:")
+    lines.append(form_data.get("Net Content", "N/A") + "\n")
+
+    lines.append("────────────────────────────────────────────")
+    lines.append("※ 이 라벨 예시는 CPSR Part B를 기반으로 자동 생성된 초안입니다.")
+    lines.append("※ 실제 사용 전, EU 규정(EC) 1223/2009 및 각국 라벨링 요건을 다시 검토해야 합니다.")
+    lines.append("────────────────────────────────────────────")
+
+    return "\n".join(lines)
+
+
+# ======================================================================
+# 5) 이미지 라벨 생성 (로고 + 1~11번 포맷)
+# ======================================================================
+def generate_label_image_from_form(form_data: Dict[str, str], save_path: str) -> str:
+    W, H = 1000, 1800
+    margin = 40
+    bg = "white"
+
+    img = Image.new("RGB", (W, H), color=bg)
+    draw = ImageDraw.Draw(img)
+
+    try:
+        font_title = ImageFont.truetype("malgunbd.ttf", 36)
+        font_bold = ImageFont.truetype("malgunbd.ttf", 24)
+        font_reg = ImageFont.truetype("malgun.ttf", 22)
+    except Exception:
+        font_title = ImageFont.load_default()
+        font_bold = ImageFont.load_default()
+        font_reg = ImageFont.load_default()
+
+    x = margin
+    y = margin
+
+    # -------------------------
+    # 상단 로고 (yjn로고.png)
+    # -------------------------
+    try:
+        logo = Image.open("yjn로고.png")
+        logo_ratio = W / logo.width
+        logo_h = int(logo.height * logo_ratio)
+        logo = logo.resize((W, logo_h), Image.LANCZOS)
+        img.paste(logo, (0, y))
+        y += logo_h + 30
+    except Exception as e:
+        print("라벨 로고 로딩 실패:", e)
+        title = form_data.get("Product Name", "Product Name")
+        draw.text((x, y), title, font=font_title, fill="black")
+        y += 70
+
+    # 블록 출력 함수
+    def write_block(number, label, content, extra_comment=None, gap=28):
+        nonlocal y
+        draw.text((x, y), f"{number}. {label}", font=font_bold, fill="black")
+        y += gap
+        for line in wrap_text(content, W - 2 * margin, font_reg):
+            draw.text((x, y), line, font=font_reg, fill="black")
+            y += gap
+        if extra_comment:
+            draw.text((x + 20, y), extra_comment, font=font_reg, fill="black")
+            y += gap
+        y += 12
+
+    # 1~11 항목
+    write_block(1, "Product Name:", form_data.get("Product Name", "N/A"))
+    write_block(2, "Product Function:", form_data.get("Function/Claim", "N/A"))
+    write_block(3, "How to Use:", form_data.get("Usage / Instructions", "N/A"))
+    write_block(4, "Warning / Precautions:", form_data.get("Warnings / Precautions", "N/A"))
+    write_block(5, "Ingredients (INCI):", form_data.get("INCI / Ingredients", "N/A"))
+    write_block(6, "Expiry Date:", form_data.get("Expiry Date", "Shown on the package"))
+
+    write_block(7, "EU Responsible Person:",
+                form_data.get("EU Responsible Person", DEFAULT_EU_RP))
+
+    write_block(
+        8,
+        "Distributor Name and Address:",
+        form_data.get("Distributor", "해당국 수입 판매자(DISTRIBUTOR)의 정보 기입은 필수사항입니다."),
+        extra_comment="※ DT는 필수 기재사항 / Manufacturer 문구는 선택 사항"
+    )
+
+    write_block(9, "Country of Origin:", form_data.get("Country of Origin", "Made in Korea"))
+
+    write_block(
+        10,
+        "Batch Number:",
+        form_data.get("Batch / Lot", "Shown on the package (LOT 번호 사용가능)"),
+        extra_comment="(LOT 번호 사용 가능)"
+    )
+
+    write_block(11, "Nominal Quantities:", form_data.get("Net Content", "N/A"))
+
+    # 하단 고정 문구
+    y = H - 120
+    draw.line((margin, y, W - margin, y), fill="black", width=1)
+    y += 10
+
+    rp = form_data.get("EU Responsible Person", DEFAULT_EU_RP)
+    for line in rp.split("\n"):
+        draw.text((x, y), line, font=font_reg, fill="black")
+        y += 28
+
+    y += 6
+    draw.text(
+        (x, y),
+        "※ 이 라벨 이미지는 CPSR Part B를 기반으로 자동 생성된 예시안입니다.",
+        font=font_reg,
+        fill="black",
+    )
+
+    img.save(save_path)
+    return save_path
+
+
+# ======================================================================
+# 6) OCR → 라벨 폼 데이터 (일괄 처리용)
+# ======================================================================
+def form_from_parsed(parsed: Dict[str, Any]) -> Dict[str, str]:
+    """GUI 의 폼 기본값과 같은 규칙으로 파싱 결과를 라벨용 폼 데이터로 변환."""
+    return {
+        "Product Name": parsed.get("Product Name") or "",
+        "Function/Claim": parsed.get("Function/Claim") or "",
+        "Usage / Instructions": parsed.get("Usage / Instructions") or "",
+        "Warnings / Precautions": parsed.get("Warnings / Precautions") or "",
+        "INCI / Ingredients": parsed.get("INCI / Ingredients") or "",
+        "Distributor": DEFAULT_DISTRIBUTOR,
+        "EU Responsible Person": parsed.get("Responsible Person") or DEFAULT_EU_RP,
+        "Country of Origin": parsed.get("Country of Origin") or "Made in Korea",
+        "Batch / Lot": parsed.get("Batch / Lot") or "Shown on the package (LOT 번호 사용가능)",
+        "Expiry Date": parsed.get("Expiry Date") or "Shown on the package",
+        "Net Content": parsed.get("Net Content") or "",
+    }
+
+
+def ocr_and_parse(source_path: str) -> Dict[str, Any]:
+    ocr_text = call_ocr_api(source_path)
+    if ocr_text.startswith(("[오류]", "[결과 없음]")):
+        return {"error": ocr_text}
+    parsed = parse_ocr_text_to_data(ocr_text)
+    form = form_from_parsed(parsed)
+    return {
+        "ocr_text": ocr_text,
+        "parsed": parsed,
+        "form": form,
+        "label_text": compose_eu_label_text(form),
+        "auto_warnings": generate_auto_warnings_from_inci(form["INCI / Ingredients"]),
+    }
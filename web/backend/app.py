@@ -1,33 +1,233 @@
+import asyncio
 import io
+import logging
 import os
 import re
+import threading
 import time
 import json
-import html
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager, suppress
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import FastAPI, File, Query, Request, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from google.cloud import vision
 from google.cloud import storage
 from google.cloud import firestore
-from PyPDF2 import PdfReader
 from pydantic import BaseModel
-import requests
+from PyPDF2 import PdfReader, PdfWriter
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.pdfgen import canvas
+from starlette.background import BackgroundTask
+
+from .clients import ClientRegistry
+from .executors import BoundedExecutor, PoolSaturated
+from .fonts import font_for_char, font_runs
+from .history_cache import HistoryCache, etag_matches
+from .history_store import (
+    Cursor,
+    FirestoreHistoryStore,
+    HistoryItem,
+    HistoryStore,
+    SUMMARY_FIELDS,
+    SqliteHistoryStore,
+    decode_cursor,
+    encode_cursor,
+)
+from .jobs import JobQueueFull, OcrJobManager
+from .label_image import IMAGE_FORMATS, LabelImageRenderer
+from .ocr_cache import OcrResultCache
+from .pdf_cache import PdfCache, pdf_etag, pdf_key
+from .pdf_text import PdfTextExtractor
+from .search_index import HistorySearchIndex
+from .text_wrap import wrap_text
+from .translation_cache import SqliteTranslationStore, TranslationCache
+from .translation_segments import from_html, segment_field, splice, to_html
+from .translator import TranslationError, translate_targets
+from .uploads import RequestBodyLimit, SpooledUpload, UploadTooLarge, spool_upload, sweep_stale_uploads
+
+logger = logging.getLogger(__name__)
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-SERVICE_ACCOUNT_FILE = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", "")
 GCS_BUCKET_NAME = os.getenv("GCS_BUCKET_NAME", "")
 DEFAULT_EU_RP = "YJN Europe s.r.o.\n6F, M.R. Stefanika, 010 01, Zilina, Slovak Republic"
 HISTORY_COLLECTION = "ocr_history"
-HISTORY_LIMIT = 10
+HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", "10"))
+HISTORY_PAGE_MAX = 100
+HISTORY_INDEX_REFRESH_SECONDS = float(os.getenv("HISTORY_INDEX_REFRESH_SECONDS", "30"))
+HISTORY_INDEX_LOOK_BACK_SECONDS = float(os.getenv("HISTORY_INDEX_LOOK_BACK_SECONDS", "300"))
+HISTORY_INDEX_RECONCILE_SECONDS = float(os.getenv("HISTORY_INDEX_RECONCILE_SECONDS", "600"))
+HISTORY_DELETE_BATCH = 500
+HISTORY_DELETE_CONCURRENCY = int(os.getenv("HISTORY_DELETE_CONCURRENCY", "4"))
+HISTORY_CACHE_TTL_SECONDS = float(os.getenv("HISTORY_CACHE_TTL_SECONDS", "30"))
+HISTORY_LISTEN = os.getenv("HISTORY_LISTEN", "").lower() in ("1", "true", "yes")
+HISTORY_BACKEND = os.getenv("HISTORY_BACKEND", "firestore")
+HISTORY_SQLITE_PATH = os.getenv("HISTORY_SQLITE_PATH", os.path.join(BASE_DIR, "cache", "history.sqlite3"))
+OCR_CACHE_DIR = os.getenv("OCR_CACHE_DIR", os.path.join(BASE_DIR, "cache", "ocr"))
+OCR_CACHE_MEMORY_ITEMS = int(os.getenv("OCR_CACHE_MEMORY_ITEMS", "64"))
+OCR_CACHE_TTL_SECONDS = int(os.getenv("OCR_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+OCR_CACHE_MAX_BYTES = int(os.getenv("OCR_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+OCR_CACHE_SWEEP_SECONDS = int(os.getenv("OCR_CACHE_SWEEP_SECONDS", "600"))
+OCR_JOB_WORKERS = int(os.getenv("OCR_JOB_WORKERS", "2"))
+OCR_JOB_QUEUE = int(os.getenv("OCR_JOB_QUEUE", "16"))
+OCR_JOB_RETENTION_SECONDS = int(os.getenv("OCR_JOB_RETENTION_SECONDS", "3600"))
+OCR_JOB_DRAIN_SECONDS = float(os.getenv("OCR_JOB_DRAIN_SECONDS", "30"))
+OCR_POOL_WORKERS = int(os.getenv("OCR_POOL_WORKERS", "8"))
+OCR_POOL_QUEUE = int(os.getenv("OCR_POOL_QUEUE", "32"))
+RENDER_POOL_WORKERS = int(os.getenv("RENDER_POOL_WORKERS", str(os.cpu_count() or 2)))
+RENDER_POOL_QUEUE = int(os.getenv("RENDER_POOL_QUEUE", "16"))
+LABEL_LOGO_PATH = os.getenv("LABEL_LOGO_PATH", os.path.join(os.path.dirname(os.path.dirname(BASE_DIR)), "yjn로고.png"))
+PDF_CACHE_ITEMS = int(os.getenv("PDF_CACHE_ITEMS", "64"))
+PDF_CACHE_MAX_BYTES = int(os.getenv("PDF_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+PDF_TEXT_WORKERS = int(os.getenv("PDF_TEXT_WORKERS", str(os.cpu_count() or 1)))
+PDF_TEXT_PARALLEL_MIN_PAGES = int(os.getenv("PDF_TEXT_PARALLEL_MIN_PAGES", "64"))
+OCR_MODES = ("section", "full")
+OCR_DEFAULT_MODE = os.getenv("OCR_DEFAULT_MODE", "full")
+OCR_INLINE_MAX_PAGES = 5
+OCR_INLINE_MAX_BYTES = int(os.getenv("OCR_INLINE_MAX_BYTES", str(20 * 1024 * 1024)))
+OCR_SECTION_MAX_PAGES = int(os.getenv("OCR_SECTION_MAX_PAGES", "20"))
+OCR_SECTION_PROBE_PAGES = int(os.getenv("OCR_SECTION_PROBE_PAGES", "15"))
+SECTION_START_PATTERN = r"Labelled warnings and instructions of use"
+SECTION_END_PATTERN = r"Reasoning|Assessor|Annex"
+OCR_BATCH_MAX_FILES = int(os.getenv("OCR_BATCH_MAX_FILES", "50"))
+OCR_BATCH_IMAGE_GROUP = 16
+# Images travel base64-encoded inline; keep each batch request under Vision's 10 MB request limit.
+OCR_BATCH_IMAGE_GROUP_BYTES = int(os.getenv("OCR_BATCH_IMAGE_GROUP_BYTES", str(7 * 1024 * 1024)))
+OCR_BATCH_PDF_CONCURRENCY = int(os.getenv("OCR_BATCH_PDF_CONCURRENCY", "4"))
+TRANSLATION_CACHE_PATH = os.getenv("TRANSLATION_CACHE_PATH", os.path.join(BASE_DIR, "cache", "translations.sqlite3"))
+TRANSLATION_CACHE_MEMORY_ITEMS = int(os.getenv("TRANSLATION_CACHE_MEMORY_ITEMS", "4096"))
+TRANSLATE_CONCURRENCY = int(os.getenv("TRANSLATE_CONCURRENCY", "8"))
+UPLOAD_TMP_DIR = os.getenv("UPLOAD_TMP_DIR", os.path.join(BASE_DIR, "tmp"))
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(50 * 1024 * 1024)))
+UPLOAD_STALE_SECONDS = int(os.getenv("UPLOAD_STALE_SECONDS", "3600"))
+# Whole-request caps enforced before multipart parsing; a little headroom covers the multipart framing.
+UPLOAD_REQUEST_MAX_BYTES = int(os.getenv("UPLOAD_REQUEST_MAX_BYTES", str(UPLOAD_MAX_BYTES + 1024 * 1024)))
+UPLOAD_BATCH_MAX_BYTES = int(os.getenv("UPLOAD_BATCH_MAX_BYTES", str(200 * 1024 * 1024)))
+ALLOWED_UPLOAD_EXTENSIONS = {".pdf", ".jpg", ".jpeg", ".png", ".tif", ".tiff", ".bmp", ".webp"}
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".gif", ".webp", ".tif", ".tiff"}
+
+
+def _make_ocr_cache() -> OcrResultCache:
+    return OcrResultCache(
+        OCR_CACHE_DIR,
+        memory_items=OCR_CACHE_MEMORY_ITEMS,
+        ttl=OCR_CACHE_TTL_SECONDS,
+        max_bytes=OCR_CACHE_MAX_BYTES,
+        sweep_interval=OCR_CACHE_SWEEP_SECONDS,
+    )
+
+
+def _make_ocr_jobs() -> OcrJobManager:
+    return OcrJobManager(
+        max_workers=OCR_JOB_WORKERS,
+        max_pending=OCR_JOB_QUEUE,
+        retention=OCR_JOB_RETENTION_SECONDS,
+    )
+
+
+def _make_pools() -> Dict[str, BoundedExecutor]:
+    return {
+        "ocr": BoundedExecutor("ocr", OCR_POOL_WORKERS, OCR_POOL_QUEUE),
+        "render": BoundedExecutor("render", RENDER_POOL_WORKERS, RENDER_POOL_QUEUE),
+    }
+
+
+def _make_translate_pool() -> ThreadPoolExecutor:
+    # Shared by every /api/translate request: TRANSLATE_CONCURRENCY bounds upstream calls process-wide.
+    return ThreadPoolExecutor(max_workers=TRANSLATE_CONCURRENCY, thread_name_prefix="translate")
+
+
+def _make_pdf_text() -> PdfTextExtractor:
+    return PdfTextExtractor(workers=PDF_TEXT_WORKERS, min_pages=PDF_TEXT_PARALLEL_MIN_PAGES)
+
+
+def _make_pdf_cache() -> PdfCache:
+    return PdfCache(max_items=PDF_CACHE_ITEMS, max_bytes=PDF_CACHE_MAX_BYTES)
+
+
+def _make_label_renderer() -> LabelImageRenderer:
+    return LabelImageRenderer(LABEL_LOGO_PATH, DEFAULT_EU_RP)
+
+
+def _make_translation_cache() -> TranslationCache:
+    return TranslationCache(
+        SqliteTranslationStore(TRANSLATION_CACHE_PATH),
+        memory_items=TRANSLATION_CACHE_MEMORY_ITEMS,
+    )
+
+
+def _make_history_store() -> HistoryStore:
+    if HISTORY_BACKEND == "sqlite":
+        return SqliteHistoryStore(HISTORY_SQLITE_PATH)
+    if HISTORY_BACKEND != "firestore":
+        raise ValueError(f"Unknown HISTORY_BACKEND: {HISTORY_BACKEND}")
+    return FirestoreHistoryStore(
+        _firestore_client,
+        HISTORY_COLLECTION,
+        delete_batch=HISTORY_DELETE_BATCH,
+        delete_concurrency=HISTORY_DELETE_CONCURRENCY,
+    )
+
+
+def _history_payload(items: List[HistoryItem], limit: int) -> Dict[str, Any]:
+    next_cursor = encode_cursor(items[limit - 1]) if len(items) > limit else None
+    return {"items": items[:limit], "next_cursor": next_cursor}
+
+
+def _listen_history(store: HistoryStore, cache: HistoryCache) -> Optional[Callable[[], None]]:
+    return store.listen(
+        HISTORY_PAGE_SIZE + 1,
+        lambda items: cache.store(_history_payload(items, HISTORY_PAGE_SIZE)),
+    )
 
-app = FastAPI(title="CPSR Label Web")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    sweep_stale_uploads(UPLOAD_TMP_DIR, UPLOAD_STALE_SECONDS)
+    app.state.clients = ClientRegistry()
+    app.state.ocr_cache = _make_ocr_cache()
+    app.state.ocr_jobs = _make_ocr_jobs()
+    app.state.pools = _make_pools()
+    app.state.translate_pool = _make_translate_pool()
+    app.state.pdf_text = _make_pdf_text()
+    app.state.pdf_cache = _make_pdf_cache()
+    app.state.label_renderer = _make_label_renderer()
+    app.state.translation_cache = _make_translation_cache()
+    app.state.history_cache = HistoryCache(HISTORY_CACHE_TTL_SECONDS)
+    app.state.history_store = _make_history_store()
+    app.state.history_index = HistorySearchIndex()
+    app.state.history_unsubscribe = _listen_history(app.state.history_store, app.state.history_cache) if HISTORY_LISTEN else None
+    try:
+        yield
+    finally:
+        if app.state.history_unsubscribe is not None:
+            app.state.history_unsubscribe()
+        app.state.ocr_jobs.shutdown(OCR_JOB_DRAIN_SECONDS)
+        for pool in app.state.pools.values():
+            pool.shutdown()
+        app.state.translate_pool.shutdown(wait=False, cancel_futures=True)
+        app.state.pdf_text.shutdown()
+        app.state.translation_cache.close()
+        app.state.history_store.close()
+        app.state.clients.close()
+
+
+app = FastAPI(title="CPSR Label Web", lifespan=lifespan)
+_state_lock = threading.RLock()
+# Added before CORS so 413 responses still carry CORS headers.
+app.add_middleware(
+    RequestBodyLimit,
+    limits={
+        "/api/ocr": (UPLOAD_REQUEST_MAX_BYTES, UPLOAD_MAX_BYTES),
+        "/api/ocr/jobs": (UPLOAD_REQUEST_MAX_BYTES, UPLOAD_MAX_BYTES),
+        "/api/ocr/batch": (UPLOAD_BATCH_MAX_BYTES, UPLOAD_BATCH_MAX_BYTES),
+    },
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -38,6 +238,7 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-OCR-Cache", "Retry-After", "ETag"],
 )
 
 class LabelForm(BaseModel):
@@ -68,98 +269,236 @@ class PdfMultiRequest(BaseModel):
     sections: List[PdfSection]
 
 
+def _state(name: str, factory: Callable[[], Any]) -> Any:
+    """``app.state.<name>``, built once under a lock if the lifespan has not set it up."""
+    value = getattr(app.state, name, None)
+    if value is None:
+        # Re-entrant: a factory may resolve other state, e.g. the history store needs the clients.
+        with _state_lock:
+            value = getattr(app.state, name, None)
+            if value is None:
+                value = factory()
+                setattr(app.state, name, value)
+    return value
+
+
+def _clients() -> ClientRegistry:
+    return _state("clients", ClientRegistry)
+
+
+def _ocr_cache() -> OcrResultCache:
+    return _state("ocr_cache", _make_ocr_cache)
+
+
+def _ocr_jobs() -> OcrJobManager:
+    return _state("ocr_jobs", _make_ocr_jobs)
+
+
+def _pools() -> Dict[str, BoundedExecutor]:
+    return _state("pools", _make_pools)
+
+
+def _translate_pool() -> ThreadPoolExecutor:
+    return _state("translate_pool", _make_translate_pool)
+
+
+def _pdf_text() -> PdfTextExtractor:
+    return _state("pdf_text", _make_pdf_text)
+
+
+def _pdf_cache() -> PdfCache:
+    return _state("pdf_cache", _make_pdf_cache)
+
+
+def _label_renderer() -> LabelImageRenderer:
+    return _state("label_renderer", _make_label_renderer)
+
+
+def _translation_cache() -> TranslationCache:
+    return _state("translation_cache", _make_translation_cache)
+
+
+def _history_cache() -> HistoryCache:
+    return _state("history_cache", lambda: HistoryCache(HISTORY_CACHE_TTL_SECONDS))
+
+
+def _history_store() -> HistoryStore:
+    return _state("history_store", _make_history_store)
+
+
+def _history_index() -> HistorySearchIndex:
+    return _state("history_index", HistorySearchIndex)
+
+
+def _submit_blocking(pool: str, fn: Callable[..., Any], *args: Any) -> Future:
+    try:
+        return _pools()[pool].submit(fn, *args)
+    except PoolSaturated as exc:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Server busy ({exc.pool}). Please retry shortly.",
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
+
+async def _run_blocking(pool: str, fn: Callable[..., Any], *args: Any) -> Any:
+    return await asyncio.wrap_future(_submit_blocking(pool, fn, *args))
+
+
+async def _finish_blocking(future: Future) -> Any:
+    """Await ``future``; if cancelled once it has started, wait for the worker thread before re-raising.
+
+    Lets the caller free what the call reads (temp uploads) without racing the thread.
+    """
+    waiter = asyncio.wrap_future(future)
+    try:
+        return await asyncio.shield(waiter)
+    except asyncio.CancelledError:
+        if not future.cancel():
+            while not waiter.done():
+                with suppress(asyncio.CancelledError):
+                    await asyncio.wait([waiter])
+            if not waiter.cancelled():
+                waiter.exception()
+        raise
+
+
 def _vision_client() -> vision.ImageAnnotatorClient:
-    if SERVICE_ACCOUNT_FILE and os.path.exists(SERVICE_ACCOUNT_FILE):
-        return vision.ImageAnnotatorClient.from_service_account_json(SERVICE_ACCOUNT_FILE)
-    return vision.ImageAnnotatorClient()
+    return _clients().vision()
 
 
 def _storage_client() -> storage.Client:
-    if SERVICE_ACCOUNT_FILE and os.path.exists(SERVICE_ACCOUNT_FILE):
-        return storage.Client.from_service_account_json(SERVICE_ACCOUNT_FILE)
-    return storage.Client()
+    return _clients().storage()
 
 
 def _firestore_client() -> firestore.Client:
-    if SERVICE_ACCOUNT_FILE and os.path.exists(SERVICE_ACCOUNT_FILE):
-        return firestore.Client.from_service_account_json(SERVICE_ACCOUNT_FILE)
-    return firestore.Client()
+    return _clients().firestore()
 
 
-def _serialize_history_item(data: Dict[str, Any]) -> Dict[str, Any]:
-    serialized = dict(data)
-    created_at = serialized.get("created_at")
-    if created_at is not None:
-        try:
-            serialized["created_at"] = created_at.isoformat()
-        except Exception:
-            serialized["created_at"] = str(created_at)
-    return serialized
+def _translate_texts(texts: List[str], target: str, fmt: str = "text") -> List[str]:
+    if not os.getenv("TRANSLATE_API_KEY", ""):
+        raise HTTPException(status_code=500, detail="Translate API key missing.")
+    try:
+        return _clients().translator().translate(texts, target, fmt)
+    except TranslationError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail)
+
+
+def _translate_cached(texts: List[str], target: str) -> Tuple[List[str], int, int]:
+    """Translations of ``texts``, the text characters sent upstream and the markup sent with them.
+
+    Texts go out (and are cached) as HTML so protected spans stay in their sentence untranslated.
+    """
+    cache = _translation_cache()
+    sources = [to_html(text) for text in texts]
+    known = cache.lookup(target, sources)
+    misses = {source: text for source, text in zip(sources, texts) if source not in known}
+    if misses:
+        fresh = dict(zip(misses, _translate_texts(list(misses), target, "html")))
+        cache.save(target, fresh)
+        known.update(fresh)
+    sent = sum(len(text) for text in misses.values())
+    markup = sum(len(source) for source in misses) - sent
+    return [from_html(known.get(source, "")) for source in sources], sent, markup
+
+
+@app.get("/api/metrics")
+def get_metrics():
+    return JSONResponse(
+        {
+            "clients": _clients().stats(),
+            "ocr_cache": _ocr_cache().stats(),
+            "ocr_jobs": _ocr_jobs().stats(),
+            "pools": {name: pool.stats() for name, pool in _pools().items()},
+            "pdf_cache": _pdf_cache().stats(),
+            "translation_cache": _translation_cache().stats(),
+            "history_cache": _history_cache().stats(),
+            "history_index": _history_index().stats(),
+        }
+    )
 
 
-def _translate_texts(texts: List[str], target: str) -> List[str]:
-    api_key = os.getenv("TRANSLATE_API_KEY", "")
-    if not api_key:
-        raise HTTPException(status_code=500, detail="Translate API key missing.")
-    url = f"https://translation.googleapis.com/language/translate/v2?key={api_key}"
-    payload = {"q": texts, "target": target, "format": "text"}
+def _history_response(body: bytes, etag: str) -> Response:
+    return Response(body, media_type="application/json", headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+def _history_cursor(cursor: Optional[str]) -> Optional[Cursor]:
+    if not cursor:
+        return None
     try:
-        resp = requests.post(url, json=payload, timeout=15)
-        if not resp.ok:
-            error_text = resp.text[:1000]
-            raise HTTPException(
-                status_code=resp.status_code,
-                detail=f"Translate API error: {error_text}",
-            )
-    except HTTPException:
-        raise
-    except Exception as exc:
-        raise HTTPException(status_code=502, detail=f"Translate API error: {exc}")
-    data = resp.json()
-    translations = data.get("data", {}).get("translations", [])
-    results = []
-    for item in translations:
-        results.append(html.unescape(item.get("translatedText", "")))
-    return results
+        return decode_cursor(cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
 
-def _fetch_history_items(db: firestore.Client) -> List[Dict[str, Any]]:
-    docs = (
-        db.collection(HISTORY_COLLECTION)
-        .order_by("created_at", direction=firestore.Query.DESCENDING)
-        .limit(HISTORY_LIMIT)
-        .stream()
-    )
-    items: List[Dict[str, Any]] = []
-    for doc in docs:
-        data = doc.to_dict()
-        data = _serialize_history_item(data)
-        data["id"] = doc.id
-        items.append(data)
-    return items
-
-
-def _trim_history(db: firestore.Client) -> None:
-    docs = (
-        db.collection(HISTORY_COLLECTION)
-        .order_by("created_at", direction=firestore.Query.DESCENDING)
-        .offset(HISTORY_LIMIT)
-        .stream()
-    )
-    for doc in docs:
-        doc.reference.delete()
+def _history_first_page() -> Dict[str, Any]:
+    return _history_payload(_history_store().page(HISTORY_PAGE_SIZE + 1), HISTORY_PAGE_SIZE)
+
+
+def _history_first_page_with(item: HistoryItem) -> Dict[str, Any]:
+    """First page after inserting ``item``: the cached first page plus the new entry, else a store read.
+
+    Only this worker's cached page is extended; the search index is per worker and would
+    miss other workers' inserts and deletes.
+    """
+    cached = _history_cache().page()
+    if cached is None:
+        return _history_first_page()
+    summary = {field: item.get(field) for field in ("id",) + SUMMARY_FIELDS}
+    # A full cached page plus the new entry still covers the new first page and its cursor.
+    items = [entry for entry in cached["items"] if entry["id"] != summary["id"]] + [summary]
+    items.sort(key=lambda entry: (str(entry.get("created_at") or ""), entry["id"]), reverse=True)
+    return _history_payload(items[:HISTORY_PAGE_SIZE + 1], HISTORY_PAGE_SIZE)
 
 
 @app.get("/api/history")
-def get_history():
-    db = _firestore_client()
-    items = _fetch_history_items(db)
-    return JSONResponse({"items": items})
+def get_history(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(HISTORY_PAGE_SIZE, ge=1, le=HISTORY_PAGE_MAX),
+):
+    if cursor or limit != HISTORY_PAGE_SIZE:
+        items = _history_store().page(limit + 1, _history_cursor(cursor))
+        return JSONResponse(_history_payload(items, limit))
+    cache = _history_cache()
+    cached = cache.get()
+    if cached is None:
+        generation = cache.generation
+        cached = cache.store(_history_first_page(), generation)
+    body, etag = cached
+    if etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    return _history_response(body, etag)
+
+
+@app.get("/api/history/search")
+def search_history(
+    q: str = "",
+    cursor: Optional[str] = None,
+    limit: int = Query(HISTORY_PAGE_SIZE, ge=1, le=HISTORY_PAGE_MAX),
+):
+    index = _history_index()
+    index.refresh(
+        _history_store().scan,
+        HISTORY_INDEX_REFRESH_SECONDS,
+        HISTORY_INDEX_LOOK_BACK_SECONDS,
+        _history_store().ids,
+        HISTORY_INDEX_RECONCILE_SECONDS,
+    )
+    items = index.search(q, limit + 1, _history_cursor(cursor))
+    return JSONResponse(_history_payload(items, limit))
+
+
+@app.get("/api/history/{item_id}")
+def get_history_item(item_id: str):
+    item = _history_store().get(item_id)
+    if item is None:
+        raise HTTPException(status_code=404, detail="History item not found.")
+    return JSONResponse(item)
 
 
 @app.post("/api/history")
 def add_history(payload: Dict[str, Any]):
-    db = _firestore_client()
     record = {
         "title": payload.get("title", ""),
         "meta": payload.get("meta", ""),
@@ -167,30 +506,40 @@ def add_history(payload: Dict[str, Any]):
         "form": payload.get("form", {}),
         "created_at": datetime.now(timezone.utc),
     }
-    db.collection(HISTORY_COLLECTION).add(record)
-    _trim_history(db)
-    items = _fetch_history_items(db)
-    return JSONResponse({"items": items})
+    item = _history_store().insert(record)
+    _history_index().add(item)
+    cache = _history_cache()
+    page = _history_first_page_with(item)
+    cache.invalidate()
+    generation = cache.generation
+    return _history_response(*cache.store(page, generation))
 
 
 @app.delete("/api/history")
 def clear_history():
-    db = _firestore_client()
-    docs = db.collection(HISTORY_COLLECTION).stream()
-    for doc in docs:
-        doc.reference.delete()
-    return JSONResponse({"items": []})
+    cache = _history_cache()
+    cache.invalidate()
+    deleted = _history_store().clear()
+    _history_index().clear()
+    cache.store({"items": [], "next_cursor": None})
+    return JSONResponse({"items": [], "next_cursor": None, "deleted": deleted})
 
 
 @app.delete("/api/history/{item_id}")
 def delete_history_item(item_id: str):
-    db = _firestore_client()
-    doc_ref = db.collection(HISTORY_COLLECTION).document(item_id)
-    if not doc_ref.get().exists:
+    if not _history_store().delete(item_id):
         raise HTTPException(status_code=404, detail="History item not found.")
-    doc_ref.delete()
-    items = _fetch_history_items(db)
-    return JSONResponse({"items": items})
+    _history_index().remove(item_id)
+    cache = _history_cache()
+    cache.invalidate()
+    generation = cache.generation
+    return _history_response(*cache.store(_history_first_page(), generation))
+
+
+def _error_detail(exc: Exception) -> str:
+    if isinstance(exc, HTTPException):
+        return str(exc.detail)
+    return str(exc)
 
 
 @app.post("/api/translate")
@@ -198,12 +547,46 @@ def translate(request: TranslationRequest):
     fields = request.fields or {}
     targets = request.targets or []
     keys = list(fields.keys())
-    values = [fields.get(key, "") for key in keys]
+    segments = {key: segment_field(key, fields.get(key, "")) for key in keys}
+    spans = [text for key in keys for text, translatable in segments[key] if translatable]
+    unique_spans = list(dict.fromkeys(spans))
+
+    translated, errors = translate_targets(
+        lambda target: _translate_cached(unique_spans, target),
+        targets,
+        _translate_pool(),
+    )
+    if errors and not translated:
+        exc = next(iter(errors.values()))
+        if isinstance(exc, HTTPException):
+            raise exc
+        raise HTTPException(status_code=502, detail=f"Translate API error: {exc}")
+
     result: Dict[str, Dict[str, str]] = {}
-    for target in targets:
-        translated_values = _translate_texts(values, target)
-        result[target] = dict(zip(keys, translated_values))
-    return JSONResponse({"translations": result})
+    chars_sent = 0
+    markup_sent = 0
+    for target, (translated_spans, sent, markup) in translated.items():
+        chars_sent += sent
+        markup_sent += markup
+        lookup = dict(zip(unique_spans, translated_spans))
+        result[target] = {
+            key: splice(segments[key], [lookup[text] for text, translatable in segments[key] if translatable])
+            for key in keys
+        }
+    target_count = len(set(targets))
+    chars_total = sum(len(fields.get(key, "")) for key in keys) * target_count
+    payload: Dict[str, Any] = {
+        "translations": result,
+        "stats": {
+            "chars_total": chars_total,
+            "chars_sent": chars_sent,
+            "chars_saved": chars_total - chars_sent,
+            "markup_sent": markup_sent,
+        },
+    }
+    if errors:
+        payload["errors"] = {target: _error_detail(exc) for target, exc in errors.items()}
+    return JSONResponse(payload)
 
 
 def _upload_to_gcs(storage_client: storage.Client, file_path: str, bucket_name: str) -> str:
@@ -213,37 +596,164 @@ def _upload_to_gcs(storage_client: storage.Client, file_path: str, bucket_name:
     return f"gs://{bucket_name}/{os.path.basename(file_path)}"
 
 
-def _call_ocr_api(file_path: str) -> str:
-    vision_client = _vision_client()
-    storage_client = _storage_client()
+def _ocr_image_content(content: bytes, progress: Optional[Callable[[str], None]] = None) -> str:
+    if progress:
+        progress("vision")
+    try:
+        image = vision.Image(content=content)
+        response = _vision_client().document_text_detection(image=image)
+        return _image_response_text(response)
+    except Exception as exc:
+        return f"[ERROR] Image OCR failed: {exc}"
+
+
+def _image_response_text(response: vision.AnnotateImageResponse) -> str:
+    if response.error.message:
+        return f"[ERROR] Vision API error: {response.error.message}"
+    if response.full_text_annotation.text:
+        return response.full_text_annotation.text
+    if response.text_annotations:
+        return response.text_annotations[0].description
+    return "[NO_RESULT]"
 
+
+def _ocr_image_batch(contents: List[bytes]) -> List[str]:
+    feature = vision.Feature(type=vision.Feature.Type.DOCUMENT_TEXT_DETECTION)
+    image_requests = [
+        vision.AnnotateImageRequest(image=vision.Image(content=content), features=[feature])
+        for content in contents
+    ]
+    try:
+        response = _vision_client().batch_annotate_images(requests=image_requests)
+    except Exception as exc:
+        return [f"[ERROR] Image OCR failed: {exc}"] * len(contents)
+    return [_image_response_text(item) for item in response.responses]
+
+
+def _locate_section_pages(pages: List[str]) -> Optional[Tuple[int, int, bool]]:
+    start_page = None
+    for index, page in enumerate(pages):
+        text = re.sub(r"\s+", " ", page)
+        if start_page is None:
+            match = re.search(SECTION_START_PATTERN, text, flags=re.IGNORECASE)
+            if not match:
+                continue
+            start_page = index
+            text = text[match.end():]
+        if re.search(SECTION_END_PATTERN, text, flags=re.IGNORECASE):
+            return start_page, index, True
+    if start_page is None:
+        return None
+    return start_page, len(pages) - 1, False
+
+
+def _pdf_slice(reader: PdfReader, page_numbers: List[int]) -> bytes:
+    """A sub-document holding only ``page_numbers`` (1-based), so Vision receives just those pages."""
+    writer = PdfWriter()
+    for number in page_numbers:
+        writer.add_page(reader.pages[number - 1])
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def _ocr_pdf_pages_inline(reader: PdfReader, page_numbers: List[int]) -> List[str]:
+    texts: List[str] = []
+    for start in range(0, len(page_numbers), OCR_INLINE_MAX_PAGES):
+        batch = page_numbers[start:start + OCR_INLINE_MAX_PAGES]
+        content = _pdf_slice(reader, batch)
+        if len(content) > OCR_INLINE_MAX_BYTES:
+            raise ValueError(f"Pages {batch[0]}-{batch[-1]} exceed the inline OCR size limit.")
+        request = vision.AnnotateFileRequest(
+            input_config=vision.InputConfig(content=content, mime_type="application/pdf"),
+            features=[vision.Feature(type=vision.Feature.Type.DOCUMENT_TEXT_DETECTION)],
+            pages=list(range(1, len(batch) + 1)),
+        )
+        response = _vision_client().batch_annotate_files(requests=[request])
+        file_response = response.responses[0]
+        if file_response.error.message:
+            raise RuntimeError(file_response.error.message)
+        for page_response in file_response.responses:
+            if page_response.error.message:
+                raise RuntimeError(page_response.error.message)
+            texts.append(page_response.full_text_annotation.text)
+    return texts
+
+
+def _ocr_pdf_section(file_path: str, text_layer_pages: List[str], report: Callable[[str], None]) -> Optional[str]:
+    """OCR only the labelling section, five pages per inline call.
+
+    Returns ``None`` (use the full path) when the section is not found or is longer than
+    ``OCR_SECTION_MAX_PAGES``.
+    """
+    page_count = len(text_layer_pages)
+    if not page_count:
+        return None
+    reader = PdfReader(file_path)
+
+    report("vision")
+    span = _locate_section_pages(text_layer_pages)
+    if span is not None:
+        start, end, _ = span
+        if end - start + 1 > OCR_SECTION_MAX_PAGES:
+            return None
+        texts = _ocr_pdf_pages_inline(reader, list(range(start + 1, end + 2)))
+        return "\n".join(texts).strip() or None
+
+    # No usable text layer: OCR a few pages at a time until the section is closed.
+    probed: List[str] = []
+    while len(probed) < page_count:
+        if len(probed) >= OCR_SECTION_PROBE_PAGES and _locate_section_pages(probed) is None:
+            return None
+        first = len(probed) + 1
+        batch = list(range(first, min(first + OCR_INLINE_MAX_PAGES, page_count + 1)))
+        probed.extend(_ocr_pdf_pages_inline(reader, batch))
+        span = _locate_section_pages(probed)
+        if span is None:
+            continue
+        start, end, closed = span
+        if end - start + 1 > OCR_SECTION_MAX_PAGES:
+            return None
+        if closed or len(probed) >= page_count:
+            return "\n".join(probed[start:end + 1]).strip() or None
+    return None
+
+
+def _call_ocr_api(file_path: str, progress: Optional[Callable[[str], None]] = None, mode: str = "full") -> str:
+    report = progress or (lambda stage: None)
     _, ext = os.path.splitext(file_path)
     ext = ext.lower()
 
     if ext == ".pdf":
-        extracted = _extract_pdf_text(file_path)
+        report("text_layer")
+        pages = _extract_pdf_pages(file_path)
+        extracted = "\n".join(pages).strip()
         if len(extracted) >= 500:
             return extracted
-
-    if ext in [".jpg", ".jpeg", ".png", ".bmp", ".gif", ".webp", ".tif", ".tiff"]:
+        if mode == "section":
+            try:
+                section_text = _ocr_pdf_section(file_path, pages, report)
+            except Exception:
+                logger.warning("Section OCR failed for %s; using the full path.", file_path, exc_info=True)
+                section_text = None
+            if section_text:
+                return section_text
+
+    if ext in IMAGE_EXTENSIONS:
         try:
             with open(file_path, "rb") as f:
                 content = f.read()
-            image = vision.Image(content=content)
-            response = vision_client.document_text_detection(image=image)
-            if response.error.message:
-                return f"[ERROR] Vision API error: {response.error.message}"
-            if response.full_text_annotation.text:
-                return response.full_text_annotation.text
-            if response.text_annotations:
-                return response.text_annotations[0].description
-            return "[NO_RESULT]"
         except Exception as exc:
             return f"[ERROR] Image OCR failed: {exc}"
+        return _ocr_image_content(content, progress)
 
     if not GCS_BUCKET_NAME:
         return "[ERROR] Missing GCS bucket name."
 
+    vision_client = _vision_client()
+    storage_client = _storage_client()
+
+    report("gcs")
     try:
         gcs_uri = _upload_to_gcs(storage_client, file_path, GCS_BUCKET_NAME)
     except Exception as exc:
@@ -271,6 +781,7 @@ def _call_ocr_api(file_path: str) -> str:
         output_config=output_config,
     )
 
+    report("vision")
     try:
         operation = vision_client.async_batch_annotate_files(requests=[request])
         operation.result(timeout=600)
@@ -305,15 +816,15 @@ def _call_ocr_api(file_path: str) -> str:
     return full_text.strip() if full_text.strip() else "[NO_RESULT]"
 
 
-def _extract_pdf_text(file_path: str) -> str:
+def _extract_pdf_pages(file_path: str) -> List[str]:
     try:
-        reader = PdfReader(file_path)
-        parts = []
-        for page in reader.pages:
-            parts.append(page.extract_text() or "")
-        return "\n".join(parts).strip()
+        return _pdf_text().extract_pages(file_path)
     except Exception:
-        return ""
+        return []
+
+
+def _extract_pdf_text(file_path: str) -> str:
+    return "\n".join(_extract_pdf_pages(file_path)).strip()
 
 
 def _clean_field_text(text: str) -> str:
@@ -341,7 +852,7 @@ def parse_ocr_text(ocr_text: str) -> Dict[str, Any]:
 
     cleaned = re.sub(r"[\r\n]+", " ", ocr_text)
     m_section = re.search(
-        r"Labelled warnings and instructions of use(.*?)(Reasoning|Assessor|Annex|\Z)",
+        SECTION_START_PATTERN + r"(.*?)(" + SECTION_END_PATTERN + r"|\Z)",
         cleaned,
         flags=re.IGNORECASE | re.DOTALL,
     )
@@ -425,24 +936,43 @@ def build_label_text(form: LabelForm) -> str:
     return "\n".join(lines)
 
 
-def _draw_multiline_text(pdf: canvas.Canvas, text: str, x: float, y: float, max_width: float, leading: float = 14) -> float:
-    for raw_line in text.split("\n"):
-        line = raw_line
-        while line:
-            if pdf.stringWidth(line) <= max_width:
-                pdf.drawString(x, y, line)
-                y -= leading
-                break
-            cut = len(line)
-            while cut > 0 and pdf.stringWidth(line[:cut]) > max_width:
-                cut -= 1
-            pdf.drawString(x, y, line[:cut])
-            y -= leading
-            line = line[cut:].lstrip()
+def _draw_multiline_text(
+    pdf: canvas.Canvas,
+    text: str,
+    x: float,
+    y: float,
+    max_width: float,
+    leading: float = 14,
+    font_size: float = 11,
+    bold: bool = False,
+) -> float:
+    def measure(char: str) -> float:
+        return stringWidth(char, font_for_char(char, bold), font_size)
+
+    # Widths depend on the per-character font choice, cached under a name of their own.
+    wrap_key = "label-runs-bold" if bold else "label-runs"
+    for line in wrap_text(text, wrap_key, font_size, max_width, measure):
+        # Blank lines have never advanced the cursor; keep the established layout.
+        if not line:
+            continue
+        _draw_runs(pdf, x, y, line, font_size, bold)
+        y -= leading
     return y
 
 
+def _draw_runs(pdf: canvas.Canvas, x: float, y: float, line: str, font_size: float, bold: bool = False) -> None:
+    text = pdf.beginText(x, y)
+    for font_name, run in font_runs(line, bold):
+        text.setFont(font_name, font_size)
+        text.textOut(run)
+    pdf.drawText(text)
+
+
 def generate_pdf(form: LabelForm) -> bytes:
+    return _render_label_pdf(build_label_text(form))
+
+
+def _render_label_pdf(label_text: str) -> bytes:
     buffer = io.BytesIO()
     pdf = canvas.Canvas(buffer, pagesize=A4)
     width, height = A4
@@ -453,75 +983,347 @@ def generate_pdf(form: LabelForm) -> bytes:
     pdf.drawString(margin, y, "CPSR Label Example")
     y -= 18
 
-    pdf.setFont("Helvetica", 11)
-    label_text = build_label_text(form)
     y = _draw_multiline_text(pdf, label_text, margin, y, width - 2 * margin, leading=14)
 
     if y < margin:
         pdf.showPage()
 
     pdf.save()
-    buffer.seek(0)
-    return buffer.read()
+    return buffer.getvalue()
 
 
-@app.post("/api/ocr")
-async def ocr(file: UploadFile = File(...)):
+def generate_pdf_multi(request: PdfMultiRequest) -> bytes:
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
+    margin = 18 * mm
+    y = height - margin
+
+    for section in request.sections:
+        _draw_runs(pdf, margin, y, section.title, 13, bold=True)
+        y -= 18
+        y = _draw_multiline_text(pdf, section.text, margin, y, width - 2 * margin, leading=14)
+        y -= 16
+        if y < margin + 60:
+            pdf.showPage()
+            y = height - margin
+
+    pdf.save()
+    return buffer.getvalue()
+
+
+def _upload_extension(file: UploadFile) -> str:
     if not file.filename:
         raise HTTPException(status_code=400, detail="Missing filename.")
-
     ext = os.path.splitext(file.filename)[1].lower()
-    allowed = {".pdf", ".jpg", ".jpeg", ".png", ".tif", ".tiff", ".bmp", ".webp"}
-    if ext not in allowed:
+    if ext not in ALLOWED_UPLOAD_EXTENSIONS:
         raise HTTPException(status_code=400, detail="Unsupported file type.")
+    return ext
+
+
+async def _spool(file: UploadFile) -> SpooledUpload:
+    ext = _upload_extension(file)
+    try:
+        return await spool_upload(
+            file,
+            ext,
+            UPLOAD_TMP_DIR,
+            UPLOAD_MAX_BYTES,
+            in_memory=ext in IMAGE_EXTENSIONS,
+        )
+    except UploadTooLarge as exc:
+        raise HTTPException(status_code=413, detail=str(exc))
+
+
+def _ocr_mode(mode: Optional[str]) -> str:
+    mode = (mode or OCR_DEFAULT_MODE).lower()
+    if mode not in OCR_MODES:
+        raise HTTPException(status_code=400, detail=f"Unsupported OCR mode: {mode}")
+    return mode
+
+
+def _ocr_cache_key(upload: SpooledUpload, mode: str) -> str:
+    if upload.ext == ".pdf" and mode != "full":
+        return f"{upload.digest}-{mode}"
+    return upload.digest
+
+
+def _ocr_spooled(upload: SpooledUpload, progress: Optional[Callable[[str], None]] = None, mode: str = "full") -> Tuple[str, bool]:
+    cache = _ocr_cache()
+    cache_key = _ocr_cache_key(upload, mode)
+    ocr_text = cache.get(cache_key)
+    if ocr_text is not None:
+        return ocr_text, True
+    if upload.content is not None:
+        ocr_text = _ocr_image_content(upload.content, progress)
+    else:
+        ocr_text = _call_ocr_api(upload.path, progress, mode)
+    cache.put(cache_key, ocr_text)
+    return ocr_text, False
+
+
+def _ocr_image_group(uploads: List[SpooledUpload]) -> List[Tuple[str, bool]]:
+    cache = _ocr_cache()
+    results: List[Optional[Tuple[str, bool]]] = []
+    pending: List[int] = []
+    for index, upload in enumerate(uploads):
+        ocr_text = cache.get(upload.digest)
+        results.append((ocr_text, True) if ocr_text is not None else None)
+        if ocr_text is None:
+            pending.append(index)
+    if pending:
+        texts = _ocr_image_batch([uploads[index].content for index in pending])
+        for index, ocr_text in zip(pending, texts):
+            cache.put(uploads[index].digest, ocr_text)
+            results[index] = (ocr_text, False)
+    return results
 
-    temp_dir = os.path.join(BASE_DIR, "tmp")
-    os.makedirs(temp_dir, exist_ok=True)
-    temp_path = os.path.join(temp_dir, f"upload_{int(time.time())}{ext}")
 
+def _ocr_and_cleanup(upload: SpooledUpload, mode: str) -> Tuple[str, bool]:
     try:
-        contents = await file.read()
-        with open(temp_path, "wb") as f:
-            f.write(contents)
-        ocr_text = _call_ocr_api(temp_path)
+        return _ocr_spooled(upload, mode=mode)
     finally:
-        try:
-            os.remove(temp_path)
-        except Exception:
-            pass
+        upload.cleanup()
+
+
+def _run_ocr_job(report: Callable[[str], None], upload: SpooledUpload, mode: str) -> Dict[str, Any]:
+    try:
+        ocr_text, cached = _ocr_spooled(upload, report, mode)
+    finally:
+        upload.cleanup()
+    report("parse")
+    parsed = parse_ocr_text(ocr_text)
+    return {"raw_text": ocr_text, "parsed": parsed, "cached": cached}
+
+
+@app.post("/api/ocr")
+async def ocr(file: UploadFile = File(...), mode: Optional[str] = Query(default=None)):
+    mode = _ocr_mode(mode)
+    upload = await _spool(file)
+    try:
+        ocr_text, cached = await _run_blocking("ocr", _ocr_and_cleanup, upload, mode)
+    except HTTPException:
+        upload.cleanup()
+        raise
+    cache_status = "HIT" if cached else "MISS"
 
     parsed = parse_ocr_text(ocr_text)
-    return JSONResponse({"raw_text": ocr_text, "parsed": parsed})
+    return JSONResponse(
+        {"raw_text": ocr_text, "parsed": parsed},
+        headers={"X-OCR-Cache": cache_status},
+    )
+
+
+@app.post("/api/ocr/jobs")
+async def submit_ocr_job(file: UploadFile = File(...), mode: Optional[str] = Query(default=None)):
+    mode = _ocr_mode(mode)
+    upload = await _spool(file)
+    try:
+        job = _ocr_jobs().submit(
+            lambda report: _run_ocr_job(report, upload, mode),
+            first_stage="upload",
+            on_cancel=upload.cleanup,
+        )
+    except JobQueueFull as exc:
+        upload.cleanup()
+        raise HTTPException(status_code=429, detail=str(exc), headers={"Retry-After": "10"})
+    return JSONResponse(job.to_dict(), status_code=202)
+
+
+def _batch_result(index: int, filename: str, ocr_text: str, cached: bool) -> Dict[str, Any]:
+    return {
+        "index": index,
+        "filename": filename,
+        "raw_text": ocr_text,
+        "parsed": parse_ocr_text(ocr_text),
+        "cached": cached,
+    }
+
+
+def _batch_error(index: int, filename: str, error: str) -> Dict[str, Any]:
+    return {"index": index, "filename": filename, "error": error}
+
+
+async def _ocr_batch_images(group: List[Tuple[int, SpooledUpload]]) -> List[Dict[str, Any]]:
+    try:
+        results = await _run_blocking("ocr", _ocr_image_group, [upload for _, upload in group])
+    except HTTPException as exc:
+        return [_batch_error(index, upload.filename, str(exc.detail)) for index, upload in group]
+    except Exception as exc:
+        return [_batch_error(index, upload.filename, str(exc)) for index, upload in group]
+    return [
+        _batch_result(index, upload.filename, ocr_text, cached)
+        for (index, upload), (ocr_text, cached) in zip(group, results)
+    ]
+
+
+async def _ocr_batch_pdf(index: int, upload: SpooledUpload, mode: str, limit: asyncio.Semaphore) -> List[Dict[str, Any]]:
+    async with limit:
+        try:
+            ocr_text, cached = await _finish_blocking(_submit_blocking("ocr", _ocr_spooled, upload, mode))
+        except HTTPException as exc:
+            return [_batch_error(index, upload.filename, str(exc.detail))]
+        except Exception as exc:
+            return [_batch_error(index, upload.filename, str(exc))]
+        finally:
+            upload.cleanup()
+    return [_batch_result(index, upload.filename, ocr_text, cached)]
+
+
+def _image_groups(images: List[Tuple[int, SpooledUpload]]) -> List[List[Tuple[int, SpooledUpload]]]:
+    """Split images into Vision batch requests bounded by count and total bytes."""
+    groups: List[List[Tuple[int, SpooledUpload]]] = []
+    group: List[Tuple[int, SpooledUpload]] = []
+    group_bytes = 0
+    for index, upload in images:
+        if group and (len(group) >= OCR_BATCH_IMAGE_GROUP or group_bytes + upload.size > OCR_BATCH_IMAGE_GROUP_BYTES):
+            groups.append(group)
+            group, group_bytes = [], 0
+        group.append((index, upload))
+        group_bytes += upload.size
+    if group:
+        groups.append(group)
+    return groups
+
+
+async def _ocr_batch_results(
+    uploads: List[Tuple[int, SpooledUpload]],
+    errors: List[Dict[str, Any]],
+    mode: str,
+    tasks: List[asyncio.Future],
+) -> Any:
+    for error in errors:
+        yield json.dumps(error, ensure_ascii=False) + "\n"
+
+    images = [(index, upload) for index, upload in uploads if upload.content is not None]
+    files = [(index, upload) for index, upload in uploads if upload.content is None]
+    limit = asyncio.Semaphore(OCR_BATCH_PDF_CONCURRENCY)
+    tasks += [asyncio.ensure_future(_ocr_batch_images(group)) for group in _image_groups(images)]
+    tasks += [asyncio.ensure_future(_ocr_batch_pdf(index, upload, mode, limit)) for index, upload in files]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            for result in await finished:
+                yield json.dumps(result, ensure_ascii=False) + "\n"
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _finish_ocr_batch(uploads: List[Tuple[int, SpooledUpload]], tasks: List[asyncio.Future]) -> None:
+    """Runs after the batch response, even if the client left or streaming never began."""
+    for task in tasks:
+        task.cancel()
+    # Cancelled PDF tasks return only once their worker thread is done with the upload.
+    await asyncio.gather(*tasks, return_exceptions=True)
+    for _, upload in uploads:
+        upload.cleanup()
+
+
+@app.post("/api/ocr/batch")
+async def ocr_batch(files: List[UploadFile] = File(...), mode: Optional[str] = Query(default=None)):
+    mode = _ocr_mode(mode)
+    if len(files) > OCR_BATCH_MAX_FILES:
+        raise HTTPException(status_code=400, detail=f"At most {OCR_BATCH_MAX_FILES} files per batch.")
+
+    uploads: List[Tuple[int, SpooledUpload]] = []
+    errors: List[Dict[str, Any]] = []
+    for index, file in enumerate(files):
+        try:
+            uploads.append((index, await _spool(file)))
+        except HTTPException as exc:
+            errors.append(_batch_error(index, file.filename or "", str(exc.detail)))
+
+    tasks: List[asyncio.Future] = []
+    return StreamingResponse(
+        _ocr_batch_results(uploads, errors, mode, tasks),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(_finish_ocr_batch, uploads, tasks),
+    )
+
+
+def _get_ocr_job(job_id: str):
+    job = _ocr_jobs().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="OCR job not found.")
+    return job
+
+
+@app.get("/api/ocr/jobs/{job_id}")
+def get_ocr_job(job_id: str):
+    return JSONResponse(_get_ocr_job(job_id).to_dict())
+
+
+@app.get("/api/ocr/jobs/{job_id}/result")
+def get_ocr_job_result(job_id: str):
+    job = _get_ocr_job(job_id)
+    if not job.finished:
+        return JSONResponse(job.to_dict(), status_code=202)
+    if job.status != "done" or job.result is None:
+        raise HTTPException(status_code=500, detail=job.error or f"OCR job {job.status}.")
+    result = job.result
+    return JSONResponse(
+        {"raw_text": result["raw_text"], "parsed": result["parsed"]},
+        headers={"X-OCR-Cache": "HIT" if result["cached"] else "MISS"},
+    )
+
+
+async def _ocr_job_events(job) -> Any:
+    index = 0
+    idle = 0.0
+    while True:
+        events, finished = job.events_since(index)
+        index += len(events)
+        for event in events:
+            yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        if finished and not events:
+            break
+        if events:
+            idle = 0.0
+        elif idle >= 15:
+            idle = 0.0
+            yield ": keep-alive\n\n"
+        await asyncio.sleep(0.5)
+        idle += 0.5
+
+
+@app.get("/api/ocr/jobs/{job_id}/events")
+async def stream_ocr_job_events(job_id: str):
+    job = _get_ocr_job(job_id)
+    return StreamingResponse(
+        _ocr_job_events(job),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _cached_pdf(http_request: Request, key: str, render: Callable[..., bytes], *args: Any) -> Response:
+    etag = pdf_etag(key)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(http_request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+    cache = _pdf_cache()
+    pdf_bytes = cache.get(key)
+    if pdf_bytes is None:
+        pdf_bytes = await _run_blocking("render", render, *args)
+        cache.put(key, pdf_bytes)
+    # Sent as one body with Content-Length; the rendered bytes are never copied again.
+    return Response(pdf_bytes, media_type="application/pdf", headers=headers)
 
 
 @app.post("/api/pdf")
-async def create_pdf(form: LabelForm):
-    pdf_bytes = generate_pdf(form)
-    return StreamingResponse(io.BytesIO(pdf_bytes), media_type="application/pdf")
+async def create_pdf(form: LabelForm, http_request: Request):
+    # The PDF depends only on the composed label text, so blank fields and their defaults share a key.
+    label_text = build_label_text(form)
+    return await _cached_pdf(http_request, pdf_key("label", label_text), _render_label_pdf, label_text)
 
 
 @app.post("/api/pdf-multi")
-async def create_pdf_multi(request: PdfMultiRequest):
-    buffer = io.BytesIO()
-    pdf = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
-    margin = 18 * mm
-    y = height - margin
+async def create_pdf_multi(request: PdfMultiRequest, http_request: Request):
+    sections = [[section.title, section.text] for section in request.sections]
+    return await _cached_pdf(http_request, pdf_key("multi", sections), generate_pdf_multi, request)
 
-    pdf.setFont("Helvetica-Bold", 13)
-    for section in request.sections:
-        pdf.drawString(margin, y, section.title)
-        y -= 18
-        pdf.setFont("Helvetica", 11)
-        y = _draw_multiline_text(pdf, section.text, margin, y, width - 2 * margin, leading=14)
-        y -= 16
-        if y < margin + 60:
-            pdf.showPage()
-            y = height - margin
-            pdf.setFont("Helvetica-Bold", 13)
-        else:
-            pdf.setFont("Helvetica-Bold", 13)
 
-    pdf.save()
-    buffer.seek(0)
-    return StreamingResponse(io.BytesIO(buffer.read()), media_type="application/pdf")
+@app.post("/api/label-image")
+async def create_label_image(form: LabelForm, image_format: str = Query("png", alias="format", pattern="^(png|webp)$")):
+    image_bytes = await _run_blocking("render", _label_renderer().render_bytes, form.model_dump(), image_format)
+    return Response(image_bytes, media_type=IMAGE_FORMATS[image_format])
@@ -0,0 +1,69 @@
+"""Build the history search index over synthetic CPSR entries and time queries.
+
+    python -m web.backend.benchmarks.bench_history_search --entries 100000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from web.backend.search_index import HistorySearchIndex
+
+INCI = [
+    "Aqua", "Glycerin", "Butylene Glycol", "Niacinamide", "Panthenol", "Sodium Hyaluronate", "Allantoin",
+    "Centella Asiatica Extract", "Madecassoside", "Tocopherol", "Phenoxyethanol", "Ethylhexylglycerin",
+    "Dimethicone", "Cetearyl Alcohol", "Squalane", "Adenosine", "Carbomer", "Tromethamine", "Xanthan Gum",
+    "Camellia Sinensis Leaf Extract", "Hydrolyzed Collagen", "Ceramide NP", "Citric Acid", "Disodium EDTA",
+]
+PRODUCTS = ["Toner", "Serum", "Cream", "Cleansing Foam", "Sun Cream", "Ampoule", "Mask", "Lotion", "Essence", "Mist"]
+BRANDS = ["SELF BEAUTY", "UNICONIC", "GREEN LEAF", "AQUA LAB", "PURE SKIN", "DAILY DEW", "MOON", "HANBIT"]
+WARNINGS = (
+    "Labelled warnings and instructions of use. For external use only. Avoid contact with eyes. "
+    "Keep out of reach of children. Stop use if irritation occurs. Store in a cool, dry place."
+)
+
+
+def make_entries(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    started_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for index in range(count):
+        product = f"{rng.choice(BRANDS)} {rng.choice(PRODUCTS)} {index}"
+        inci = ", ".join(rng.sample(INCI, rng.randint(8, 16)))
+        yield {
+            "id": f"h{index:08d}",
+            "title": product,
+            "meta": "CPSR",
+            "created_at": (started_at + timedelta(minutes=index)).isoformat(),
+            "raw_text": f"{product}\n{WARNINGS}\nLOT {rng.randint(100000, 999999)}\nIngredients: {inci}",
+            "form": {"product_name": product, "inci_ingredients": inci},
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    index = HistorySearchIndex()
+    started = time.perf_counter()
+    index.refresh(lambda since: make_entries(args.entries), max_age=3600)
+    print(f"built {args.entries} entries in {time.perf_counter() - started:.1f} s: {index.stats()}")
+
+    queries = ["niacinamide", "sodium hyaluronate", "uniconic serum", "ceramide np cream", "hanbit ess", "madeca",
+               str(args.entries - 1), "nonexistent"]
+    for query in queries:
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            results = index.search(query, 21)
+        elapsed = (time.perf_counter() - started) / args.repeat * 1000
+        cursor = (results[-1]["created_at"], results[-1]["id"]) if results else None
+        started = time.perf_counter()
+        if cursor:
+            index.search(query, 21, cursor)
+        next_page = (time.perf_counter() - started) * 1000
+        print(f"{query!r:26} {elapsed:7.3f} ms  hits={len(results):2d}  next page {next_page:7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
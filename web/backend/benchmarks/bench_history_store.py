@@ -0,0 +1,79 @@
+"""Compare the Firestore and SQLite history stores on list, insert and clear.
+
+Firestore runs against the in-memory fake with ``--latency`` per round trip (set it to 0
+to measure only client-side overhead); SQLite uses a temporary WAL database:
+
+    python -m web.backend.benchmarks.bench_history_store --latency 0.02 --ops 50 --clear-size 2000
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from web.backend import app as backend
+from web.backend.benchmarks.fake_firestore import FakeFirestore
+from web.backend.history_store import FirestoreHistoryStore, HistoryStore, SqliteHistoryStore
+
+STARTED_AT = datetime.now(timezone.utc)
+
+
+def record(index: int):
+    return {
+        "title": f"PRODUCT {index}",
+        "meta": "OCR",
+        "raw_text": "Labelled warnings and instructions of use\n" + "Keep out of reach of children. " * 40,
+        "form": {"product_name": f"PRODUCT {index}", "inci_ingredients": "Aqua, Glycerin, Niacinamide, Panthenol"},
+        "created_at": STARTED_AT + timedelta(microseconds=index),
+    }
+
+
+def timed(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for index in range(repeat):
+        fn(index)
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def bench(store: HistoryStore, ops: int, clear_size: int, fill) -> None:
+    insert_ms = timed(lambda index: store.insert(record(index)), ops)
+    list_ms = timed(lambda index: store.page(backend.HISTORY_PAGE_SIZE + 1), ops)
+    fill(clear_size)
+    started = time.perf_counter()
+    deleted = store.clear()
+    clear_ms = (time.perf_counter() - started) * 1000
+    print(f"  first page {list_ms:8.2f} ms  insert {insert_ms:8.2f} ms  clear({deleted}) {clear_ms:9.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--ops", type=int, default=50)
+    parser.add_argument("--clear-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    db = FakeFirestore(args.latency)
+    firestore_store = FirestoreHistoryStore(lambda: db, backend.HISTORY_COLLECTION)
+
+    def fill_firestore(count: int) -> None:
+        docs = db.collection(backend.HISTORY_COLLECTION).docs
+        for index in range(count):
+            docs[f"bulk{index:08d}"] = record(index)
+
+    print(f"firestore (fake, {args.latency * 1000:.0f} ms/round trip)")
+    bench(firestore_store, args.ops, args.clear_size, fill_firestore)
+
+    with tempfile.TemporaryDirectory() as directory:
+        sqlite_store = SqliteHistoryStore(os.path.join(directory, "history.sqlite3"))
+
+        def fill_sqlite(count: int) -> None:
+            for index in range(count):
+                sqlite_store.insert(record(index))
+
+        print("sqlite (WAL)")
+        bench(sqlite_store, args.ops, args.clear_size, fill_sqlite)
+        sqlite_store.close()
+
+
+if __name__ == "__main__":
+    main()
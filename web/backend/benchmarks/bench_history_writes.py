@@ -0,0 +1,86 @@
+"""Compare the old add/trim/re-read history write with the current insert and first-page read,
+and with ``POST /api/history``, which extends the cached first page instead of re-reading it.
+
+Runs against an in-memory Firestore fake that charges ``--latency`` per round trip:
+
+    python -m web.backend.benchmarks.bench_history_writes --latency 0.03 --inserts 30
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+from google.cloud import firestore
+
+from web.backend import app as backend
+from web.backend.benchmarks.fake_firestore import FakeFirestore
+from web.backend.history_cache import HistoryCache
+from web.backend.history_store import FirestoreHistoryStore
+from web.backend.search_index import HistorySearchIndex
+
+LEGACY_LIMIT = 10
+
+
+def legacy_insert(db, record):
+    db.collection(backend.HISTORY_COLLECTION).add(record)
+    docs = (
+        db.collection(backend.HISTORY_COLLECTION)
+        .order_by("created_at", direction=firestore.Query.DESCENDING)
+        .offset(LEGACY_LIMIT)
+        .stream()
+    )
+    for doc in docs:
+        doc.reference.delete()
+    return FirestoreHistoryStore(lambda: db, backend.HISTORY_COLLECTION).page(LEGACY_LIMIT)
+
+
+def current_insert(db, record):
+    store = FirestoreHistoryStore(lambda: db, backend.HISTORY_COLLECTION)
+    store.insert(record)
+    return store.page(LEGACY_LIMIT)
+
+
+def endpoint_insert(db, record):
+    state = backend.app.state
+    if getattr(state, "bench_db", None) is not db:
+        state.bench_db = db
+        state.history_store = FirestoreHistoryStore(lambda: db, backend.HISTORY_COLLECTION)
+        state.history_cache = HistoryCache(ttl=3600)
+        state.history_index = HistorySearchIndex()
+    response = backend.add_history(dict(record))
+    return json.loads(response.body)["items"]
+
+
+def run(insert, latency: float, inserts: int):
+    db = FakeFirestore(latency)
+    started_at = datetime.now(timezone.utc)
+    timings = []
+    for index in range(inserts):
+        record = {"title": f"Item {index}", "meta": "", "raw_text": "", "form": {},
+                  "created_at": started_at + timedelta(seconds=index)}
+        started = time.perf_counter()
+        items = insert(db, record)
+        timings.append(time.perf_counter() - started)
+    assert len(items) == min(inserts, LEGACY_LIMIT)
+    return timings, db.round_trips
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.03)
+    parser.add_argument("--inserts", type=int, default=30)
+    args = parser.parse_args()
+
+    print(f"inserts={args.inserts} page={LEGACY_LIMIT} latency={args.latency * 1000:.0f}ms/round trip")
+    for name, insert in (("legacy", legacy_insert), ("current", current_insert), ("endpoint", endpoint_insert)):
+        timings, round_trips = run(insert, args.latency, args.inserts)
+        timings.sort()
+        print(
+            f"{name:8} mean {sum(timings) / len(timings) * 1000:7.1f} ms  "
+            f"p95 {timings[int(len(timings) * 0.95) - 1] * 1000:7.1f} ms  "
+            f"round trips/insert {round_trips / args.inserts:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Time the desktop label renderer against the web backend's prepared-template renderer.
+
+The old path reloads fonts and re-reads and LANCZOS-resizes the logo on every label:
+
+    python -m web.backend.benchmarks.bench_label_image --repeat 20
+"""
+import argparse
+import io
+import time
+
+from PIL import Image, ImageDraw
+
+from web.backend import app as backend
+from web.backend.label_image import LABEL_BLOCKS, FOOTER_NOTE, LabelImageRenderer, _load_font
+
+FORM = {
+    "product_name": "SELF BEAUTY UNICONIC SHIELD FIXER",
+    "function_claim": "Setting spray that keeps make-up in place and refreshes the skin.",
+    "usage_instructions": "Shake well and spray evenly onto the face from a distance of 20-30 cm after make-up.",
+    "warnings_precautions": (
+        "For external use only. Avoid contact with eyes. Keep out of reach of children. "
+        "Stop use and consult a dermatologist if redness, swelling or irritation occurs."
+    ),
+    "inci_ingredients": (
+        "Aqua, Alcohol Denat., Glycerin, Butylene Glycol, Niacinamide, 1,2-Hexanediol, Sodium Hyaluronate, "
+        "Panthenol, Allantoin, Centella Asiatica Extract, Madecassoside, Tocopherol, Camellia Sinensis Leaf "
+        "Extract, Hydrolyzed Collagen, Ceramide NP, PEG-60 Hydrogenated Castor Oil, Disodium EDTA, Phenoxyethanol"
+    ),
+    "distributor": "",
+    "eu_responsible_person": backend.DEFAULT_EU_RP,
+    "country_of_origin": "Made in Korea",
+    "batch_lot": "",
+    "expiry_date": "",
+    "net_content": "100 ml",
+}
+
+
+def legacy_render(fields, width=1000, height=1800, margin=40):
+    image = Image.new("RGB", (width, height), color="white")
+    draw = ImageDraw.Draw(image)
+    font_title, _ = _load_font(36, bold=True)
+    font_bold, _ = _load_font(24, bold=True)
+    font_reg, _ = _load_font(22)
+    y = margin
+    logo = Image.open(backend.LABEL_LOGO_PATH)
+    logo_h = int(logo.height * width / logo.width)
+    logo = logo.resize((width, logo_h), Image.LANCZOS)
+    image.paste(logo, (0, y))
+    y += logo_h + 30
+    for number, heading, field, fallback, comment in LABEL_BLOCKS:
+        draw.text((margin, y), f"{number}. {heading}", font=font_bold, fill="black")
+        y += 28
+        words = (fields.get(field) or fallback or backend.DEFAULT_EU_RP).split()
+        current = ""
+        lines = []
+        for word in words:
+            test = current + (" " if current else "") + word
+            if font_reg.getbbox(test)[2] <= width - 2 * margin:
+                current = test
+            else:
+                if current:
+                    lines.append(current)
+                current = word
+        if current:
+            lines.append(current)
+        for line in lines:
+            draw.text((margin, y), line, font=font_reg, fill="black")
+            y += 28
+        if comment:
+            draw.text((margin + 20, y), comment, font=font_reg, fill="black")
+            y += 28
+        y += 12
+    y = height - 120
+    draw.line((margin, y, width - margin, y), fill="black", width=1)
+    y += 10
+    for line in backend.DEFAULT_EU_RP.split("\n"):
+        draw.text((margin, y), line, font=font_reg, fill="black")
+        y += 28
+    draw.text((margin, y + 6), FOOTER_NOTE, font=font_reg, fill="black")
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def timed(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    renderer = LabelImageRenderer(backend.LABEL_LOGO_PATH, backend.DEFAULT_EU_RP)
+    print(f"renderer setup {(time.perf_counter() - started) * 1000:7.1f} ms  logo={renderer.has_logo}")
+
+    legacy_ms = timed(lambda: legacy_render(FORM), args.repeat)
+    draw_ms = timed(lambda: renderer.render(FORM), args.repeat)
+    png_ms = timed(lambda: renderer.render_bytes(FORM, "png"), args.repeat)
+    webp_ms = timed(lambda: renderer.render_bytes(FORM, "webp"), args.repeat)
+    sizes = {fmt: len(renderer.render_bytes(FORM, fmt)) // 1024 for fmt in ("png", "webp")}
+    print(f"legacy png {legacy_ms:7.1f} ms")
+    print(f"draw only  {draw_ms:7.1f} ms")
+    print(f"png        {png_ms:7.1f} ms  {sizes['png']} KB   (target < 50 ms)")
+    print(f"webp       {webp_ms:7.1f} ms  {sizes['webp']} KB")
+
+
+if __name__ == "__main__":
+    main()
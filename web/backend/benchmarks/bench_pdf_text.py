@@ -0,0 +1,76 @@
+"""Compare serial and parallel PDF text-layer extraction.
+
+    python -m web.backend.benchmarks.bench_pdf_text --pages 200 --workers 4
+    python -m web.backend.benchmarks.bench_pdf_text --pages 20 40 80 160 --workers 4
+
+Use the second form to find where parallel extraction starts to pay off on the target
+machine and set ``PDF_TEXT_PARALLEL_MIN_PAGES`` there.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from web.backend.pdf_text import PdfTextExtractor
+
+PARAGRAPH = (
+    "Labelled warnings and instructions of use. Keep out of reach of children. "
+    "Avoid contact with eyes. Ingredients: Aqua, Glycerin, Butylene Glycol, "
+    "Niacinamide, Panthenol, Sodium Hyaluronate, Allantoin, Adenosine."
+)
+
+
+def build_pdf(path: str, pages: int) -> None:
+    pdf = canvas.Canvas(path, pagesize=A4)
+    width, height = A4
+    for page in range(pages):
+        pdf.setFont("Helvetica", 9)
+        y = height - 40
+        while y > 40:
+            pdf.drawString(30, y, f"p{page + 1} {PARAGRAPH}"[:150])
+            y -= 11
+        pdf.showPage()
+    pdf.save()
+
+
+def timed(extractor: PdfTextExtractor, path: str, rounds: int):
+    best = float("inf")
+    text = ""
+    for _ in range(rounds):
+        started = time.perf_counter()
+        text = extractor.extract_text(path)
+        best = min(best, time.perf_counter() - started)
+    return best, text
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, nargs="+", default=[120], help="One or more page counts to compare.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    serial = PdfTextExtractor(workers=1)
+    parallel = PdfTextExtractor(workers=args.workers, min_pages=1)
+    print(f"workers={args.workers}")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for pages in args.pages:
+                path = os.path.join(tmp, f"synthetic-{pages}.pdf")
+                build_pdf(path, pages)
+                parallel.extract_text(path)  # warm the process pool
+                serial_time, serial_text = timed(serial, path, args.rounds)
+                parallel_time, parallel_text = timed(parallel, path, args.rounds)
+                assert serial_text == parallel_text, "parallel extraction changed page order or content"
+                print(
+                    f"pages={pages:<5} serial {serial_time * 1000:8.1f} ms  "
+                    f"parallel {parallel_time * 1000:8.1f} ms  ({serial_time / parallel_time:.2f}x)"
+                )
+    finally:
+        parallel.shutdown()
+
+if __name__ == "__main__":
+    main()
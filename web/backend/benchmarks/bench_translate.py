@@ -0,0 +1,104 @@
+"""Compare serial per-language translation with the pooled concurrent fan-out.
+
+Runs against a local fake Translation v2 server with configurable latency:
+
+    python -m web.backend.benchmarks.bench_translate --latency 0.25 --targets 10
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from web.backend.translator import TranslationClient, translate_targets
+
+LANGUAGES = ["de", "fr", "it", "es", "nl", "pl", "cs", "sk", "hu", "ro", "bg", "el", "sv", "da", "fi", "pt", "sl", "hr", "lt", "lv", "et", "ga", "mt", "en"]
+FIELDS = {
+    "product_name": "SELF BEAUTY UNICONIC SHIELD FIXER",
+    "function_claim": "Makeup setting spray that keeps makeup in place all day.",
+    "usage_instructions": "Shake well and spray evenly on the face from 20 cm after makeup.",
+    "warnings_precautions": "For external use only. Avoid contact with eyes. Keep out of reach of children.",
+    "expiry_date": "Shown on the package",
+    "country_of_origin": "Made in Korea",
+    "batch_lot": "Shown on the package",
+    "net_content": "",
+    "distributor": "Made in Korea",
+}
+
+
+def make_handler(latency: float, fail_rate: float):
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            time.sleep(latency)
+            if random.random() < fail_rate:
+                self.send_response(503)
+                self.end_headers()
+                return
+            data = {"data": {"translations": [{"translatedText": f"[{body['target']}] {text}"} for text in body["q"]]}}
+            raw = json.dumps(data).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def serial_baseline(url: str, values, targets):
+    for target in targets:
+        resp = requests.post(f"{url}?key=bench", json={"q": values, "target": target, "format": "text"}, timeout=15)
+        resp.raise_for_status()
+
+
+def fan_out(client: TranslationClient, values, targets, executor: ThreadPoolExecutor):
+    unique = [value for value in dict.fromkeys(values) if value.strip()]
+    return translate_targets(lambda target: client.translate(unique, target), targets, executor)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--targets", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.latency, args.fail_rate))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/language/translate/v2"
+    targets = LANGUAGES[:args.targets]
+    values = list(FIELDS.values())
+
+    try:
+        started = time.perf_counter()
+        if args.fail_rate == 0:
+            serial_baseline(url, values, targets)
+        serial_time = time.perf_counter() - started
+
+        client = TranslationClient("bench", url=url, backoff=0.05)
+        executor = ThreadPoolExecutor(max_workers=args.workers)
+        started = time.perf_counter()
+        results, errors = fan_out(client, values, targets, executor)
+        fan_out_time = time.perf_counter() - started
+        executor.shutdown()
+        client.close()
+    finally:
+        server.shutdown()
+
+    print(f"targets={len(targets)} latency={args.latency}s fields={len(values)}")
+    if args.fail_rate == 0:
+        print(f"serial   {serial_time * 1000:8.1f} ms")
+    print(f"fan-out  {fan_out_time * 1000:8.1f} ms  ok={len(results)} failed={len(errors)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Compare the old character-by-character line breaking with the prefix-sum wrapper.
+
+Uses warnings text in the 24 EU languages followed by a long single-line INCI list:
+
+    python -m web.backend.benchmarks.bench_wrap --repeat 5
+"""
+import argparse
+import time
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from web.backend import app as backend
+from web.backend import text_wrap
+
+WARNINGS = {
+    "en": "Keep out of reach of children. For external use only. Avoid contact with eyes.",
+    "de": "Für Kinder unzugänglich aufbewahren. Nur zur äußerlichen Anwendung. Kontakt mit den Augen vermeiden.",
+    "fr": "Tenir hors de portée des enfants. Usage externe uniquement. Éviter le contact avec les yeux.",
+    "it": "Tenere fuori dalla portata dei bambini. Solo per uso esterno. Evitare il contatto con gli occhi.",
+    "es": "Mantener fuera del alcance de los niños. Solo para uso externo. Evitar el contacto con los ojos.",
+    "pt": "Manter fora do alcance das crianças. Apenas para uso externo. Evitar o contacto com os olhos.",
+    "nl": "Buiten bereik van kinderen houden. Alleen voor uitwendig gebruik. Contact met de ogen vermijden.",
+    "pl": "Przechowywać w miejscu niedostępnym dla dzieci. Wyłącznie do użytku zewnętrznego. Unikać kontaktu z oczami.",
+    "cs": "Uchovávejte mimo dosah dětí. Pouze pro vnější použití. Zabraňte kontaktu s očima.",
+    "sk": "Uchovávajte mimo dosahu detí. Len na vonkajšie použitie. Zabráňte kontaktu s očami.",
+    "hu": "Gyermekektől elzárva tartandó. Csak külsőleg használható. Kerülje a szemmel való érintkezést.",
+    "ro": "A nu se lăsa la îndemâna copiilor. Numai pentru uz extern. Evitați contactul cu ochii.",
+    "bg": "Да се съхранява на място, недостъпно за деца. Само за външна употреба. Да се избягва контакт с очите.",
+    "el": "Φυλάσσεται μακριά από παιδιά. Μόνο για εξωτερική χρήση. Αποφύγετε την επαφή με τα μάτια.",
+    "sv": "Förvaras utom räckhåll för barn. Endast för utvärtes bruk. Undvik kontakt med ögonen.",
+    "da": "Opbevares utilgængeligt for børn. Kun til udvortes brug. Undgå kontakt med øjnene.",
+    "fi": "Säilytettävä lasten ulottumattomissa. Vain ulkoiseen käyttöön. Vältä kosketusta silmien kanssa.",
+    "sl": "Hraniti nedosegljivo otrokom. Samo za zunanjo uporabo. Preprečite stik z očmi.",
+    "hr": "Čuvati izvan dohvata djece. Samo za vanjsku upotrebu. Izbjegavati kontakt s očima.",
+    "lt": "Laikyti vaikams nepasiekiamoje vietoje. Tik išoriniam naudojimui. Vengti kontakto su akimis.",
+    "lv": "Uzglabāt bērniem nepieejamā vietā. Tikai ārīgai lietošanai. Izvairīties no saskares ar acīm.",
+    "et": "Hoida lastele kättesaamatus kohas. Ainult välispidiseks kasutamiseks. Vältida kokkupuudet silmadega.",
+    "ga": "Coinnigh as raon leanaí. Le húsáid sheachtrach amháin. Seachain teagmháil leis na súile.",
+    "mt": "Żomm 'il bogħod mit-tfal. Għall-użu estern biss. Evita kuntatt mal-għajnejn.",
+}
+INCI = (
+    "Aqua, Glycerin, Butylene Glycol, Niacinamide, 1,2-Hexanediol, Sodium Hyaluronate, Panthenol, Allantoin, "
+    "Centella Asiatica Extract, Madecassoside, Asiaticoside, Madecassic Acid, Asiatic Acid, Tocopherol, "
+    "Camellia Sinensis Leaf Extract, Hydrolyzed Collagen, Ceramide NP, Phytosphingosine, Cholesterol, "
+    "Squalane, Caprylic/Capric Triglyceride, Cetearyl Alcohol, Glyceryl Stearate, PEG-100 Stearate, "
+    "Dimethicone, Carbomer, Tromethamine, Xanthan Gum, Disodium EDTA, Ethylhexylglycerin, Phenoxyethanol"
+)
+FONT, SIZE = "Helvetica", 11
+MAX_WIDTH = A4[0] - 2 * 18 * mm
+
+
+def legacy_wrap(text: str):
+    lines = []
+    for raw_line in text.split("\n"):
+        line = raw_line
+        while line:
+            if stringWidth(line, FONT, SIZE) <= MAX_WIDTH:
+                lines.append(line)
+                break
+            cut = len(line)
+            while cut > 0 and stringWidth(line[:cut], FONT, SIZE) > MAX_WIDTH:
+                cut -= 1
+            lines.append(line[:cut])
+            line = line[cut:].lstrip()
+    return lines
+
+
+def sections(inci_repeat: int):
+    inci = ", ".join([INCI] * inci_repeat)
+    return [(lang, f"{warnings}\n{inci}") for lang, warnings in WARNINGS.items()]
+
+
+def timed(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--inci-repeat", type=int, default=2)
+    args = parser.parse_args()
+
+    texts = sections(args.inci_repeat)
+    chars = sum(len(text) for _, text in texts)
+    legacy_lines = sum(len(legacy_wrap(text)) for _, text in texts)
+    new_lines = sum(len(text_wrap.wrap_text(text, FONT, SIZE, MAX_WIDTH)) for _, text in texts)
+    print(f"languages={len(texts)} chars={chars} lines legacy={legacy_lines} new={new_lines}")
+
+    legacy_ms = timed(lambda: [legacy_wrap(text) for _, text in texts], args.repeat)
+    text_wrap._width_tables.clear()
+    cold_ms = timed(lambda: [text_wrap.wrap_text(text, FONT, SIZE, MAX_WIDTH) for _, text in texts], 1)
+    warm_ms = timed(lambda: [text_wrap.wrap_text(text, FONT, SIZE, MAX_WIDTH) for _, text in texts], args.repeat)
+    print(f"wrap   legacy {legacy_ms:9.1f} ms   new cold {cold_ms:7.1f} ms   new warm {warm_ms:7.1f} ms")
+
+    request = backend.PdfMultiRequest(sections=[{"title": lang, "text": text} for lang, text in texts])
+    render_ms = timed(lambda: backend.generate_pdf_multi(request), args.repeat)
+    print(f"generate_pdf_multi {render_ms:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""In-memory stand-in for the parts of ``google.cloud.firestore`` the history endpoints use.
+
+Every call that would be a network round trip sleeps for ``latency`` seconds and is
+counted in ``FakeFirestore.round_trips``.
+"""
+import itertools
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from google.api_core.exceptions import NotFound
+
+_ids = itertools.count(1)
+
+
+class FakeSnapshot:
+    def __init__(self, reference: "FakeDocumentRef", data: Optional[Dict[str, Any]]):
+        self.reference = reference
+        self.id = reference.id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return dict(self._data) if self._data is not None else None
+
+
+class FakeDocumentRef:
+    def __init__(self, collection: "FakeCollection", doc_id: str):
+        self.collection = collection
+        self.id = doc_id
+
+    def get(self) -> FakeSnapshot:
+        self.collection.db.round_trip()
+        return FakeSnapshot(self, self.collection.docs.get(self.id))
+
+    def set(self, data: Dict[str, Any]) -> None:
+        self.collection.db.round_trip()
+        self.collection.docs[self.id] = dict(data)
+
+    def delete(self, option: Optional[Dict[str, bool]] = None) -> None:
+        self.collection.db.round_trip()
+        if self.collection.docs.pop(self.id, None) is None and option and option.get("exists"):
+            raise NotFound(f"No document to update: {self.id}")
+
+
+class FakeQuery:
+    def __init__(self, collection: "FakeCollection", orders: Tuple[Tuple[str, bool], ...] = (),
+                 filters: Tuple[Any, ...] = (), limit: Optional[int] = None, offset: int = 0,
+                 start_after: Optional[Dict[str, Any]] = None, fields: Optional[Tuple[str, ...]] = None):
+        self.collection = collection
+        self._orders = orders
+        self._filters = filters
+        self._limit = limit
+        self._offset = offset
+        self._start_after = start_after
+        self._fields = fields
+
+    def _copy(self, **changes: Any) -> "FakeQuery":
+        state = {"orders": self._orders, "filters": self._filters, "limit": self._limit,
+                 "offset": self._offset, "start_after": self._start_after, "fields": self._fields}
+        state.update(changes)
+        return FakeQuery(self.collection, **state)
+
+    def select(self, fields: List[str]) -> "FakeQuery":
+        return self._copy(fields=tuple(fields))
+
+    def order_by(self, field: str, direction: str = "ASCENDING") -> "FakeQuery":
+        return self._copy(orders=self._orders + ((field, direction == "DESCENDING"),))
+
+    def where(self, *, filter: Any) -> "FakeQuery":
+        return self._copy(filters=self._filters + (filter,))
+
+    def limit(self, count: int) -> "FakeQuery":
+        return self._copy(limit=count)
+
+    def offset(self, count: int) -> "FakeQuery":
+        return self._copy(offset=count)
+
+    def start_after(self, fields: Dict[str, Any]) -> "FakeQuery":
+        return self._copy(start_after=fields)
+
+    def _sort_key(self, doc_id: str, data: Dict[str, Any]) -> Tuple[Any, ...]:
+        return tuple(doc_id if field == "__name__" else data[field] for field, _ in self._orders)
+
+    def stream(self) -> List[FakeSnapshot]:
+        self.collection.db.round_trip()
+        items = list(self.collection.docs.items())
+        for flt in self._filters:
+            compare = _OPERATORS[flt.op_string]
+            items = [item for item in items if compare(item[1][flt.field_path], flt.value)]
+        for field, descending in reversed(self._orders):
+            items.sort(key=lambda item: item[0] if field == "__name__" else item[1][field], reverse=descending)
+        if self._start_after is not None:
+            # Only uniform-direction orderings are needed here.
+            anchor = tuple(self._start_after[field] for field, _ in self._orders)
+            descending = bool(self._orders) and self._orders[0][1]
+            items = [
+                item for item in items
+                if (self._sort_key(*item) < anchor if descending else self._sort_key(*item) > anchor)
+            ]
+        items = items[self._offset:]
+        if self._limit is not None:
+            items = items[:self._limit]
+        if self._fields is not None:
+            items = [(doc_id, {field: data[field] for field in self._fields if field in data}) for doc_id, data in items]
+        return [FakeSnapshot(FakeDocumentRef(self.collection, doc_id), data) for doc_id, data in items]
+
+
+_OPERATORS = {
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    "==": lambda a, b: a == b,
+    ">=": lambda a, b: a >= b,
+    ">": lambda a, b: a > b,
+}
+
+
+class FakeCollection(FakeQuery):
+    def __init__(self, db: "FakeFirestore", name: str):
+        super().__init__(self)
+        self.db = db
+        self.name = name
+        self.docs: Dict[str, Dict[str, Any]] = {}
+
+    def document(self, doc_id: Optional[str] = None) -> FakeDocumentRef:
+        return FakeDocumentRef(self, doc_id or f"doc{next(_ids):08d}")
+
+    def list_documents(self, page_size: int = 300) -> Iterator[FakeDocumentRef]:
+        last = ""
+        while True:
+            self.db.round_trip()
+            page = sorted(doc_id for doc_id in list(self.docs) if doc_id > last)[:page_size]
+            for doc_id in page:
+                yield FakeDocumentRef(self, doc_id)
+            if len(page) < page_size:
+                return
+            last = page[-1]
+
+    def add(self, data: Dict[str, Any]):
+        ref = self.document()
+        ref.set(data)
+        return None, ref
+
+
+class FakeBatch:
+    def __init__(self, db: "FakeFirestore"):
+        self.db = db
+        self._writes: List[Any] = []
+
+    def set(self, ref: FakeDocumentRef, data: Dict[str, Any]) -> None:
+        self._writes.append((ref, dict(data)))
+
+    def delete(self, ref: FakeDocumentRef) -> None:
+        self._writes.append((ref, None))
+
+    def commit(self) -> None:
+        self.db.round_trip()
+        for ref, data in self._writes:
+            if data is None:
+                ref.collection.docs.pop(ref.id, None)
+            else:
+                ref.collection.docs[ref.id] = data
+        self._writes = []
+
+
+class FakeFirestore:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.round_trips = 0
+        self._collections: Dict[str, FakeCollection] = {}
+        self._lock = threading.Lock()
+
+    def round_trip(self) -> None:
+        with self._lock:
+            self.round_trips += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def collection(self, name: str) -> FakeCollection:
+        if name not in self._collections:
+            self._collections[name] = FakeCollection(self, name)
+        return self._collections[name]
+
+    def write_option(self, **kwargs: bool) -> Dict[str, bool]:
+        return kwargs
+
+    def batch(self) -> FakeBatch:
+        return FakeBatch(self)
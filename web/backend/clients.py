@@ -0,0 +1,121 @@
+import os
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from google.cloud import firestore
+from google.cloud import storage
+from google.cloud import vision
+
+from .translator import TranslationClient
+
+ClientFactory = Callable[[], Any]
+
+
+def _service_account_file() -> str:
+    path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", "")
+    return path if path and os.path.exists(path) else ""
+
+
+def _make_vision_client() -> vision.ImageAnnotatorClient:
+    key_file = _service_account_file()
+    if key_file:
+        return vision.ImageAnnotatorClient.from_service_account_json(key_file)
+    return vision.ImageAnnotatorClient()
+
+
+def _make_storage_client() -> storage.Client:
+    key_file = _service_account_file()
+    if key_file:
+        return storage.Client.from_service_account_json(key_file)
+    return storage.Client()
+
+
+def _make_firestore_client() -> firestore.Client:
+    key_file = _service_account_file()
+    if key_file:
+        return firestore.Client.from_service_account_json(key_file)
+    return firestore.Client()
+
+
+DEFAULT_FACTORIES: Dict[str, ClientFactory] = {
+    "vision": _make_vision_client,
+    "storage": _make_storage_client,
+    "firestore": _make_firestore_client,
+    "translator": TranslationClient.from_env,
+}
+
+
+class ClientRegistry:
+    """Process-wide Google clients, created on first use and shared by every request.
+
+    Pass ``factories`` to swap in fakes, e.g. ``ClientRegistry({"vision": lambda: fake})``.
+    """
+
+    def __init__(self, factories: Optional[Dict[str, ClientFactory]] = None):
+        self._factories: Dict[str, ClientFactory] = dict(DEFAULT_FACTORIES)
+        if factories:
+            self._factories.update(factories)
+        self._clients: Dict[str, Any] = {}
+        self._created: Dict[str, int] = {name: 0 for name in self._factories}
+        self._reused: Dict[str, int] = {name: 0 for name in self._factories}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Any:
+        client = self._clients.get(name)
+        if client is not None:
+            with self._lock:
+                self._reused[name] += 1
+            return client
+        with self._lock:
+            client = self._clients.get(name)
+            if client is not None:
+                self._reused[name] += 1
+                return client
+            if name not in self._factories:
+                raise KeyError(f"Unknown client: {name}")
+            client = self._factories[name]()
+            self._clients[name] = client
+            self._created[name] += 1
+            return client
+
+    def vision(self) -> vision.ImageAnnotatorClient:
+        return self.get("vision")
+
+    def storage(self) -> storage.Client:
+        return self.get("storage")
+
+    def firestore(self) -> firestore.Client:
+        return self.get("firestore")
+
+    def translator(self) -> TranslationClient:
+        return self.get("translator")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                name: {
+                    "active": name in self._clients,
+                    "created": self._created[name],
+                    "reused": self._reused[name],
+                }
+                for name in self._factories
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            _close_client(client)
+
+
+def _close_client(client: Any) -> None:
+    try:
+        transport = getattr(client, "transport", None)
+        if transport is not None and hasattr(transport, "close"):
+            transport.close()
+            return
+        if hasattr(client, "close"):
+            client.close()
+    except Exception:
+        pass
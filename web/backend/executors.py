@@ -0,0 +1,105 @@
+import asyncio
+import functools
+import math
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class PoolSaturated(Exception):
+    def __init__(self, pool: str, retry_after: int):
+        super().__init__(f"{pool} pool is saturated.")
+        self.pool = pool
+        self.retry_after = retry_after
+
+
+class BoundedExecutor:
+    """Thread pool for blocking work called from async endpoints.
+
+    At most ``max_workers`` tasks run and ``max_queue`` wait; anything beyond that
+    raises ``PoolSaturated`` instead of piling up behind a slow Vision call.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"{name}-pool")
+        self._lock = threading.Lock()
+        self._started_at = time.monotonic()
+        self._in_flight = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._busy_seconds = 0.0
+        self._wait_seconds = 0.0
+        self._peak_in_flight = 0
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Queue ``fn`` and return its future, for callers that must know whether it has started."""
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise PoolSaturated(self.name, self._retry_after())
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        call = functools.partial(fn, *args, **kwargs)
+        try:
+            future = self._executor.submit(self._timed, time.monotonic(), call)
+        except Exception:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def _timed(self, submitted_at: float, call: Callable[[], Any]) -> Any:
+        started_at = time.monotonic()
+        with self._lock:
+            self._running += 1
+            self._wait_seconds += started_at - submitted_at
+        try:
+            return call()
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._busy_seconds += time.monotonic() - started_at
+
+    def _release(self, future: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if future.cancelled() or future.exception() is not None:
+                self._failed += 1
+            else:
+                self._completed += 1
+
+    def _retry_after(self) -> int:
+        finished = self._completed + self._failed
+        average = self._busy_seconds / finished if finished else 1.0
+        return max(1, math.ceil(average * self._in_flight / self.max_workers))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            uptime = max(time.monotonic() - self._started_at, 1e-9)
+            finished = self._completed + self._failed
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": self._in_flight - self._running,
+                "peak_in_flight": self._peak_in_flight,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "busy_seconds": round(self._busy_seconds, 3),
+                "utilization": round(self._busy_seconds / (uptime * self.max_workers), 4),
+                "avg_wait_ms": round(self._wait_seconds / finished * 1000, 2) if finished else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
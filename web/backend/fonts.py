@@ -0,0 +1,134 @@
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FONT_DIR = os.getenv("PDF_FONT_DIR", os.path.join(BASE_DIR, "fonts"))
+BUILTIN_FONTS = ("Helvetica", "Helvetica-Bold")
+
+# Script family -> (registered name, env override, candidate files) for regular and bold faces.
+FONT_FAMILIES: Dict[str, List[Tuple[str, str, List[str]]]] = {
+    "unicode": [
+        ("LabelSans", "PDF_FONT_UNICODE", ["DejaVuSans.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"]),
+        (
+            "LabelSans-Bold",
+            "PDF_FONT_UNICODE_BOLD",
+            ["DejaVuSans-Bold.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"],
+        ),
+    ],
+    "korean": [
+        ("LabelKorean", "PDF_FONT_KOREAN", ["NanumGothic.ttf", "/usr/share/fonts/truetype/nanum/NanumGothic.ttf"]),
+        (
+            "LabelKorean-Bold",
+            "PDF_FONT_KOREAN_BOLD",
+            ["NanumGothicBold.ttf", "/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf"],
+        ),
+    ],
+}
+
+_families: Dict[str, Optional[Tuple[str, str]]] = {}
+_char_fonts: Dict[Tuple[str, bool], str] = {}
+_lock = threading.Lock()
+
+
+def _font_path(env_name: str, candidates: List[str]) -> Optional[str]:
+    override = os.getenv(env_name, "")
+    if override and not os.path.exists(override if os.path.isabs(override) else os.path.join(FONT_DIR, override)):
+        logger.warning("%s points at a missing font file: %s", env_name, override)
+    for path in ([override] if override else []) + candidates:
+        if not os.path.isabs(path):
+            path = os.path.join(FONT_DIR, path)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def font_file(family: str, bold: bool = False) -> Optional[str]:
+    """Path of the regular or bold TTF for ``family``, or None when it is not installed."""
+    _, env_name, candidates = FONT_FAMILIES[family][1 if bold else 0]
+    return _font_path(env_name, candidates)
+
+
+def _register_family(family: str) -> Optional[Tuple[str, str]]:
+    names = []
+    for name, env_name, candidates in FONT_FAMILIES[family]:
+        if name not in pdfmetrics.getRegisteredFontNames():
+            path = _font_path(env_name, candidates)
+            if path is None:
+                logger.warning("Font file for %s not found; set %s or add %s to %s.", name, env_name, candidates[0], FONT_DIR)
+                names.append(None)
+                continue
+            # Parsed once per process; ReportLab embeds only the glyphs each document uses.
+            pdfmetrics.registerFont(TTFont(name, path))
+        names.append(name)
+    regular, bold = names
+    if regular is None:
+        return None
+    return regular, bold or regular
+
+
+def font_family(family: str) -> Optional[Tuple[str, str]]:
+    """(regular, bold) font names for ``family``, or None when its files are not installed."""
+    if family not in _families:
+        with _lock:
+            if family not in _families:
+                _families[family] = _register_family(family)
+    return _families[family]
+
+
+def _needs_unicode(char: str) -> bool:
+    try:
+        char.encode("cp1252")
+    except UnicodeEncodeError:
+        return True
+    return False
+
+
+def _is_korean(char: str) -> bool:
+    code = ord(char)
+    return 0xAC00 <= code <= 0xD7AF or 0x1100 <= code <= 0x11FF or 0x3130 <= code <= 0x318F
+
+
+def font_for_char(char: str, bold: bool = False) -> str:
+    """Font that covers ``char``: Helvetica where it can encode it, else NanumGothic or DejaVu Sans."""
+    key = (char, bold)
+    font_name = _char_fonts.get(key)
+    if font_name is None:
+        families = []
+        if _is_korean(char):
+            families.append("korean")
+        if _needs_unicode(char):
+            families.append("unicode")
+        font_name = BUILTIN_FONTS[1 if bold else 0]
+        for family in families:
+            fonts = font_family(family)
+            if fonts is not None:
+                font_name = fonts[1 if bold else 0]
+                break
+        _char_fonts[key] = font_name
+    return font_name
+
+
+def font_runs(text: str, bold: bool = False) -> List[Tuple[str, str]]:
+    """Split ``text`` into (font name, run) pieces so mixed Korean/Latin/other lines each get a covering font.
+
+    Latin-only text stays in the built-in Helvetica, so such PDFs embed nothing.
+    """
+    runs: List[Tuple[str, str]] = []
+    start = 0
+    current = None
+    for index, char in enumerate(text):
+        font_name = font_for_char(char, bold)
+        if font_name != current:
+            if current is not None:
+                runs.append((current, text[start:index]))
+            current, start = font_name, index
+    if current is not None:
+        runs.append((current, text[start:]))
+    return runs
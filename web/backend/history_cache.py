@@ -0,0 +1,78 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+
+class HistoryCache:
+    """Serialized first page of ``GET /api/history`` and its strong ETag, kept for ``ttl`` seconds.
+
+    Writers replace the entry with ``store``; ``generation`` lets a reader that raced a
+    write drop its now-stale result instead of caching it. ``page`` hands back the cached
+    payload so a writer can derive the next first page without querying the store.
+    """
+
+    def __init__(self, ttl: float = 30):
+        self.ttl = ttl
+        self._body: Optional[bytes] = None
+        self._payload: Optional[Dict[str, Any]] = None
+        self._etag = ""
+        self._expires = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "stores": 0, "invalidations": 0}
+
+    @property
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def get(self) -> Optional[Tuple[bytes, str]]:
+        with self._lock:
+            if self._body is not None and time.monotonic() < self._expires:
+                self._counters["hits"] += 1
+                return self._body, self._etag
+            self._counters["misses"] += 1
+            return None
+
+    def page(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if self._body is not None and time.monotonic() < self._expires:
+                return self._payload
+            return None
+
+    def store(self, payload: Dict[str, Any], generation: Optional[int] = None) -> Tuple[bytes, str]:
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return body, etag
+            self._generation += 1
+            self._body = body
+            self._payload = payload
+            self._etag = etag
+            self._expires = time.monotonic() + self.ttl
+            self._counters["stores"] += 1
+        return body, etag
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._body = None
+            self._payload = None
+            self._counters["invalidations"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+            stats["cached"] = self._body is not None and time.monotonic() < self._expires
+        return stats
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    candidates = [candidate[2:] if candidate.startswith("W/") else candidate for candidate in candidates]
+    return "*" in candidates or etag in candidates
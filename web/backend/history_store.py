@@ -0,0 +1,310 @@
+import base64
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from google.api_core.exceptions import NotFound
+from google.cloud import firestore
+from google.cloud.firestore_v1.base_query import FieldFilter
+
+HistoryItem = Dict[str, Any]
+Cursor = Tuple[str, str]
+SUMMARY_FIELDS = ("title", "meta", "created_at")
+
+
+def serialize_history_item(data: Dict[str, Any]) -> HistoryItem:
+    serialized = dict(data)
+    created_at = serialized.get("created_at")
+    if created_at is not None:
+        try:
+            serialized["created_at"] = created_at.isoformat()
+        except Exception:
+            serialized["created_at"] = str(created_at)
+    return serialized
+
+
+def encode_cursor(item: HistoryItem) -> str:
+    raw = json.dumps([item.get("created_at", ""), item["id"]], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, item_id = json.loads(raw)
+    except Exception:
+        raise ValueError("Invalid cursor.")
+    if not isinstance(created_at, str) or not isinstance(item_id, str):
+        raise ValueError("Invalid cursor.")
+    return created_at, item_id
+
+
+class HistoryStore(ABC):
+    """OCR history ordered newest first by (created_at, id)."""
+
+    @abstractmethod
+    def page(self, limit: int, cursor: Optional[Cursor] = None) -> List[HistoryItem]:
+        """Summaries (``id`` plus ``SUMMARY_FIELDS``) of up to ``limit`` entries older than ``cursor``."""
+        ...
+
+    @abstractmethod
+    def get(self, item_id: str) -> Optional[HistoryItem]:
+        ...
+
+    @abstractmethod
+    def insert(self, record: Dict[str, Any]) -> HistoryItem:
+        ...
+
+    @abstractmethod
+    def delete(self, item_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    def clear(self) -> int:
+        ...
+
+    @abstractmethod
+    def scan(self, since: Optional[str] = None) -> Iterator[HistoryItem]:
+        """Every entry created after ``since``, oldest first."""
+        ...
+
+    @abstractmethod
+    def ids(self) -> Iterator[str]:
+        """Every stored id, without reading the entries themselves."""
+        ...
+
+    def listen(self, limit: int, on_change: Callable[[List[HistoryItem]], None]) -> Optional[Callable[[], None]]:
+        """Push the newest ``limit`` summaries when other processes change them; returns an unsubscribe callable if supported."""
+        return None
+
+    def close(self) -> None:
+        pass
+
+
+class FirestoreHistoryStore(HistoryStore):
+    def __init__(
+        self,
+        db: Callable[[], firestore.Client],
+        collection: str,
+        delete_batch: int = 500,
+        delete_concurrency: int = 4,
+    ):
+        self._db = db
+        self.collection = collection
+        self.delete_batch = delete_batch
+        self.delete_concurrency = max(1, delete_concurrency)
+
+    def _newest(self, db: firestore.Client) -> Any:
+        return (
+            db.collection(self.collection)
+            .order_by("created_at", direction=firestore.Query.DESCENDING)
+            .order_by("__name__", direction=firestore.Query.DESCENDING)
+        )
+
+    @staticmethod
+    def _item(doc: Any) -> HistoryItem:
+        data = serialize_history_item(doc.to_dict())
+        data["id"] = doc.id
+        return data
+
+    @staticmethod
+    def _summary(doc: Any) -> HistoryItem:
+        data = doc.to_dict()
+        summary = serialize_history_item({field: data.get(field) for field in SUMMARY_FIELDS})
+        summary["id"] = doc.id
+        return summary
+
+    def page(self, limit: int, cursor: Optional[Cursor] = None) -> List[HistoryItem]:
+        # Projection query: raw_text and form never leave Firestore for list views.
+        query = self._newest(self._db()).select(list(SUMMARY_FIELDS))
+        if cursor is not None:
+            created_at, item_id = cursor
+            query = query.start_after({"created_at": datetime.fromisoformat(created_at), "__name__": item_id})
+        return [self._summary(doc) for doc in query.limit(limit).stream()]
+
+    def get(self, item_id: str) -> Optional[HistoryItem]:
+        doc = self._db().collection(self.collection).document(item_id).get()
+        return self._item(doc) if doc.exists else None
+
+    def insert(self, record: Dict[str, Any]) -> HistoryItem:
+        doc_ref = self._db().collection(self.collection).document()
+        doc_ref.set(record)
+        created = serialize_history_item(record)
+        created["id"] = doc_ref.id
+        return created
+
+    def delete(self, item_id: str) -> bool:
+        db = self._db()
+        try:
+            db.collection(self.collection).document(item_id).delete(option=db.write_option(exists=True))
+        except NotFound:
+            return False
+        return True
+
+    def clear(self) -> int:
+        db = self._db()
+        refs = db.collection(self.collection).list_documents(page_size=self.delete_batch)
+
+        def commit(chunk: List[Any]) -> int:
+            batch = db.batch()
+            for ref in chunk:
+                batch.delete(ref)
+            batch.commit()
+            return len(chunk)
+
+        deleted = 0
+        pending = set()
+        chunk: List[Any] = []
+        with ThreadPoolExecutor(max_workers=self.delete_concurrency) as executor:
+            for ref in refs:
+                chunk.append(ref)
+                if len(chunk) < self.delete_batch:
+                    continue
+                if len(pending) >= self.delete_concurrency:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    deleted += sum(future.result() for future in done)
+                pending.add(executor.submit(commit, chunk))
+                chunk = []
+            if chunk:
+                pending.add(executor.submit(commit, chunk))
+            deleted += sum(future.result() for future in pending)
+        return deleted
+
+    def scan(self, since: Optional[str] = None) -> Iterator[HistoryItem]:
+        query = self._db().collection(self.collection).order_by("created_at")
+        if since:
+            query = query.where(filter=FieldFilter("created_at", ">", datetime.fromisoformat(since)))
+        for doc in query.stream():
+            yield self._item(doc)
+
+    def ids(self) -> Iterator[str]:
+        # Document references only: list_documents reads no field data.
+        for ref in self._db().collection(self.collection).list_documents(page_size=self.delete_batch):
+            yield ref.id
+
+    def listen(self, limit: int, on_change: Callable[[List[HistoryItem]], None]) -> Optional[Callable[[], None]]:
+        def on_snapshot(docs: List[Any], changes: Any, read_time: Any) -> None:
+            on_change([self._summary(doc) for doc in docs])
+
+        watch = self._newest(self._db()).limit(limit).on_snapshot(on_snapshot)
+        return watch.unsubscribe
+
+
+class SqliteHistoryStore(HistoryStore):
+    """Single-file history for offline runs, benchmarks and load tests."""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS history (
+                id TEXT PRIMARY KEY,
+                created_at TEXT NOT NULL,
+                title TEXT NOT NULL DEFAULT '',
+                meta TEXT NOT NULL DEFAULT '',
+                data TEXT NOT NULL
+            )
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(history)")}
+        if "title" not in columns:
+            self._conn.execute("ALTER TABLE history ADD COLUMN title TEXT NOT NULL DEFAULT ''")
+            self._conn.execute("ALTER TABLE history ADD COLUMN meta TEXT NOT NULL DEFAULT ''")
+            self._conn.execute(
+                "UPDATE history SET title = COALESCE(json_extract(data, '$.title'), ''), "
+                "meta = COALESCE(json_extract(data, '$.meta'), '')"
+            )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS history_created_at ON history (created_at DESC, id DESC)")
+        self._conn.commit()
+
+    @staticmethod
+    def _item(row: Any) -> HistoryItem:
+        item_id, created_at, data = row
+        item = json.loads(data)
+        item["created_at"] = created_at
+        item["id"] = item_id
+        return item
+
+    def page(self, limit: int, cursor: Optional[Cursor] = None) -> List[HistoryItem]:
+        sql = "SELECT id, title, meta, created_at FROM history"
+        params: List[Any] = []
+        if cursor is not None:
+            sql += " WHERE created_at < ? OR (created_at = ? AND id < ?)"
+            params += [cursor[0], cursor[0], cursor[1]]
+        sql += " ORDER BY created_at DESC, id DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            {"title": title, "meta": meta, "created_at": created_at, "id": item_id}
+            for item_id, title, meta, created_at in rows
+        ]
+
+    def get(self, item_id: str) -> Optional[HistoryItem]:
+        with self._lock:
+            row = self._conn.execute("SELECT id, created_at, data FROM history WHERE id = ?", (item_id,)).fetchone()
+        return self._item(row) if row else None
+
+    def insert(self, record: Dict[str, Any]) -> HistoryItem:
+        serialized = serialize_history_item(record)
+        created_at = serialized.pop("created_at", None) or datetime.now(timezone.utc).isoformat()
+        item_id = uuid.uuid4().hex
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO history (id, created_at, title, meta, data) VALUES (?, ?, ?, ?, ?)",
+                    (
+                        item_id,
+                        created_at,
+                        str(serialized.get("title") or ""),
+                        str(serialized.get("meta") or ""),
+                        json.dumps(serialized, ensure_ascii=False, default=str),
+                    ),
+                )
+        serialized["created_at"] = created_at
+        serialized["id"] = item_id
+        return serialized
+
+    def delete(self, item_id: str) -> bool:
+        with self._lock:
+            with self._conn:
+                cursor = self._conn.execute("DELETE FROM history WHERE id = ?", (item_id,))
+        return cursor.rowcount > 0
+
+    def clear(self) -> int:
+        with self._lock:
+            with self._conn:
+                cursor = self._conn.execute("DELETE FROM history")
+        return cursor.rowcount
+
+    def scan(self, since: Optional[str] = None) -> Iterator[HistoryItem]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, created_at, data FROM history WHERE created_at > ? ORDER BY created_at, id",
+                (since or "",),
+            ).fetchall()
+        for row in rows:
+            yield self._item(row)
+
+    def ids(self) -> Iterator[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT id FROM history").fetchall()
+        for (item_id,) in rows:
+            yield item_id
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,155 @@
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ProgressCallback = Callable[[str], None]
+JobFunction = Callable[[ProgressCallback], Dict[str, Any]]
+
+FINISHED_STATUSES = ("done", "failed", "cancelled")
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class OcrJob:
+    def __init__(self, job_id: str):
+        self.id = job_id
+        self.status = "queued"
+        self.stage = ""
+        self.result: Optional[Dict[str, Any]] = None
+        self.error = ""
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.on_cancel: Optional[Callable[[], None]] = None
+        self._future: Optional[Future] = None
+        self._events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def report(self, stage: str) -> None:
+        with self._lock:
+            self.stage = stage
+            self._events.append({"type": "stage", "stage": stage, "at": time.time()})
+
+    def _set_status(self, status: str, error: str = "", expected: Optional[str] = None) -> bool:
+        """Move to ``status`` (only from ``expected`` if given); a finished job keeps its final status."""
+        with self._lock:
+            if self.status in FINISHED_STATUSES or (expected is not None and self.status != expected):
+                return False
+            self.status = status
+            self.error = error
+            if status in FINISHED_STATUSES:
+                self.finished_at = time.time()
+            event: Dict[str, Any] = {"type": status, "stage": self.stage, "at": time.time()}
+            if error:
+                event["error"] = error
+            self._events.append(event)
+        return True
+
+    def cancel(self, error: str) -> None:
+        if self._set_status("cancelled", error) and self.on_cancel is not None:
+            self.on_cancel()
+
+    def cancel_if_queued(self, error: str) -> bool:
+        """Cancel the job only if it has not started; checked and set under the job lock."""
+        if not self._set_status("cancelled", error, expected="queued"):
+            return False
+        if self.on_cancel is not None:
+            self.on_cancel()
+        return True
+
+    def events_since(self, index: int) -> Tuple[List[Dict[str, Any]], bool]:
+        with self._lock:
+            return list(self._events[index:]), self.finished
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "job_id": self.id,
+                "status": self.status,
+                "stage": self.stage,
+                "error": self.error,
+                "created_at": self.created_at,
+                "finished_at": self.finished_at,
+            }
+
+
+class OcrJobManager:
+    """Runs OCR jobs on a bounded thread pool and keeps finished jobs for ``retention`` seconds."""
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 16, retention: float = 3600):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ocr-job")
+        self._jobs: Dict[str, OcrJob] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, fn: JobFunction, first_stage: str = "", on_cancel: Optional[Callable[[], None]] = None) -> OcrJob:
+        """Queue ``fn``; ``on_cancel`` releases its resources if the job is cancelled before it runs."""
+        with self._lock:
+            if self._closed:
+                raise JobQueueFull("Job manager is shutting down.")
+            self._prune()
+            active = sum(1 for job in self._jobs.values() if not job.finished)
+            if active >= self.max_workers + self.max_pending:
+                raise JobQueueFull("Too many OCR jobs in progress.")
+            job = OcrJob(uuid.uuid4().hex)
+            job.on_cancel = on_cancel
+            self._jobs[job.id] = job
+        if first_stage:
+            job.report(first_stage)
+        job._future = self._executor.submit(self._run, job, fn)
+        return job
+
+    def get(self, job_id: str) -> Optional[OcrJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        counts = {"queued": 0, "running": 0, "done": 0, "failed": 0, "cancelled": 0}
+        for job in jobs:
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return counts
+
+    def shutdown(self, timeout: float = 30) -> None:
+        """Cancel queued jobs and give running ones up to ``timeout`` seconds to finish."""
+        with self._lock:
+            self._closed = True
+            jobs = list(self._jobs.values())
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        for job in jobs:
+            job.cancel_if_queued("Server is shutting down.")
+        running = [job for job in jobs if job.status == "running" and job._future is not None]
+        wait([job._future for job in running], timeout=timeout)
+        for job in running:
+            job._set_status("failed", "Server shut down before the job finished.")
+
+    def _run(self, job: OcrJob, fn: JobFunction) -> None:
+        if not job._set_status("running", expected="queued"):
+            return
+        try:
+            job.result = fn(job.report)
+        except Exception as exc:
+            job._set_status("failed", str(exc))
+            return
+        job._set_status("done")
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.retention
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished and job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
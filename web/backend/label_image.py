@@ -0,0 +1,164 @@
+import io
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+from .fonts import font_file
+from .text_wrap import wrap_text
+
+IMAGE_FORMATS = {"png": "image/png", "webp": "image/webp"}
+# Palette indices 0..WHITE are a black-to-white ramp for anti-aliased text; the logo uses the rest.
+INK = 0
+WHITE = 223
+LOGO_COLORS = 255 - WHITE
+
+# (number, heading, form field, fallback, extra comment) in the desktop app's label layout.
+# A ``None`` fallback is the renderer's default EU responsible person.
+LABEL_BLOCKS: List[Tuple[int, str, str, Optional[str], Optional[str]]] = [
+    (1, "Product Name:", "product_name", "N/A", None),
+    (2, "Product Function:", "function_claim", "N/A", None),
+    (3, "How to Use:", "usage_instructions", "N/A", None),
+    (4, "Warning / Precautions:", "warnings_precautions", "N/A", None),
+    (5, "Ingredients (INCI):", "inci_ingredients", "N/A", None),
+    (6, "Expiry Date:", "expiry_date", "Shown on the package", None),
+    (7, "EU Responsible Person:", "eu_responsible_person", None, None),
+    (
+        8,
+        "Distributor Name and Address:",
+        "distributor",
+        "해당국 수입 판매자(DISTRIBUTOR)의 정보 기입은 필수사항입니다.",
+        "※ DT는 필수 기재사항 / Manufacturer 문구는 선택 사항",
+    ),
+    (9, "Country of Origin:", "country_of_origin", "Made in Korea", None),
+    (10, "Batch Number:", "batch_lot", "Shown on the package (LOT 번호 사용가능)", "(LOT 번호 사용 가능)"),
+    (11, "Nominal Quantities:", "net_content", "N/A", None),
+]
+FOOTER_NOTE = "※ 이 라벨 이미지는 CPSR Part B를 기반으로 자동 생성된 예시안입니다."
+
+
+def _load_font(size: int, bold: bool = False) -> Tuple[ImageFont.FreeTypeFont, str]:
+    for family in ("korean", "unicode"):
+        path = font_file(family, bold) or font_file(family)
+        if path:
+            return ImageFont.truetype(path, size), path
+    return ImageFont.load_default(size), "default"
+
+
+class LabelImageRenderer:
+    """Raster EU label in the layout of the desktop app's ``generate_label_image_from_form``.
+
+    Fonts, the logo scaled to the label width and a blank template with the logo and
+    footer rule are prepared once. Labels are 8-bit palette images: text is anti-aliased
+    over a grey ramp and the logo keeps its own quantized colours, which encodes several
+    times faster than RGB. Glyphs are rasterized once and pasted from a cache.
+    """
+
+    def __init__(
+        self,
+        logo_path: Optional[str],
+        default_rp: str,
+        width: int = 1000,
+        height: int = 1800,
+        margin: int = 40,
+    ):
+        self.default_rp = default_rp
+        self.width = width
+        self.height = height
+        self.margin = margin
+        self.fonts: Dict[str, ImageFont.FreeTypeFont] = {}
+        self.fonts["title"], _ = _load_font(36, bold=True)
+        self.fonts["bold"], _ = _load_font(24, bold=True)
+        self.fonts["regular"], path = _load_font(22)
+        self._wrap_key = f"pil:{path}"
+        self._glyphs: Dict[Tuple[str, str], Tuple[Optional[Image.Image], int, int, float]] = {}
+        # FreeType faces are not safe to share across threads; only glyph rasterization touches them.
+        self._lock = threading.Lock()
+        self.has_logo = False
+        self.template = self._make_template(logo_path)
+
+    def _make_template(self, logo_path: Optional[str]) -> Image.Image:
+        template = Image.new("P", (self.width, self.height), color=WHITE)
+        palette = [round(level * 255 / WHITE) for level in range(WHITE + 1) for _ in range(3)]
+        self.body_top = self.margin
+        if logo_path:
+            try:
+                with Image.open(logo_path) as logo:
+                    logo_h = int(logo.height * self.width / logo.width)
+                    logo = logo.convert("RGBA").resize((self.width, logo_h), Image.LANCZOS)
+                flat = Image.new("RGB", logo.size, "white")
+                flat.paste(logo, (0, 0), logo)
+                quantized = flat.quantize(LOGO_COLORS)
+                palette += quantized.getpalette()[: 3 * LOGO_COLORS]
+                template.paste(quantized.point(lambda index: index + WHITE + 1), (0, self.margin))
+                self.body_top = self.margin + logo_h + 30
+                self.has_logo = True
+            except OSError:
+                pass
+        template.putpalette(palette)
+        footer_y = self.height - 120
+        ImageDraw.Draw(template).line((self.margin, footer_y, self.width - self.margin, footer_y), fill=INK, width=1)
+        return template
+
+    def _glyph(self, font_name: str, char: str) -> Tuple[Optional[Image.Image], int, int, float]:
+        key = (font_name, char)
+        glyph = self._glyphs.get(key)
+        if glyph is None:
+            font = self.fonts[font_name]
+            with self._lock:
+                left, top, right, bottom = font.getbbox(char)
+                mask = None
+                if right > left and bottom > top:
+                    mask = Image.new("L", (right - left, bottom - top), 0)
+                    ImageDraw.Draw(mask).text((-left, -top), char, font=font, fill=255)
+                glyph = self._glyphs[key] = (mask, left, top, font.getlength(char))
+        return glyph
+
+    def _draw_line(self, image: Image.Image, x: float, y: int, text: str, font_name: str = "regular") -> None:
+        for char in text:
+            mask, left, top, advance = self._glyph(font_name, char)
+            if mask is not None:
+                image.paste(INK, (round(x) + left, y + top), mask)
+            x += advance
+
+    def _wrap(self, text: str) -> List[str]:
+        # Line breaks inside a field collapse to spaces, as in the desktop renderer.
+        text = " ".join(text.split())
+        if not text:
+            return []
+        return wrap_text(text, self._wrap_key, 22, self.width - 2 * self.margin, self.fonts["regular"].getlength)
+
+    def render(self, fields: Dict[str, str]) -> Image.Image:
+        image = self.template.copy()
+        x = self.margin
+        y = self.body_top
+        gap = 28
+        if not self.has_logo:
+            self._draw_line(image, x, y, fields.get("product_name") or "Product Name", "title")
+            y += 70
+        for number, heading, field, fallback, comment in LABEL_BLOCKS:
+            self._draw_line(image, x, y, f"{number}. {heading}", "bold")
+            y += gap
+            for line in self._wrap(fields.get(field) or fallback or self.default_rp):
+                self._draw_line(image, x, y, line)
+                y += gap
+            if comment:
+                self._draw_line(image, x + 20, y, comment)
+                y += gap
+            y += 12
+
+        y = self.height - 110
+        for line in (fields.get("eu_responsible_person") or self.default_rp).split("\n"):
+            self._draw_line(image, x, y, line)
+            y += gap
+        self._draw_line(image, x, y + 6, FOOTER_NOTE)
+        return image
+
+    def render_bytes(self, fields: Dict[str, str], image_format: str = "png") -> bytes:
+        image = self.render(fields)
+        buffer = io.BytesIO()
+        if image_format == "webp":
+            image.save(buffer, "WEBP", lossless=True, method=0)
+        else:
+            image.save(buffer, "PNG", compress_level=1)
+        return buffer.getvalue()
@@ -0,0 +1,111 @@
+"""Maintenance commands for the web backend.
+
+    python -m web.backend.manage translations-export cache.json
+    python -m web.backend.manage translations-warm --targets de,fr,it,es
+    python -m web.backend.manage translations-warm --import cache.json
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List
+
+from . import app as backend
+from .translation_segments import segment_field
+
+# The EU responsible person is never sent for translation, so it is not warmed.
+WARM_PHRASES = [
+    "Made in Korea",
+    "Shown on the package",
+    "Not to be used for children under three years of age.",
+    "For external use only.",
+    "Avoid contact with eyes. In case of contact, rinse immediately with water.",
+    "Keep out of reach of children.",
+    "Stop use if irritation occurs.",
+    "Store in a cool, dry place away from direct sunlight.",
+]
+
+
+def _export(path: str) -> int:
+    cache = backend._make_translation_cache()
+    try:
+        entries = [
+            {"target": target, "source": source, "translated": translated}
+            for target, source, translated in cache.store.entries()
+        ]
+    finally:
+        cache.close()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(entries, f, ensure_ascii=False, indent=2)
+    print(f"Exported {len(entries)} translations to {path}")
+    return 0
+
+
+def _import(path: str) -> int:
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    grouped: Dict[str, Dict[str, str]] = {}
+    for entry in entries:
+        grouped.setdefault(entry["target"], {})[entry["source"]] = entry["translated"]
+    cache = backend._make_translation_cache()
+    try:
+        for target, translations in grouped.items():
+            cache.save(target, translations)
+    finally:
+        cache.close()
+    print(f"Imported {len(entries)} translations from {path}")
+    return 0
+
+
+def _warm_segments(phrases: List[str]) -> List[str]:
+    """Translatable sentences of ``phrases``, split as ``POST /api/translate`` splits a field, so they are the cache keys it looks up."""
+    segments = [text for phrase in phrases for text, translatable in segment_field("", phrase) if translatable]
+    return list(dict.fromkeys(segments))
+
+
+def _warm(targets: List[str], phrases: List[str]) -> int:
+    segments = _warm_segments(phrases)
+    cache = backend._make_translation_cache()
+    backend.app.state.translation_cache = cache
+    try:
+        for target in targets:
+            backend._translate_cached(segments, target)
+        stats = cache.stats()
+    except backend.HTTPException as exc:
+        print(f"Warm failed: {exc.detail}", file=sys.stderr)
+        return 1
+    finally:
+        cache.close()
+    print(f"Warmed {len(segments)} segments from {len(phrases)} phrases for {', '.join(targets)} (upstream misses: {stats['misses']})")
+    return 0
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m web.backend.manage")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("translations-export", help="Dump the translation cache as JSON.")
+    export.add_argument("path")
+
+    warm = commands.add_parser("translations-warm", help="Pre-fill the translation cache.")
+    warm.add_argument("--targets", default="", help="Comma separated language codes to translate into.")
+    warm.add_argument("--phrases", help="Text file with one phrase per line, split into sentences like field text (defaults to common label phrases).")
+    warm.add_argument("--import", dest="import_path", help="Load a file written by translations-export instead.")
+
+    args = parser.parse_args(argv)
+    if args.command == "translations-export":
+        return _export(args.path)
+
+    if args.import_path:
+        return _import(args.import_path)
+    targets = [target.strip() for target in args.targets.split(",") if target.strip()]
+    if not targets:
+        parser.error("--targets or --import is required")
+    phrases = WARM_PHRASES
+    if args.phrases:
+        with open(args.phrases, "r", encoding="utf-8") as f:
+            phrases = [line.strip() for line in f if line.strip()]
+    return _warm(targets, phrases)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,156 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+class OcrResultCache:
+    """OCR text keyed by the SHA-256 of the uploaded bytes.
+
+    A bounded in-memory LRU sits in front of a directory of ``<key>.txt`` files.
+    Entries expire ``ttl`` seconds after they were written, in memory and on disk; the
+    file mtime is the write time and hits do not extend it. The directory is swept for
+    expired files and trimmed to ``max_bytes``, oldest first, every ``sweep_interval``
+    seconds or after about a tenth of ``max_bytes`` has been written, not on every write.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        memory_items: int = 64,
+        ttl: float = 7 * 24 * 3600,
+        max_bytes: int = 256 * 1024 * 1024,
+        sweep_interval: float = 600,
+    ):
+        self.directory = directory
+        self.memory_items = memory_items
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        # key -> (text, time.time() when written)
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._written = 0
+        self._next_sweep = 0.0
+        self._sweeping = False
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0, "sweeps": 0}
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.txt")
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if time.time() - entry[1] <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return entry[0]
+                del self._memory[key]
+
+        entry = self._read_disk(key)
+        with self._lock:
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            self._counters["disk_hits"] += 1
+            self._remember(key, *entry)
+        return entry[0]
+
+    def put(self, key: str, text: str) -> None:
+        if text.startswith("[ERROR]"):
+            return
+        with self._lock:
+            self._remember(key, text, time.time())
+            self._counters["stores"] += 1
+        self._write_disk(key, text)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["memory_items"] = len(self._memory)
+        stats["hits"] = stats["memory_hits"] + stats["disk_hits"]
+        return stats
+
+    def _remember(self, key: str, text: str, written_at: float) -> None:
+        self._memory[key] = (text, written_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key: str) -> Optional[Tuple[str, float]]:
+        path = self._path(key)
+        try:
+            written_at = os.path.getmtime(path)
+            if time.time() - written_at > self.ttl:
+                os.remove(path)
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read(), written_at
+        except OSError:
+            return None
+
+    def _write_disk(self, key: str, text: str) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(key)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        if self._sweep_due(len(text.encode("utf-8"))):
+            try:
+                self._evict_disk()
+            finally:
+                with self._lock:
+                    self._sweeping = False
+
+    def _sweep_due(self, written: int) -> bool:
+        with self._lock:
+            self._written += written
+            now = time.monotonic()
+            if self._sweeping or (self._written < self.max_bytes // 10 and now < self._next_sweep):
+                return False
+            self._sweeping = True
+            self._written = 0
+            self._next_sweep = now + self.sweep_interval
+            self._counters["sweeps"] += 1
+            return True
+
+    def _evict_disk(self) -> None:
+        now = time.time()
+        entries = []
+        total = 0
+        try:
+            listing = list(os.scandir(self.directory))
+        except OSError:
+            return
+        for entry in listing:
+            if not entry.name.endswith(".txt"):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            if now - stat.st_mtime > self.ttl:
+                self._remove(entry.path)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            return
+        with self._lock:
+            self._counters["evictions"] += 1
@@ -0,0 +1,59 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+def pdf_key(kind: str, content: Any) -> str:
+    """SHA-256 of the normalized render input; identical content maps to the same key and ETag."""
+    raw = json.dumps([kind, content], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def pdf_etag(key: str) -> str:
+    return '"' + key[:32] + '"'
+
+
+class PdfCache:
+    """Rendered PDFs keyed by ``pdf_key``, bounded by entry count and total size, evicted LRU."""
+
+    def __init__(self, max_items: int = 64, max_bytes: int = 32 * 1024 * 1024):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            pdf_bytes = self._entries.get(key)
+            if pdf_bytes is None:
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return pdf_bytes
+
+    def put(self, key: str, pdf_bytes: bytes) -> None:
+        if len(pdf_bytes) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = pdf_bytes
+            self._size += len(pdf_bytes)
+            self._counters["stores"] += 1
+            while len(self._entries) > self.max_items or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self._counters["evictions"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["items"] = len(self._entries)
+            stats["bytes"] = self._size
+        return stats
@@ -0,0 +1,91 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+
+from PyPDF2 import PdfReader
+
+
+def _extract_range(file_path: str, start: int, stop: int) -> List[str]:
+    reader = PdfReader(file_path)
+    return [reader.pages[index].extract_text() or "" for index in range(start, stop)]
+
+
+def _page_ranges(page_count: int, parts: int) -> List[Tuple[int, int]]:
+    parts = max(1, min(parts, page_count))
+    size, extra = divmod(page_count, parts)
+    ranges = []
+    start = 0
+    for index in range(parts):
+        stop = start + size + (1 if index < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+class PdfTextExtractor:
+    """Reads a PDF text layer page by page.
+
+    Documents with at least ``min_pages`` pages are split into contiguous page
+    ranges and extracted on a process pool; results are merged in page order.
+    If a worker dies the pool is replaced and the document retried once.
+    """
+
+    def __init__(self, workers: int = 1, min_pages: int = 64):
+        self.workers = max(1, workers)
+        self.min_pages = min_pages
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def extract_pages(self, file_path: str) -> List[str]:
+        reader = PdfReader(file_path)
+        page_count = len(reader.pages)
+        if self.workers <= 1 or page_count < self.min_pages:
+            return [page.extract_text() or "" for page in reader.pages]
+
+        # Two ranges per worker keeps the pool busy when some pages are much heavier.
+        ranges = _page_ranges(page_count, self.workers * 2)
+        try:
+            return self._extract_ranges(file_path, ranges)
+        except BrokenProcessPool:
+            # A worker died (OOM kill, crash); the pool is unusable, so retry once on a fresh one.
+            return self._extract_ranges(file_path, ranges)
+
+    def _extract_ranges(self, file_path: str, ranges: List[Tuple[int, int]]) -> List[str]:
+        pool = self._get_pool()
+        try:
+            futures = [pool.submit(_extract_range, file_path, start, stop) for start, stop in ranges]
+            pages: List[str] = []
+            for future in futures:
+                pages.extend(future.result())
+            return pages
+        except BrokenProcessPool:
+            self._discard_pool(pool)
+            raise
+
+    def extract_text(self, file_path: str) -> str:
+        return "\n".join(self.extract_pages(file_path)).strip()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> None:
+        with self._lock:
+            # Another thread may already have replaced it.
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool = self._pool
+            self._pool = None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
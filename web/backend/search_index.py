@@ -0,0 +1,344 @@
+import bisect
+import heapq
+import logging
+import re
+import threading
+import time
+from array import array
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+MAX_PREFIX_EXPANSION = 64
+
+Key = Tuple[str, str]
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _searchable_text(item: Dict[str, Any]) -> str:
+    form = item.get("form") or {}
+    return "\n".join(
+        str(value or "")
+        for value in (item.get("title"), form.get("product_name"), form.get("inci_ingredients"), item.get("raw_text"))
+    )
+
+
+def _item_key(item: Dict[str, Any]) -> Key:
+    return (str(item.get("created_at") or ""), item["id"])
+
+
+def _look_back(created_at: Optional[str], seconds: float) -> Optional[str]:
+    if not created_at:
+        return None
+    try:
+        return (datetime.fromisoformat(created_at) - timedelta(seconds=seconds)).isoformat()
+    except ValueError:
+        return created_at
+
+
+class _Postings:
+    """The index contents; the first load builds one off-lock and swaps it in whole.
+
+    Entry numbers follow arrival, so posting lists stay append-only. Entries that arrive
+    in key order form the ordered run that searches walk newest first; entries older than
+    the newest key at arrival (clock skew, late writes from other workers) are kept in a
+    small key-sorted side list and merged in by key.
+    """
+
+    def __init__(self, summary_fields: Tuple[str, ...]):
+        self.summary_fields = summary_fields
+        self.postings: Dict[str, array] = {}
+        self.vocabulary: List[str] = []
+        self.vocabulary_sorted = True
+        self.keys: List[Key] = []
+        self.summaries: List[Optional[Dict[str, Any]]] = []
+        self.numbers: Dict[str, int] = {}
+        self.ordered_keys: List[Key] = []
+        self.ordered_numbers = array("I")
+        self.late: List[Tuple[Key, int]] = []
+        self.late_numbers: Set[int] = set()
+        self.removed = 0
+
+    @property
+    def newest(self) -> Optional[str]:
+        return self.ordered_keys[-1][0] if self.ordered_keys else None
+
+    def add(self, item: Dict[str, Any]) -> None:
+        if item["id"] in self.numbers:
+            return
+        key = _item_key(item)
+        number = len(self.keys)
+        self.keys.append(key)
+        self.summaries.append({field: item.get(field) for field in self.summary_fields})
+        self.numbers[item["id"]] = number
+        if not self.ordered_keys or key > self.ordered_keys[-1]:
+            self.ordered_keys.append(key)
+            self.ordered_numbers.append(number)
+        else:
+            bisect.insort(self.late, (key, number))
+            self.late_numbers.add(number)
+        for token in set(tokenize(_searchable_text(item))):
+            postings = self.postings.get(token)
+            if postings is None:
+                postings = self.postings[token] = array("I")
+                self.vocabulary.append(token)
+                self.vocabulary_sorted = False
+            postings.append(number)
+
+    def remove(self, item_id: str) -> None:
+        number = self.numbers.pop(item_id, None)
+        if number is not None:
+            self.summaries[number] = None
+            self.removed += 1
+
+    def matches(self, token: str, prefix: bool) -> Optional[Any]:
+        if not prefix:
+            return self.postings.get(token)
+        if not self.vocabulary_sorted:
+            # Nearly sorted after incremental adds, so this is close to linear.
+            self.vocabulary.sort()
+            self.vocabulary_sorted = True
+        start = bisect.bisect_left(self.vocabulary, token)
+        expansions = []
+        for candidate in self.vocabulary[start:start + MAX_PREFIX_EXPANSION]:
+            if not candidate.startswith(token):
+                break
+            expansions.append(self.postings[candidate])
+        if not expansions:
+            return None
+        if len(expansions) == 1:
+            return expansions[0]
+        merged: Set[int] = set()
+        for postings in expansions:
+            merged.update(postings)
+        return merged
+
+    def ordered_matches(self, driver: Any, others: List[Any], cursor: Optional[Key]) -> Iterator[Tuple[Key, int]]:
+        end = len(self.keys)
+        if cursor is not None:
+            boundary = bisect.bisect_left(self.ordered_keys, cursor)
+            if boundary < len(self.ordered_numbers):
+                end = self.ordered_numbers[boundary]
+        position = bisect.bisect_left(driver, end)
+        while position > 0:
+            position -= 1
+            number = driver[position]
+            if number in self.late_numbers or not all(_contains(term, number) for term in others):
+                continue
+            yield self.keys[number], number
+
+    def late_matches(self, terms: List[Any], cursor: Optional[Key]) -> Iterator[Tuple[Key, int]]:
+        position = bisect.bisect_left(self.late, (cursor,)) if cursor is not None else len(self.late)
+        while position > 0:
+            position -= 1
+            key, number = self.late[position]
+            if all(_contains(term, number) for term in terms):
+                yield key, number
+
+
+class HistorySearchIndex:
+    """In-process inverted index over history title, product name, INCI list and OCR text.
+
+    Entries are keyed by their real (created_at, id) and posting lists are compact arrays
+    of entry numbers, so matches come out newest first without sorting. Deleted entries
+    are tombstoned rather than removed from the postings.
+
+    The first ``refresh`` loads every entry. Later refreshes run on a background thread,
+    off the request path: they pull entries created after ``newest - look_back``, which
+    catches writes from other workers that land with a slightly older timestamp, and every
+    ``reconcile_every`` seconds drop entries whose ids the store no longer lists, so
+    deletes and clears made elsewhere fall out without re-reading any documents.
+    """
+
+    def __init__(self, summary_fields: Iterable[str] = ("title", "meta", "created_at", "id")):
+        self.summary_fields = tuple(summary_fields)
+        self._lock = threading.RLock()
+        self._load_lock = threading.Lock()
+        self._state = _Postings(self.summary_fields)
+        # Adds and removes made while the first load is reading, replayed onto its result.
+        self._journal: Optional[List[Tuple[str, Any]]] = None
+        self._refreshing = False
+        self.loaded = False
+        self.refreshed_at = 0.0
+        self.reconciled_at = 0.0
+        self.reconciled = 0
+
+    @property
+    def newest(self) -> Optional[str]:
+        with self._lock:
+            return self._state.newest
+
+    def add(self, item: Dict[str, Any]) -> None:
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append(("add", item))
+            # Until the first load, new entries are picked up by that load instead.
+            if self.loaded:
+                self._state.add(item)
+
+    def remove(self, item_id: str) -> None:
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append(("remove", item_id))
+            self._state.remove(item_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append(("clear", None))
+            self._state = _Postings(self.summary_fields)
+
+    def _due(self, max_age: float) -> bool:
+        return not self.loaded or time.monotonic() - self.refreshed_at >= max_age
+
+    def refresh(
+        self,
+        load: Callable[[Optional[str]], Iterable[Dict[str, Any]]],
+        max_age: float,
+        look_back: float = 300.0,
+        list_ids: Optional[Callable[[], Iterable[str]]] = None,
+        reconcile_every: float = 600.0,
+    ) -> None:
+        """Sync with the store at most every ``max_age`` seconds.
+
+        ``load(since)`` yields entries created after ``since``; ``list_ids()`` yields every
+        stored id without reading the documents. Only the first load blocks the caller.
+        """
+        if not self._due(max_age):
+            return
+        if not self.loaded:
+            self._load_all(load)
+            return
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(
+            target=self._refresh_in_background,
+            args=(load, look_back, list_ids, reconcile_every),
+            name="history-index-refresh",
+            daemon=True,
+        ).start()
+
+    def _load_all(self, load: Callable[[Optional[str]], Iterable[Dict[str, Any]]]) -> None:
+        with self._load_lock:
+            if self.loaded:
+                return
+            with self._lock:
+                self._journal = []
+            try:
+                state = _Postings(self.summary_fields)
+                for item in sorted(load(None), key=_item_key):
+                    state.add(item)
+            except BaseException:
+                with self._lock:
+                    self._journal = None
+                raise
+            with self._lock:
+                for op, arg in self._journal or ():
+                    if op == "add":
+                        state.add(arg)
+                    elif op == "remove":
+                        state.remove(arg)
+                    else:
+                        state = _Postings(self.summary_fields)
+                self._journal = None
+                self._state = state
+                self.loaded = True
+                self.refreshed_at = self.reconciled_at = time.monotonic()
+
+    def _refresh_in_background(
+        self,
+        load: Callable[[Optional[str]], Iterable[Dict[str, Any]]],
+        look_back: float,
+        list_ids: Optional[Callable[[], Iterable[str]]],
+        reconcile_every: float,
+    ) -> None:
+        try:
+            with self._load_lock:
+                started = time.monotonic()
+                items = list(load(_look_back(self.newest, look_back)))
+                with self._lock:
+                    for item in items:
+                        self._state.add(item)
+                if list_ids is not None and started - self.reconciled_at >= reconcile_every:
+                    self._reconcile(list_ids)
+                    self.reconciled_at = started
+        except Exception:
+            logger.warning("History search index refresh failed.", exc_info=True)
+        finally:
+            with self._lock:
+                self.refreshed_at = time.monotonic()
+                self._refreshing = False
+
+    def _reconcile(self, list_ids: Callable[[], Iterable[str]]) -> None:
+        with self._lock:
+            state = self._state
+            known = set(state.numbers)
+        # Entries added while the ids are listed are not in ``known``, so they are never dropped.
+        stored = set(list_ids())
+        with self._lock:
+            if self._state is not state:
+                return
+            for item_id in known - stored:
+                state.remove(item_id)
+                self.reconciled += 1
+            if not state.numbers and state.keys:
+                # Everything was deleted elsewhere: start over rather than keep only tombstones.
+                self._state = _Postings(self.summary_fields)
+
+    def search(self, query: str, limit: int, cursor: Optional[Key] = None) -> List[Dict[str, Any]]:
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        with self._lock:
+            state = self._state
+            terms = []
+            for index, token in enumerate(tokens):
+                matches = state.matches(token, prefix=index == len(tokens) - 1)
+                if not matches:
+                    return []
+                terms.append(matches)
+            terms.sort(key=len)
+            driver, others = terms[0], terms[1:]
+            if isinstance(driver, set):
+                driver = sorted(driver)
+
+            candidates = heapq.merge(
+                state.ordered_matches(driver, others, cursor),
+                state.late_matches(terms, cursor),
+                reverse=True,
+            )
+            results: List[Dict[str, Any]] = []
+            for _, number in candidates:
+                summary = state.summaries[number]
+                if summary is not None:
+                    results.append(dict(summary))
+                    if len(results) >= limit:
+                        break
+            return results
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            state = self._state
+            return {
+                "loaded": self.loaded,
+                "entries": len(state.numbers),
+                "tombstones": state.removed,
+                "late": len(state.late),
+                "reconciled": self.reconciled,
+                "terms": len(state.postings),
+                "postings": sum(len(postings) for postings in state.postings.values()),
+            }
+
+
+def _contains(term: Any, number: int) -> bool:
+    if isinstance(term, set):
+        return number in term
+    position = bisect.bisect_left(term, number)
+    return position < len(term) and term[position] == number
@@ -0,0 +1,63 @@
+import re
+
+from web.backend.translation_segments import from_html, to_html
+from web.backend.translator import _MARKUP_UNIT_RE, _split_text
+
+
+def _join(pieces, separators):
+    text = pieces[0]
+    for separator, piece in zip(separators, pieces[1:]):
+        text += separator + piece
+    return text
+
+
+def _assert_units_whole(text, pieces, separators):
+    position = 0
+    cuts = []
+    for piece, separator in zip(pieces, separators):
+        position += len(piece)
+        cuts.append(position)
+        position += len(separator)
+    for match in _MARKUP_UNIT_RE.finditer(text):
+        assert not any(match.start() < cut < match.end() for cut in cuts), match.group(0)
+
+
+def test_split_html_keeps_protected_span_whole():
+    text = to_html("Store below 25 C and keep away from sunlight. LOT No. AB1234 is printed on the crimp.")
+    assert '<span translate="no">LOT No. AB1234</span>' in text
+
+    pieces, separators = _split_text(text, 60, markup=True)
+
+    assert len(pieces) > 1
+    assert _join(pieces, separators) == text
+    assert any('<span translate="no">LOT No. AB1234</span>' in piece for piece in pieces)
+    _assert_units_whole(text, pieces, separators)
+
+
+def test_split_html_never_cuts_tags_or_entities():
+    sentence = "Apply 2 ml & rinse. Use by 12/2027 & keep at 20 C. Contains 50 ml & 3 g of powder. "
+    text = to_html(sentence * 6)
+    assert "&amp;" in text
+
+    for max_chars in range(20, 90, 7):
+        pieces, separators = _split_text(text, max_chars, markup=True)
+        assert _join(pieces, separators) == text
+        _assert_units_whole(text, pieces, separators)
+
+
+def test_split_keeps_oversized_span_in_one_piece():
+    text = 'Batch <span translate="no">' + "X" * 50 + "</span> ends here."
+
+    pieces, separators = _split_text(text, 20, markup=True)
+
+    assert _join(pieces, separators) == text
+    assert any(re.search(r'<span translate="no">X+</span>', piece) for piece in pieces)
+
+
+def test_split_plain_text_unchanged():
+    text = "First sentence here. Second sentence follows. Third."
+
+    pieces, separators = _split_text(text, 25)
+
+    assert pieces == ["First sentence here.", "Second sentence follows.", "Third."]
+    assert separators == [" ", " "]
@@ -0,0 +1,114 @@
+import bisect
+import threading
+from itertools import accumulate
+from typing import Callable, Dict, List, Optional, Tuple
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+# Characters that must not start a line (closing punctuation in CJK text).
+_NO_BREAK_BEFORE = set("、。，．：；！？）」』】〕〉》・ー…,.:;!?)]}%")
+
+_width_tables: Dict[Tuple[str, float], Dict[str, float]] = {}
+_width_lock = threading.Lock()
+
+
+def _is_cjk(char: str) -> bool:
+    # Han and kana break between characters; Hangul is spaced into words like Latin text.
+    code = ord(char)
+    return (
+        0x2E80 <= code <= 0x9FFF
+        or 0xF900 <= code <= 0xFAFF
+        or 0xFF00 <= code <= 0xFFEF
+        or 0x20000 <= code <= 0x2FFFF
+    )
+
+
+def glyph_widths(font_name: str, font_size: float) -> Dict[str, float]:
+    """Per-character advance widths for one font and size, shared across requests."""
+    key = (font_name, font_size)
+    table = _width_tables.get(key)
+    if table is None:
+        with _width_lock:
+            table = _width_tables.setdefault(key, {})
+    return table
+
+
+def _prefix_widths(
+    line: str, font_name: str, font_size: float, measure: Optional[Callable[[str], float]] = None
+) -> List[float]:
+    table = glyph_widths(font_name, font_size)
+    widths = []
+    for char in line:
+        width = table.get(char)
+        if width is None:
+            width = table[char] = measure(char) if measure else stringWidth(char, font_name, font_size)
+        widths.append(width)
+    return [0.0, *accumulate(widths)]
+
+
+def _break_points(line: str) -> List[int]:
+    """Offsets where a line may end; whitespace after them is dropped."""
+    points = []
+    for index in range(1, len(line)):
+        prev, char = line[index - 1], line[index]
+        if char.isspace():
+            if not prev.isspace():
+                points.append(index)
+        elif prev.isspace():
+            continue
+        elif char in _NO_BREAK_BEFORE:
+            continue
+        elif _is_cjk(prev) or _is_cjk(char):
+            points.append(index)
+        elif prev == "-" and index > 1 and line[index - 2].isalpha() and char.isalpha():
+            points.append(index)
+    points.append(len(line))
+    return points
+
+
+def wrap_line(
+    line: str,
+    font_name: str,
+    font_size: float,
+    max_width: float,
+    measure: Optional[Callable[[str], float]] = None,
+) -> List[str]:
+    if not line:
+        return [""]
+    prefix = _prefix_widths(line, font_name, font_size, measure)
+    points = _break_points(line)
+    lines: List[str] = []
+    start = 0
+    length = len(line)
+    while start < length:
+        limit = bisect.bisect_right(prefix, prefix[start] + max_width) - 1
+        if limit >= length:
+            end = length
+        else:
+            candidate = bisect.bisect_right(points, limit) - 1
+            end = points[candidate] if candidate >= 0 and points[candidate] > start else 0
+            if not end:
+                # A single token wider than the line: fall back to breaking between characters.
+                end = max(limit, start + 1)
+        lines.append(line[start:end].rstrip())
+        start = end
+        while start < length and line[start].isspace():
+            start += 1
+    return lines or [""]
+
+
+def wrap_text(
+    text: str,
+    font_name: str,
+    font_size: float,
+    max_width: float,
+    measure: Optional[Callable[[str], float]] = None,
+) -> List[str]:
+    """Greedy word/CJK-aware wrapping in O(n log n) over the text length.
+
+    ``measure`` replaces ReportLab's ``stringWidth`` for fonts it does not know, e.g. Pillow fonts.
+    """
+    lines: List[str] = []
+    for paragraph in text.split("\n"):
+        lines.extend(wrap_line(paragraph, font_name, font_size, max_width, measure))
+    return lines
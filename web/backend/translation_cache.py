@@ -0,0 +1,150 @@
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class TranslationStore(ABC):
+    """Persistent (target language, source text) -> translation mapping."""
+
+    @abstractmethod
+    def get_many(self, target: str, texts: List[str]) -> Dict[str, str]:
+        ...
+
+    @abstractmethod
+    def put_many(self, target: str, translations: Dict[str, str]) -> None:
+        ...
+
+    @abstractmethod
+    def entries(self) -> Iterator[Tuple[str, str, str]]:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class SqliteTranslationStore(TranslationStore):
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS translations (
+                target TEXT NOT NULL,
+                source TEXT NOT NULL,
+                translated TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (target, source)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get_many(self, target: str, texts: List[str]) -> Dict[str, str]:
+        found: Dict[str, str] = {}
+        unique = list(dict.fromkeys(texts))
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit.
+            for start in range(0, len(unique), 500):
+                chunk = unique[start:start + 500]
+                placeholders = ",".join("?" for _ in chunk)
+                rows = self._conn.execute(
+                    f"SELECT source, translated FROM translations WHERE target = ? AND source IN ({placeholders})",
+                    [target, *chunk],
+                ).fetchall()
+                found.update(rows)
+        return found
+
+    def put_many(self, target: str, translations: Dict[str, str]) -> None:
+        if not translations:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations (target, source, translated, updated_at) VALUES (?, ?, ?, ?)",
+                [(target, source, translated, now) for source, translated in translations.items()],
+            )
+            self._conn.commit()
+
+    def entries(self) -> Iterator[Tuple[str, str, str]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT target, source, translated FROM translations ORDER BY target, source"
+            ).fetchall()
+        return iter(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class TranslationCache:
+    """In-memory LRU in front of a TranslationStore, with hit-rate counters."""
+
+    def __init__(self, store: TranslationStore, memory_items: int = 4096):
+        self.store = store
+        self.memory_items = memory_items
+        self._memory: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "store_hits": 0, "misses": 0, "stores": 0}
+
+    def lookup(self, target: str, texts: Iterable[str]) -> Dict[str, str]:
+        found: Dict[str, str] = {}
+        missing: List[str] = []
+        with self._lock:
+            for text in dict.fromkeys(texts):
+                key = (target, text)
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[text] = self._memory[key]
+                    self._counters["memory_hits"] += 1
+                else:
+                    missing.append(text)
+        if not missing:
+            return found
+
+        stored = self.store.get_many(target, missing)
+        with self._lock:
+            self._counters["store_hits"] += len(stored)
+            self._counters["misses"] += len(missing) - len(stored)
+            for text, translated in stored.items():
+                self._remember((target, text), translated)
+        found.update(stored)
+        return found
+
+    def save(self, target: str, translations: Dict[str, str]) -> None:
+        if not translations:
+            return
+        self.store.put_many(target, translations)
+        with self._lock:
+            self._counters["stores"] += len(translations)
+            for text, translated in translations.items():
+                self._remember((target, text), translated)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats: Dict[str, float] = dict(self._counters)
+            stats["memory_items"] = len(self._memory)
+        hits = stats["memory_hits"] + stats["store_hits"]
+        lookups = hits + stats["misses"]
+        stats["hits"] = hits
+        stats["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        return stats
+
+    def close(self) -> None:
+        self.store.close()
+
+    def _remember(self, key: Tuple[str, str], translated: str) -> None:
+        self._memory[key] = translated
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
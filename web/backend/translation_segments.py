@@ -0,0 +1,121 @@
+import html
+import re
+from typing import List, Tuple
+
+Segment = Tuple[str, bool]
+
+# Fields whose whole value is a proper noun / address / code and must never be translated.
+PROTECTED_FIELDS = {"inci_ingredients", "eu_responsible_person", "distributor"}
+
+_COMPANY_RE = re.compile(
+    r"\b(?:s\.r\.o\.|a\.s\.|GmbH|AG|Ltd\.?|LLC|Inc\.?|Co\.,?\s*Ltd\.?|S\.A\.S?\.?|S\.r\.l\.|B\.V\.|Sp\.\s*z\s*o\.o\.|Kft\.|OÜ)(?!\w)",
+    re.IGNORECASE,
+)
+_POSTAL_ADDRESS_RE = re.compile(r"\b\d{2,3}[\s-]?\d{2,3}\s*,?\s+\w+.*,\s*[A-Z][\w .]+$")
+_PROTECTED_SPAN_RE = re.compile(
+    r"""
+    (?:\b(?:LOT|Lot|Batch|BN)\s*(?:No\.?|Nr\.?|number)?\s*[:#.]?\s*[A-Z0-9][A-Z0-9\-/.]*\d[A-Z0-9\-/.]*)
+    | (?:\b\d+(?:[.,]\d+)?\s*(?:ml|mL|ML|l|L|g|G|kg|mg|oz|fl\.?\s?oz)\b\.?)
+    | (?:\b\d{4}[./-]\d{1,2}(?:[./-]\d{1,2})?\b)
+    | (?:\b\d{1,2}[./-]\d{1,2}[./-]\d{2,4}\b)
+    | (?:\b\d{1,2}[./-]\d{4}\b)
+    | (?:\b(?=[A-Z0-9\-]*\d)(?=[A-Z0-9\-]*[A-Z])[A-Z0-9][A-Z0-9\-]{3,}\b)
+    """,
+    re.VERBOSE,
+)
+_LETTER_RE = re.compile(r"[^\W\d_]")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?:])\s+")
+_NO_TRANSLATE_RE = re.compile(r'<span\s+translate\s*=\s*"no"\s*>(.*?)</span>', re.DOTALL | re.IGNORECASE)
+
+
+def _looks_like_inci(line: str) -> bool:
+    items = [item.strip() for item in re.split(r"[,;]", line) if item.strip()]
+    if len(items) < 4:
+        return False
+    named = sum(1 for item in items if re.match(r"^[A-Z0-9(][\w\s\-/().,+:'%]*$", item) and len(item.split()) <= 6)
+    return named / len(items) >= 0.8
+
+
+def _looks_like_address(line: str) -> bool:
+    return bool(_COMPANY_RE.search(line) or _POSTAL_ADDRESS_RE.search(line.strip()))
+
+
+def _append(segments: List[Segment], text: str, translatable: bool) -> None:
+    if not text:
+        return
+    if translatable:
+        stripped = text.strip()
+        if not _LETTER_RE.search(stripped):
+            translatable = False
+        else:
+            leading = text[:len(text) - len(text.lstrip())]
+            trailing = text[len(text.rstrip()):]
+            _append(segments, leading, False)
+            segments.append((stripped, True))
+            _append(segments, trailing, False)
+            return
+    if segments and not segments[-1][1] and not translatable:
+        segments[-1] = (segments[-1][0] + text, False)
+    else:
+        segments.append((text, translatable))
+
+
+def _has_prose(sentence: str) -> bool:
+    return bool(_LETTER_RE.search(_PROTECTED_SPAN_RE.sub("", sentence)))
+
+
+def _append_line(segments: List[Segment], line: str) -> None:
+    # Sentences are the translation unit; protected spans stay inside them (see ``to_html``)
+    # so the translator keeps the surrounding grammar. Never split inside a protected span.
+    protected = [match.span() for match in _PROTECTED_SPAN_RE.finditer(line)]
+    position = 0
+    for boundary in _SENTENCE_END_RE.finditer(line):
+        if any(start < boundary.start() < end for start, end in protected):
+            continue
+        _append_sentence(segments, line[position:boundary.start()])
+        _append(segments, boundary.group(0), False)
+        position = boundary.end()
+    _append_sentence(segments, line[position:])
+
+
+def _append_sentence(segments: List[Segment], sentence: str) -> None:
+    _append(segments, sentence, _has_prose(sentence) and not _looks_like_inci(sentence))
+
+
+def segment_field(key: str, value: str) -> List[Segment]:
+    """Split a label field into (text, translatable) spans; joining the texts gives ``value`` back."""
+    segments: List[Segment] = []
+    if key in PROTECTED_FIELDS:
+        _append(segments, value, False)
+        return segments
+
+    for line in re.split(r"(\n)", value):
+        if line == "\n" or _looks_like_address(line):
+            _append(segments, line, False)
+        else:
+            _append_line(segments, line)
+    return segments
+
+
+def to_html(sentence: str) -> str:
+    """Sentence as Translation API ``html`` input, with LOT codes, quantities and dates marked ``translate="no"``."""
+    parts = []
+    position = 0
+    for match in _PROTECTED_SPAN_RE.finditer(sentence):
+        parts.append(html.escape(sentence[position:match.start()], quote=False))
+        parts.append(f'<span translate="no">{html.escape(match.group(0), quote=False)}</span>')
+        position = match.end()
+    parts.append(html.escape(sentence[position:], quote=False))
+    return "".join(parts)
+
+
+def from_html(translated: str) -> str:
+    return html.unescape(_NO_TRANSLATE_RE.sub(lambda match: match.group(1), translated))
+
+
+def splice(segments: List[Segment], translations: List[str]) -> str:
+    parts = []
+    translated = iter(translations)
+    for text, translatable in segments:
+        parts.append(next(translated) if translatable else text)
+    return "".join(parts)
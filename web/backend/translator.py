@@ -0,0 +1,197 @@
+import bisect
+import html
+import os
+import re
+import time
+from concurrent.futures import Executor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_TRANSLATE_URL = "https://translation.googleapis.com/language/translate/v2"
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+# Units an ``html`` request must not be cut inside: protected spans, tags and entities.
+_MARKUP_UNIT_RE = re.compile(
+    r"<span\b[^>]*\btranslate=[\"']?no[\"']?[^>]*>.*?</span\s*>|<[^>]*>|&#?\w+;",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+class TranslationError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def _split_text(text: str, max_chars: int, markup: bool = False) -> Tuple[List[str], List[str]]:
+    """Split ``text`` into pieces of at most ``max_chars`` plus the whitespace between them.
+
+    With ``markup`` no cut lands inside a tag, an entity or a ``translate="no"`` span; a unit
+    longer than the window is kept whole even if its piece runs past ``max_chars``.
+    """
+    units = [match.span() for match in _MARKUP_UNIT_RE.finditer(text)] if markup else []
+    starts = [start for start, _ in units]
+
+    def unit_around(position: int) -> Optional[Tuple[int, int]]:
+        index = bisect.bisect_left(starts, position) - 1
+        if index >= 0 and units[index][1] > position:
+            return units[index]
+        return None
+
+    pieces: List[str] = []
+    separators: List[str] = []
+    start = 0
+    while len(text) - start > max_chars:
+        end = start + max_chars
+        cut = -1
+        # Prefer a line break, then a sentence end, then a word gap; cut mid-word only as a last resort.
+        for separator, offset in (("\n", 0), (". ", 1), (" ", 0)):
+            found = text.rfind(separator, start, end)
+            while found >= start and unit_around(found + offset) is not None:
+                found = text.rfind(separator, start, found)
+            if found + offset > start:
+                cut = found + offset
+                break
+        if cut < 0:
+            cut = end
+            unit = unit_around(cut)
+            if unit is not None:
+                cut = unit[0] if unit[0] > start else unit[1]
+        pieces.append(text[start:cut])
+        stripped = len(text) - len(text[cut:].lstrip())
+        separators.append(text[cut:stripped])
+        start = stripped
+    pieces.append(text[start:])
+    return pieces, separators
+
+
+class TranslationClient:
+    """Google Translation v2 client on a pooled ``requests.Session``.
+
+    Requests are split to stay within ``max_segments`` strings and ``max_chars``
+    characters; transient failures are retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        url: str = DEFAULT_TRANSLATE_URL,
+        max_segments: int = 128,
+        max_chars: int = 5000,
+        retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 15,
+        pool_size: int = 16,
+    ):
+        self.api_key = api_key
+        self.url = url
+        self.max_segments = max_segments
+        self.max_chars = max_chars
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @classmethod
+    def from_env(cls) -> "TranslationClient":
+        return cls(
+            api_key=os.getenv("TRANSLATE_API_KEY", ""),
+            url=os.getenv("TRANSLATE_API_URL", DEFAULT_TRANSLATE_URL),
+            max_segments=int(os.getenv("TRANSLATE_MAX_SEGMENTS", "128")),
+            max_chars=int(os.getenv("TRANSLATE_MAX_CHARS", "5000")),
+            retries=int(os.getenv("TRANSLATE_RETRIES", "3")),
+            pool_size=int(os.getenv("TRANSLATE_CONCURRENCY", "8")) * 2,
+        )
+
+    def translate(self, texts: List[str], target: str, fmt: str = "text") -> List[str]:
+        """Translate ``texts``; with ``fmt="html"`` markup such as ``translate="no"`` spans is returned as-is."""
+        segments: List[str] = []
+        layout: List[Tuple[int, List[str]]] = []
+        for text in texts:
+            pieces, separators = _split_text(text, self.max_chars, markup=fmt == "html")
+            layout.append((len(pieces), separators))
+            segments.extend(pieces)
+
+        translated: List[str] = []
+        for batch in self._batches(segments):
+            translated.extend(self._post(batch, target, fmt))
+
+        results: List[str] = []
+        position = 0
+        for count, separators in layout:
+            parts = translated[position:position + count]
+            position += count
+            text = parts[0]
+            for separator, part in zip(separators, parts[1:]):
+                text += separator + part
+            results.append(text)
+        return results
+
+    def _batches(self, segments: List[str]) -> List[List[str]]:
+        batches: List[List[str]] = []
+        current: List[str] = []
+        chars = 0
+        for segment in segments:
+            if current and (len(current) >= self.max_segments or chars + len(segment) > self.max_chars):
+                batches.append(current)
+                current = []
+                chars = 0
+            current.append(segment)
+            chars += len(segment)
+        if current:
+            batches.append(current)
+        return batches
+
+    def _post(self, texts: List[str], target: str, fmt: str = "text") -> List[str]:
+        payload = {"q": texts, "target": target, "format": fmt}
+        last_error = ""
+        for attempt in range(self.retries + 1):
+            delay = self.backoff * (2 ** attempt)
+            try:
+                resp = self.session.post(self.url, params={"key": self.api_key}, json=payload, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                last_error = str(exc)
+            else:
+                if resp.ok:
+                    translations = resp.json().get("data", {}).get("translations", [])
+                    if len(translations) != len(texts):
+                        raise TranslationError(502, "Translate API returned an unexpected number of translations.")
+                    texts_out = [item.get("translatedText", "") for item in translations]
+                    return [html.unescape(text) for text in texts_out] if fmt == "text" else texts_out
+                last_error = resp.text[:1000]
+                if resp.status_code not in RETRY_STATUSES:
+                    raise TranslationError(resp.status_code, f"Translate API error: {last_error}")
+                retry_after = resp.headers.get("Retry-After", "")
+                if retry_after.isdigit():
+                    delay = max(delay, float(retry_after))
+            if attempt < self.retries:
+                time.sleep(delay)
+        raise TranslationError(502, f"Translate API error: {last_error}")
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def translate_targets(
+    translate_one: Callable[[str], List[str]],
+    targets: List[str],
+    executor: Executor,
+) -> Tuple[Dict[str, List[str]], Dict[str, Exception]]:
+    """Run ``translate_one`` for every target on a shared ``executor``; returns (results, errors) per target."""
+    results: Dict[str, List[str]] = {}
+    errors: Dict[str, Exception] = {}
+    targets = list(dict.fromkeys(targets))
+    if not targets:
+        return results, errors
+    futures = {target: executor.submit(translate_one, target) for target in targets}
+    for target, future in futures.items():
+        try:
+            results[target] = future.result()
+        except Exception as exc:
+            errors[target] = exc
+    return results, errors
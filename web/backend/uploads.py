@@ -0,0 +1,147 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+
+UPLOAD_PREFIX = "upload_"
+CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLarge(Exception):
+    def __init__(self, max_bytes: int):
+        super().__init__(f"Upload exceeds the {max_bytes} byte limit.")
+        self.max_bytes = max_bytes
+
+
+class SpooledUpload:
+    """An upload read in chunks and hashed on the way in.
+
+    Images stay in memory (``content``); everything else lands in a uniquely
+    named temp file (``path``) that ``cleanup`` removes.
+    """
+
+    def __init__(self, filename: str, ext: str, digest: str, size: int, path: Optional[str] = None, content: Optional[bytes] = None):
+        self.filename = filename
+        self.ext = ext
+        self.digest = digest
+        self.size = size
+        self.path = path
+        self.content = content
+
+    def cleanup(self) -> None:
+        if not self.path:
+            return
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+        self.path = None
+
+
+async def spool_upload(file: UploadFile, ext: str, directory: str, max_bytes: int, in_memory: bool = False) -> SpooledUpload:
+    hasher = hashlib.sha256()
+    size = 0
+    buffer = bytearray()
+    path = None
+    out = None
+    if not in_memory:
+        os.makedirs(directory, exist_ok=True)
+        fd, path = tempfile.mkstemp(prefix=UPLOAD_PREFIX, suffix=ext, dir=directory)
+        out = os.fdopen(fd, "wb")
+
+    try:
+        while True:
+            chunk = await file.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLarge(max_bytes)
+            hasher.update(chunk)
+            if out is None:
+                buffer.extend(chunk)
+            else:
+                await asyncio.to_thread(out.write, chunk)
+    except BaseException:
+        if out is not None:
+            out.close()
+            os.remove(path)
+        raise
+    if out is not None:
+        out.close()
+
+    return SpooledUpload(
+        filename=file.filename or "",
+        ext=ext,
+        digest=hasher.hexdigest(),
+        size=size,
+        path=path,
+        content=bytes(buffer) if in_memory else None,
+    )
+
+
+def sweep_stale_uploads(directory: str, max_age: float) -> int:
+    if not os.path.isdir(directory):
+        return 0
+    cutoff = time.time() - max_age
+    removed = 0
+    for entry in os.scandir(directory):
+        if not entry.name.startswith(UPLOAD_PREFIX):
+            continue
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+class RequestBodyLimit:
+    """ASGI middleware capping request bodies per path before the app parses them.
+
+    Starlette reads a whole multipart body into its own spool before a handler runs, so
+    ``spool_upload`` alone cannot stop an oversized upload. A declared ``Content-Length``
+    over the limit is answered with 413 without reading the body, and a body sent without
+    one is cut off with 413 as soon as it passes the limit.
+
+    ``limits`` maps a path to ``(body cap, reported limit)``: the 413 detail names the limit
+    the client has to respect (the per-file limit for single uploads), not the cap itself,
+    which also allows for multipart overhead.
+    """
+
+    def __init__(self, app: Callable[..., Awaitable[None]], limits: Dict[str, Tuple[int, int]]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable[[], Awaitable[Dict[str, Any]]], send: Any) -> None:
+        limits = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limits is None:
+            await self.app(scope, receive, send)
+            return
+
+        limit, reported = limits
+        detail = str(UploadTooLarge(reported))
+        length = dict(scope["headers"]).get(b"content-length")
+        if length is not None and length.isdigit() and int(length) > limit:
+            await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Dict[str, Any]:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # FastAPI re-raises HTTPExceptions from body parsing instead of turning them into 400s.
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -21,6 +21,8 @@ const progress = el("progress");
 const toast = el("toast");
 const historyList = el("historyList");
 const clearHistory = el("clearHistory");
+const moreHistory = el("moreHistory");
+const historySearch = el("historySearch");
 const dropzone = el("dropzone");
 const fileInput = el("fileInput");
 const langOptions = el("langOptions");
@@ -137,6 +139,9 @@ const showToast = (message) => {
 };
 
 let historyCache = [];
+let historyCursor = null;
+let historyQuery = "";
+let historySearchTimer = null;
 let translations = {};
 let activeLang = "";
 
@@ -187,6 +192,46 @@ const renderHistory = (items) => {
 
 const getHistory = () => historyCache.slice(0);
 
+const setHistory = (data, append = false) => {
+  const items = data.items || [];
+  historyCache = append ? historyCache.concat(items) : items;
+  historyCursor = data.next_cursor || null;
+  moreHistory.hidden = !historyCursor;
+  renderHistory(historyCache);
+};
+
+const showHistoryPage = (data) => {
+  historyQuery = "";
+  historySearch.value = "";
+  setHistory(data);
+};
+
+const fetchHistoryPage = async (cursor) => {
+  const apiBase = getApiBase();
+  const params = new URLSearchParams();
+  if (historyQuery) {
+    params.set("q", historyQuery);
+  }
+  if (cursor) {
+    params.set("cursor", cursor);
+  }
+  const path = historyQuery ? "/api/history/search" : "/api/history";
+  const resp = await fetch(`${apiBase}${path}?${params}`);
+  if (!resp.ok) {
+    throw new Error("history fetch failed");
+  }
+  return resp.json();
+};
+
+const fetchHistoryDetail = async (id) => {
+  const apiBase = getApiBase();
+  const resp = await fetch(`${apiBase}/api/history/${id}`);
+  if (!resp.ok) {
+    throw new Error("history detail failed");
+  }
+  return resp.json();
+};
+
 const applyHistoryItem = (item) => {
   fields.product_name.value = item.form.product_name || "";
   fields.function_claim.value = item.form.function_claim || "";
@@ -221,8 +266,7 @@ const fetchHistory = async () => {
       throw new Error("history fetch failed");
     }
     const data = await resp.json();
-    historyCache = data.items || [];
-    renderHistory(historyCache);
+    showHistoryPage(data);
   } catch {
     showToast("히스토리를 불러오지 못했습니다.");
   }
@@ -243,8 +287,7 @@ const addHistoryItem = async (item) => {
       throw new Error("history add failed");
     }
     const data = await resp.json();
-    historyCache = data.items || [];
-    renderHistory(historyCache);
+    showHistoryPage(data);
   } catch {
     showToast("히스토리 저장에 실패했습니다.");
   }
@@ -415,20 +458,44 @@ const buildLabelTextForLang = (lang) => {
   return lines.join("<br />");
 };
 
-const startOcrSteps = () => {
-  const steps = [
-    "파일 업로드 중...",
-    "OCR 요청 중...",
-    "OCR 처리 중...",
-    "결과 수신 중...",
-  ];
-  let index = 0;
-  setProgress(true, steps[index]);
-  const interval = window.setInterval(() => {
-    index = (index + 1) % steps.length;
-    setProgress(true, steps[index]);
-  }, 1800);
-  return () => window.clearInterval(interval);
+const OCR_STAGE_MESSAGES = {
+  upload: "파일 업로드 완료...",
+  text_layer: "PDF 텍스트 확인 중...",
+  gcs: "클라우드 업로드 중...",
+  vision: "OCR 처리 중...",
+  parse: "결과 분석 중...",
+};
+
+const waitForOcrJob = (apiBase, jobId) =>
+  new Promise((resolve) => {
+    const source = new EventSource(`${apiBase}/api/ocr/jobs/${jobId}/events`);
+    const finish = () => {
+      source.close();
+      resolve();
+    };
+    source.addEventListener("stage", (event) => {
+      const data = JSON.parse(event.data);
+      setProgress(true, OCR_STAGE_MESSAGES[data.stage] || "OCR 처리 중...");
+    });
+    source.addEventListener("done", finish);
+    source.addEventListener("failed", finish);
+    source.addEventListener("cancelled", finish);
+    source.onerror = finish;
+  });
+
+const fetchOcrJobResult = async (apiBase, jobId) => {
+  for (;;) {
+    const resp = await fetch(`${apiBase}/api/ocr/jobs/${jobId}/result`);
+    if (resp.status === 202) {
+      await new Promise((resolve) => window.setTimeout(resolve, 2000));
+      continue;
+    }
+    if (!resp.ok) {
+      const detail = await resp.text();
+      throw new Error(detail || "OCR failed");
+    }
+    return resp.json();
+  }
 };
 
 const setSelectedFile = (file) => {
@@ -490,11 +557,11 @@ el("btnOcr").addEventListener("click", async () => {
   const formData = new FormData();
   formData.append("file", file);
 
-  const stopSteps = startOcrSteps();
+  setProgress(true, "파일 업로드 중...");
   rawText.textContent = "";
 
   try {
-    const resp = await fetch(`${apiBase}/api/ocr`, {
+    const resp = await fetch(`${apiBase}/api/ocr/jobs`, {
       method: "POST",
       body: formData,
     });
@@ -504,7 +571,9 @@ el("btnOcr").addEventListener("click", async () => {
       throw new Error(detail || "OCR failed");
     }
 
-    const data = await resp.json();
+    const job = await resp.json();
+    await waitForOcrJob(apiBase, job.job_id);
+    const data = await fetchOcrJobResult(apiBase, job.job_id);
     rawText.textContent = data.raw_text || "";
 
     const parsed = data.parsed || {};
@@ -529,7 +598,6 @@ el("btnOcr").addEventListener("click", async () => {
 
     translations = {};
     updatePreview();
-    stopSteps();
     setProgress(false, "OCR 완료. 내용을 확인해 주세요.");
     showToast("OCR 분석이 완료되었습니다.");
     const parsedSection = document.getElementById("parsedSection");
@@ -555,7 +623,6 @@ el("btnOcr").addEventListener("click", async () => {
       },
     });
   } catch (err) {
-    stopSteps();
     setProgress(false, `OCR 오류: ${err.message}`);
   }
 });
@@ -585,7 +652,14 @@ translateBtn.addEventListener("click", async () => {
     const data = await resp.json();
     translations = data.translations || {};
     activeLang = targets[0] || "";
-    setProgress(false, "번역 완료.");
+    const failed = Object.keys(data.errors || {});
+    if (failed.length) {
+      const names = failed.map((lang) => LANGUAGE_TITLES[lang] || lang).join(", ");
+      setProgress(false, `번역 완료 (실패: ${names}).`);
+      showToast(`일부 언어 번역에 실패했습니다: ${names}`);
+    } else {
+      setProgress(false, "번역 완료.");
+    }
     updatePreview();
   } catch (err) {
     setProgress(false, `번역 오류: ${err.message}`);
@@ -619,8 +693,7 @@ historyList.addEventListener("click", (event) => {
         return resp.json();
       })
       .then((data) => {
-        historyCache = data.items || [];
-        renderHistory(historyCache);
+        showHistoryPage(data);
         showToast("항목이 삭제되었습니다.");
       })
       .catch(() => {
@@ -635,8 +708,40 @@ historyList.addEventListener("click", (event) => {
   const items = getHistory();
   const index = Number(target.dataset.index);
   const item = items[index];
-  if (item) {
-    applyHistoryItem(item);
+  if (!item || !item.id) {
+    return;
+  }
+  fetchHistoryDetail(item.id)
+    .then(applyHistoryItem)
+    .catch(() => {
+      showToast("기록을 불러오지 못했습니다.");
+    });
+});
+
+historySearch.addEventListener("input", () => {
+  window.clearTimeout(historySearchTimer);
+  historySearchTimer = window.setTimeout(async () => {
+    if (!getApiBase()) {
+      return;
+    }
+    historyQuery = historySearch.value.trim();
+    try {
+      setHistory(await fetchHistoryPage(null));
+    } catch {
+      showToast("히스토리를 불러오지 못했습니다.");
+    }
+  }, 250);
+});
+
+moreHistory.addEventListener("click", async () => {
+  const apiBase = getApiBase();
+  if (!apiBase || !historyCursor) {
+    return;
+  }
+  try {
+    setHistory(await fetchHistoryPage(historyCursor), true);
+  } catch {
+    showToast("히스토리를 불러오지 못했습니다.");
   }
 });
 
@@ -653,8 +758,7 @@ clearHistory.addEventListener("click", () => {
       return resp.json();
     })
     .then(() => {
-      historyCache = [];
-      renderHistory([]);
+      showHistoryPage({ items: [] });
       showToast("히스토리를 비웠습니다.");
     })
     .catch(() => {